@@ -0,0 +1,364 @@
+"""
+Copyright (c) 2020, 2022 Red Hat, IBM Corporation and others.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import gc
+import http.client
+import json
+import logging
+import math
+import os
+import socket
+import sys
+import threading
+import time
+import warnings
+
+import click
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import grpc
+from google.protobuf.json_format import ParseDict
+from gRPC import hpo_pb2, hpo_pb2_grpc
+
+import hpo_service
+import rest_service
+from utils import HPOSupportedTypes
+
+PROTOCOLS = ("rest", "grpc")
+
+# Analytic objectives and the bounds of their two tunables, fast enough that the time of a trial is spent in HPO
+OBJECTIVES = {
+    # global minimum of 0.397887 at (-pi, 12.275), (pi, 2.275) and (9.42478, 2.475)
+    "branin": ((-5.0, 10.0), (0.0, 15.0), lambda x, y: (y - 5.1 / (4 * math.pi ** 2) * x ** 2 + 5 / math.pi * x - 6) ** 2
+               + 10 * (1 - 1 / (8 * math.pi)) * math.cos(x) + 10),
+    # global minimum of 0 at (3, 7)
+    "quadratic": ((-10.0, 10.0), (-10.0, 10.0), lambda x, y: (x - 3) ** 2 + (y - 7) ** 2),
+}
+
+# Relative change of a metric beyond which it is reported as a regression
+DEFAULT_TOLERANCE = 0.2
+
+
+def search_space(name, objective, trials, hpo_algo_impl, seed):
+    (x_lower, x_upper), (y_lower, y_upper), _ = OBJECTIVES[objective]
+    space = {
+        "experiment_name": name,
+        "experiment_id": name,
+        "total_trials": trials,
+        "parallel_trials": 1,
+        "value_type": "double",
+        "hpo_algo_impl": hpo_algo_impl,
+        "objective_function": objective,
+        "tunables": [
+            {"value_type": "double", "lower_bound": x_lower, "name": "x", "upper_bound": x_upper, "step": 0.01},
+            {"value_type": "double", "lower_bound": y_lower, "name": "y", "upper_bound": y_upper, "step": 0.01}
+        ],
+        "direction": "minimize"
+    }
+    if seed is not None:
+        space["sampler_params"] = {"seed": seed}
+    return space
+
+
+def evaluate(objective, config):
+    values = {tunable_name: tunable_value for tunable_name, tunable_value in config}
+    return OBJECTIVES[objective][2](values["x"], values["y"])
+
+
+class Latencies:
+    """Latencies in seconds of every request, by operation, recorded by all experiment threads."""
+
+    def __init__(self):
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def time(self, operation, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            try:
+                self.lock.acquire()
+                self.samples.setdefault(operation, []).append(elapsed)
+            finally:
+                self.lock.release()
+
+    def summary(self) -> dict:
+        return {operation: {"count": len(samples), "p50_ms": percentile(samples, 50) * 1000,
+                            "p99_ms": percentile(samples, 99) * 1000}
+                for operation, samples in sorted(self.samples.items())}
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class RestDriver:
+    """Run the trials of an experiment through the REST API, on a kept alive connection."""
+
+    def __init__(self, port, latencies: Latencies):
+        self.connection = http.client.HTTPConnection("localhost", port, timeout=60)
+        self.latencies = latencies
+
+    def request(self, operation, method, path, body=None):
+        status, data = self.latencies.time(operation, self.exchange, method, path, body)
+        if status != 200:
+            raise RuntimeError("%s returned %s: %s" % (operation, status, data))
+        return data
+
+    def exchange(self, method, path, body):
+        headers = {"Content-Type": HPOSupportedTypes.CONTENT_TYPE} if body is not None else {}
+        self.connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = self.connection.getresponse()
+        return response.status, response.read().decode("utf-8")
+
+    def run(self, space, objective):
+        name = space["experiment_name"]
+        self.request("EXP_TRIAL_GENERATE_NEW", "POST", HPOSupportedTypes.API_ENDPOINT,
+                     {"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": space})
+        trial_number = 0
+        for trial in range(space["total_trials"]):
+            config = json.loads(self.request("GET " + HPOSupportedTypes.API_ENDPOINT, "GET",
+                                             "%s?experiment_name=%s&trial_number=%s" %
+                                             (HPOSupportedTypes.API_ENDPOINT, name, trial_number)))
+            value = evaluate(objective, [(c["tunable_name"], c["tunable_value"]) for c in config])
+            self.request("EXP_TRIAL_RESULT", "POST", HPOSupportedTypes.API_ENDPOINT,
+                         {"operation": "EXP_TRIAL_RESULT", "experiment_name": name, "trial_number": trial_number,
+                          "trial_result": "success", "result_value_type": "double", "result_value": value})
+            if trial < space["total_trials"] - 1:
+                trial_number = int(self.request("EXP_TRIAL_GENERATE_SUBSEQUENT", "POST",
+                                                HPOSupportedTypes.API_ENDPOINT,
+                                                {"operation": "EXP_TRIAL_GENERATE_SUBSEQUENT",
+                                                 "experiment_name": name}))
+
+    def close(self):
+        self.connection.close()
+
+
+class GrpcDriver:
+    """Run the trials of an experiment through the gRPC service."""
+
+    def __init__(self, port, latencies: Latencies):
+        self.channel = grpc.insecure_channel("localhost:%s" % port)
+        self.stub = hpo_pb2_grpc.HpoServiceStub(self.channel)
+        self.latencies = latencies
+
+    def run(self, space, objective):
+        name = space["experiment_name"]
+        details = ParseDict({k: v for k, v in space.items() if k != "sampler_params"}, hpo_pb2.ExperimentDetails())
+        for key, value in space.get("sampler_params", {}).items():
+            details.sampler_params[key] = json.dumps(value)
+        trial_number = self.latencies.time("NewExperiment", self.stub.NewExperiment, details).trial_number
+        for trial in range(space["total_trials"]):
+            config = self.latencies.time("GetTrialConfig", self.stub.GetTrialConfig,
+                                         hpo_pb2.ExperimentTrial(experiment_name=name, trial=trial_number)).config
+            value = evaluate(objective, [(c.name, c.double_value) for c in config])
+            self.latencies.time("UpdateTrialResult", self.stub.UpdateTrialResult,
+                                hpo_pb2.ExperimentTrialResult(experiment_name=name, trial=trial_number,
+                                                              value_type="double", value=value))
+            if trial < space["total_trials"] - 1:
+                trial_number = self.latencies.time("GenerateNextConfig", self.stub.GenerateNextConfig,
+                                                   hpo_pb2.ExperimentNameParams(experiment_name=name)).trial_number
+
+    def close(self):
+        self.channel.close()
+
+
+def resident_memory():
+    """Resident set size of the process in bytes."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        # peak rather than current size where /proc is not available, in KiB on Linux and bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def start_servers(grpc_server):
+    """Start the REST and gRPC services in background threads and return their ports."""
+    import grpc_service
+
+    rest_port = free_port()
+    grpc_port = free_port()
+    os.environ[HPOSupportedTypes.GRPC_PORT_ENV] = str(grpc_port)
+    os.environ[HPOSupportedTypes.GRPC_SERVER_ENV] = grpc_server
+    threading.Thread(target=rest_service.main, args=(rest_port,), daemon=True).start()
+    threading.Thread(target=grpc_service.serve, daemon=True).start()
+    for port in (rest_port, grpc_port):
+        deadline = time.time() + 10
+        while True:
+            try:
+                socket.create_connection(("localhost", port), timeout=1).close()
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+    return {"rest": rest_port, "grpc": grpc_port}
+
+
+def run_protocol(protocol, port, experiments, trials, objective, hpo_algo_impl, seed):
+    """Run the experiments concurrently over one protocol and return its results."""
+    latencies = Latencies()
+    errors = []
+    peak_threads = [threading.active_count()]
+    done = threading.Event()
+
+    def monitor():
+        while not done.wait(0.05):
+            peak_threads[0] = max(peak_threads[0], threading.active_count())
+
+    def run_experiment(index):
+        driver = RestDriver(port, latencies) if protocol == "rest" else GrpcDriver(port, latencies)
+        try:
+            driver.run(search_space("benchmark-%s-%s" % (protocol, index), objective, trials, hpo_algo_impl, seed),
+                       objective)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            driver.close()
+
+    gc.collect()
+    memory_before = resident_memory()
+    threads = [threading.Thread(target=run_experiment, args=(index,)) for index in range(experiments)]
+    threading.Thread(target=monitor, daemon=True).start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    gc.collect()
+    memory_after = resident_memory()
+
+    for index in range(experiments):
+        hpo_service.instance.deleteExperiment("benchmark-%s-%s" % (protocol, index))
+    if errors:
+        raise click.ClickException("%s: %s experiments failed, the first with: %s" % (protocol, len(errors), errors[0]))
+
+    return {
+        "trials_per_second": experiments * trials / elapsed,
+        "duration_s": elapsed,
+        "latency": latencies.summary(),
+        "memory_per_experiment_bytes": max(0, memory_after - memory_before) / experiments,
+        "peak_threads": peak_threads[0],
+    }
+
+
+def flatten(results) -> dict:
+    """Metrics of the results by dotted name, e.g. rest.latency.EXP_TRIAL_RESULT.p99_ms."""
+    metrics = {}
+    for protocol, values in results["protocols"].items():
+        metrics[protocol + ".trials_per_second"] = values["trials_per_second"]
+        metrics[protocol + ".memory_per_experiment_bytes"] = values["memory_per_experiment_bytes"]
+        metrics[protocol + ".peak_threads"] = values["peak_threads"]
+        for operation, latency in values["latency"].items():
+            metrics["%s.latency.%s.p50_ms" % (protocol, operation)] = latency["p50_ms"]
+            metrics["%s.latency.%s.p99_ms" % (protocol, operation)] = latency["p99_ms"]
+    return metrics
+
+
+def compare(results, baseline, tolerance) -> list:
+    """Echo the change of every metric from the baseline and return the names of the metrics that regressed."""
+    if results["parameters"] != baseline["parameters"]:
+        click.echo("Warning: the baseline was run with different parameters: %s" % json.dumps(baseline["parameters"]))
+    current = flatten(results)
+    previous = flatten(baseline)
+    regressions = []
+    click.echo("\n%-60s %12s %12s %8s" % ("metric", "baseline", "current", "change"))
+    for name in sorted(set(current) & set(previous)):
+        if not previous[name]:
+            continue
+        change = (current[name] - previous[name]) / previous[name]
+        # throughput regresses when it drops, every other metric when it grows
+        regressed = -change > tolerance if name.endswith("trials_per_second") else change > tolerance
+        if regressed:
+            regressions.append(name)
+        click.echo("%-60s %12.3f %12.3f %+7.1f%%%s" % (name, previous[name], current[name], change * 100,
+                                                        "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def report(results):
+    for protocol, values in results["protocols"].items():
+        click.echo("\n%s: %.1f trials/s, %.0f KiB per experiment, %s threads at peak" %
+                   (protocol, values["trials_per_second"], values["memory_per_experiment_bytes"] / 1024,
+                    values["peak_threads"]))
+        click.echo("  %-40s %8s %10s %10s" % ("operation", "count", "p50 ms", "p99 ms"))
+        for operation, latency in values["latency"].items():
+            click.echo("  %-40s %8s %10.2f %10.2f" % (operation, latency["count"], latency["p50_ms"],
+                                                       latency["p99_ms"]))
+
+
+@click.command()
+@click.option("--protocol", "protocols", multiple=True, type=click.Choice(PROTOCOLS), default=PROTOCOLS,
+              help="Protocol to benchmark, can be repeated, both by default")
+@click.option("--experiments", default=8, type=int, help="Number of experiments run concurrently")
+@click.option("--trials", default=30, type=int, help="Number of trials of each experiment")
+@click.option("--objective", default="branin", type=click.Choice(sorted(OBJECTIVES)), help="Objective function")
+@click.option("--hpo_algo_impl", default="optuna_tpe", type=str, help="Sampler of the experiments")
+@click.option("--seed", default=42, type=int, help="Seed of the samplers, so that runs sample the same configs")
+@click.option("--grpc_server", default=HPOSupportedTypes.GRPC_SERVER, type=click.Choice(("threaded", "aio")),
+              help="gRPC server mode")
+@click.option("--save_baseline", type=click.Path(dir_okay=False), help="Write the results as a baseline JSON file")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False),
+              help="Compare the results with this baseline, exiting with status 1 on a regression")
+@click.option("--tolerance", default=DEFAULT_TOLERANCE, type=float,
+              help="Relative change of a metric beyond which it is a regression")
+def main(protocols, experiments, trials, objective, hpo_algo_impl, seed, grpc_server, save_baseline,
+         baseline, tolerance):
+    """Benchmark the trial loop of concurrent experiments against HPO services started in this process"""
+    # keep request logging and deprecation warnings out of the measurements
+    logging.getLogger().setLevel(logging.CRITICAL)
+    warnings.simplefilter("ignore", FutureWarning)
+    rest_service.HTTPRequestHandler.log_message = lambda *args: None
+
+    ports = start_servers(grpc_server)
+    results = {
+        "parameters": {"experiments": experiments, "trials": trials, "objective": objective,
+                       "hpo_algo_impl": hpo_algo_impl, "seed": seed, "grpc_server": grpc_server},
+        "protocols": {}
+    }
+    for protocol in protocols:
+        results["protocols"][protocol] = run_protocol(protocol, ports[protocol], experiments, trials, objective,
+                                                      hpo_algo_impl, seed)
+    report(results)
+
+    if save_baseline:
+        with open(save_baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+    if baseline:
+        with open(baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), tolerance)
+        if regressions:
+            click.echo("\n%s metrics regressed by more than %.0f%%" % (len(regressions), tolerance * 100))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,19 +13,96 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import contextlib
+import cProfile
+import io
 import os
+import pstats
 
 import optuna
 import threading
+import time
 import json
-import pathlib
-import shutil
+from concurrent import futures
 
+import plotly.graph_objects as go
+
+import metrics
+from bayes_optuna import samplers
+from exceptions import ImportanceUnavailableError
 from logger import get_logger
+from utils import HPOErrorConstants, HPOSupportedTypes
 
 logger = get_logger(__name__)
 
-trials = []
+JOURNAL_STORAGE_PREFIX = "journal:"
+
+# statuses of an experiment that does not run trials anymore, its status does not change after them
+FINISHED_STATUSES = ("Completed", "Stopped", "Deleted", "Failed")
+
+PRUNERS = {
+    "median": optuna.pruners.MedianPruner,
+    "hyperband": optuna.pruners.HyperbandPruner,
+    "successive_halving": optuna.pruners.SuccessiveHalvingPruner
+}
+
+# tunable importance is evaluated on a small shared pool, off the path of trial requests
+importance_executor = futures.ThreadPoolExecutor(
+    max_workers=int(os.environ.get(HPOSupportedTypes.IMPORTANCE_WORKERS_ENV, HPOSupportedTypes.IMPORTANCE_WORKERS)),
+    thread_name_prefix="importance")
+
+
+def create_storage(storage_url):
+    """
+    Create the Optuna storage in which studies and their trials are persisted.
+
+    Parameters:
+        storage_url (str): A SQLAlchemy database URL such as "sqlite:///hpo.db", or "journal:<file path>" for a
+            journal file. Studies are kept in memory when it is empty.
+
+    Returns:
+        storage (optuna.storages.BaseStorage): The storage, or None for in-memory storage.
+    """
+    if not storage_url:
+        return None
+    if storage_url.startswith(JOURNAL_STORAGE_PREFIX):
+        journal_file = storage_url[len(JOURNAL_STORAGE_PREFIX):]
+        return optuna.storages.JournalStorage(optuna.storages.journal.JournalFileBackend(journal_file))
+    return optuna.storages.RDBStorage(url=storage_url)
+
+
+def recover_experiments(storage):
+    """
+    Reload the experiments persisted in the given storage. Unfinished experiments resume at the trial they were
+    interrupted at, trials that were in progress are handed out again with the same config.
+
+    Parameters:
+        storage (optuna.storages.BaseStorage): The storage the studies were persisted to.
+
+    Returns:
+        experiments (list): A list of HpoExperiment, one per recovered study.
+    """
+    experiments = []
+    for summary in optuna.get_all_study_summaries(storage, include_best_trial=False):
+        search_space = summary.user_attrs.get("search_space")
+        if search_space is None:
+            logger.warn("Skipping study without a search space: " + summary.study_name)
+            continue
+        experiment = HpoExperiment(search_space["experiment_name"], search_space["total_trials"],
+                                   search_space["parallel_trials"], search_space["direction"],
+                                   search_space["hpo_algo_impl"], search_space["experiment_id"],
+                                   search_space["objective_function"], search_space["tunables"],
+                                   search_space["value_type"], TrialDetails(), storage,
+                                   search_space.get("early_stopping"), search_space.get("pruner"),
+                                   search_space.get("sampler_params"), search_space.get("additional_objectives"),
+                                   search_space.get("sampler_history"))
+        try:
+            experiment.resume()
+        except Exception as e:
+            logger.warn("Could not recover experiment " + summary.study_name + ": " + str(e))
+            continue
+        experiments.append(experiment)
+    return experiments
 
 
 class TrialDetails:
@@ -39,22 +116,78 @@ class TrialDetails:
     trial_result: str
     result_value_type: str
     result_value: float
+    # trial (optuna.trial.Trial): The Optuna trial returned by study.ask(), told once the result is received.
+    trial: optuna.trial.Trial
+    # sampling_time (float): Seconds spent asking the sampler for the trial and suggesting its tunables.
+    sampling_time: float = 0.0
+    # asked_time (float): time.perf_counter() once the trial was asked, to time the wait for its result.
+    asked_time: float = None
+    # delivered (bool): Whether the config of the trial has been handed to a client, batches hand out the pending
+    # trials that have not been delivered before asking for new ones.
+    delivered: bool = False
 
     def __init__(self, trial_number=-1,trial_json_object = {},trial_result_received = -1,trial_result = "",
-                 result_value_type = "",result_value = 0):
+                 result_value_type = "",result_value = 0, trial=None):
         self.trial_number = trial_number
         self.trial_json_object = trial_json_object
         self.trial_result_received = trial_result_received
         self.trial_result = trial_result
         self.result_value_type = result_value_type
         self.result_value = result_value
+        self.trial = trial
+
+
+class TrialRecord:
+    """
+    A finished trial as kept in the history of an experiment. Experiments can run thousands of trials, so the config is
+    kept as a tuple of (tunable name, value) pairs rather than as the trial json object.
+    """
+    __slots__ = ("trial_number", "config", "trial_result", "result_value", "additional_result_values")
+
+    def __init__(self, trial_number, config, trial_result, result_value, additional_result_values=None):
+        self.trial_number = trial_number
+        self.config = config
+        self.trial_result = trial_result
+        self.result_value = result_value
+        self.additional_result_values = additional_result_values
+
+    def to_json(self) -> dict:
+        trial = {"trial_number": self.trial_number, "trial_result": self.trial_result,
+                 "result_value": self.result_value,
+                 "config": [{"tunable_name": name, "tunable_value": value} for name, value in self.config]}
+        if self.additional_result_values is not None:
+            trial["additional_result_values"] = list(self.additional_result_values)
+        return trial
+
+
+class TrialTiming:
+    """
+    Where the time of a finished trial went, in seconds: asking the sampler for its config, waiting for the client to
+    post its result, waiting for resultsAvailableCond once the result was posted, and telling the result to the study
+    and updating the experiment.
+    """
+    __slots__ = ("trial_number", "sampling", "waiting", "lock_wait", "bookkeeping")
+
+    def __init__(self, trial_number, sampling, waiting, lock_wait, bookkeeping):
+        self.trial_number = trial_number
+        self.sampling = sampling
+        self.waiting = waiting
+        self.lock_wait = lock_wait
+        self.bookkeeping = bookkeeping
+
+    def to_json(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class HpoExperiment:
     """
     HpoExperiment contains the details of a Running experiment.
+
+    Trials are driven with Optuna's ask-and-tell interface: start() asks for the first `parallel_trials` trials and
+    every result received through tell() completes its trial and synchronously asks for the next one, so no thread is
+    held while waiting for the client to run a trial.
     """
-    thread: threading.Thread
+    study: optuna.study.Study
     experiment_name: str
     total_trials: int
     parallel_trials: int
@@ -64,16 +197,63 @@ class HpoExperiment:
     objective_function: str
     tunables: str
     value_type: str
+    # trialDetails (TrialDetails): The most recently started trial.
     trialDetails: TrialDetails
+    # pendingTrials (dict): Trials waiting for a result, keyed by trial number.
+    pendingTrials: dict
+    # trials_started (int): Number of trials asked from the study so far.
+    trials_started: int
+    # storage (optuna.storages.BaseStorage): Storage the study is persisted to, None for in-memory storage.
+    storage: optuna.storages.BaseStorage
     resultsAvailableCond: threading.Condition
-    experimentStartedCond: threading.Condition
     isRunning = True
     started = False
+    # status (str): Status of the experiment as listed by /listexperiments, e.g. "Running trial 2 of 9".
+    status = "Created"
+    # statusVersion (int): Incremented on every status update, waited for by the gRPC streams.
+    statusVersion = 0
+    # statusListeners (list): Functions called on every status update, used by the asyncio gRPC streams.
+    statusListeners: list
     # recommended_config (json): A JSON containing the recommended config.
-    recommended_config = {}
+    recommended_config: dict
+    # earlyStopping (dict): Criteria to stop before total_trials, "patience" trials without an improvement by more than
+    # "min_delta" relative to the best value, and a "max_duration" in seconds. None to always run total_trials.
+    earlyStopping: dict = None
+    # stopReason (str): Why the experiment stopped before total_trials, None otherwise.
+    stopReason: str = None
+    bestValue: float = None
+    trialsWithoutImprovement = 0
+    startTime: float = None
+    # pruner (dict): Pruner deciding on the intermediate values of a trial whether to stop it early, as its "type", one
+    # of PRUNERS, and its parameters. None to never prune trials.
+    pruner: dict = None
+    # additionalObjectives (list): Objectives optimized along with objective_function, as {"objective_function": ...,
+    # "direction": ...}. None to optimize objective_function alone.
+    additionalObjectives: list = None
+    # samplerParams (dict): Keyword arguments of the sampler of hpo_algo_impl, e.g. {"n_startup_trials": 5, "seed": 42}.
+    samplerParams: dict = None
+    # samplerHistory (dict): Bound on the finished trials the sampler learns from, either {"window": n} or
+    # {"top_k": k, "random": r}. None to learn from every trial.
+    samplerHistory: dict = None
+    # warmStartTrials (list): Finished trials to seed the study with, as {"config": [...], "result_value": ...}.
+    warmStartTrials: list
+    # warmStartEnqueue (int): Number of the best warm start trials whose configs are run again first.
+    warmStartEnqueue = 0
+    # startedFuture (futures.Future): Resolved once, when the first trial config is available or the start failed.
+    startedFuture: futures.Future
+    # importanceFuture (futures.Future): Latest tunable importance evaluation, for study version importanceVersion.
+    importanceFuture: futures.Future = None
+    importanceVersion = -1
+    # trialRecords (list): TrialRecord of every finished trial, in the order they finished.
+    trialRecords: list
+    # trialTimings (list): TrialTiming of every finished trial, in the order they finished.
+    trialTimings: list
+    # profiler (cProfile.Profile): Profiles the sampling and bookkeeping of trials if HPO_PROFILE_TRIALS is set.
+    profiler: cProfile.Profile = None
 
     def __init__(self, experiment_name, total_trials, parallel_trials, direction, hpo_algo_impl, id_,
-                 objective_function, tunables, value_type, trialDetails):
+                 objective_function, tunables, value_type, trialDetails, storage=None, early_stopping=None,
+                 pruner=None, sampler_params=None, additional_objectives=None, sampler_history=None):
         self.experiment_name = experiment_name
         self.total_trials = total_trials
         self.parallel_trials = parallel_trials
@@ -84,343 +264,890 @@ class HpoExperiment:
         self.tunables = tunables
         self.value_type = value_type
         self.trialDetails = trialDetails
+        self.pendingTrials = {}
+        self.trials_started = 0
+        self.recommended_config = {}
+        self.storage = storage
+        self.earlyStopping = early_stopping
+        self.pruner = pruner
+        self.samplerParams = sampler_params
+        self.additionalObjectives = additional_objectives
+        self.samplerHistory = sampler_history
+        self.warmStartTrials = []
+        self.startedFuture = futures.Future()
+        self.statusListeners = []
         self.resultsAvailableCond = threading.Condition()
-        self.experimentStartedCond = threading.Condition()
-        self.thread = threading.Thread(target=self.recommend)
+        self.trialRecords = []
+        self.trialTimings = []
+        if os.environ.get(HPOSupportedTypes.PROFILE_TRIALS_ENV, "").lower() == "true":
+            self.profiler = cProfile.Profile()
+
+    def search_space(self) -> dict:
+        """Return the search space the experiment was created with, as persisted along with the study."""
+        search_space = {
+            "experiment_name": self.experiment_name,
+            "total_trials": self.total_trials,
+            "parallel_trials": self.parallel_trials,
+            "direction": self.direction,
+            "hpo_algo_impl": self.hpo_algo_impl,
+            "experiment_id": self.id_,
+            "objective_function": self.objective_function,
+            "tunables": self.tunables,
+            "value_type": self.value_type
+        }
+        if self.earlyStopping:
+            search_space["early_stopping"] = self.earlyStopping
+        if self.pruner:
+            search_space["pruner"] = self.pruner
+        if self.samplerParams:
+            search_space["sampler_params"] = self.samplerParams
+        if self.additionalObjectives:
+            search_space["additional_objectives"] = self.additionalObjectives
+        if self.samplerHistory:
+            search_space["sampler_history"] = self.samplerHistory
+        return search_space
+
+    def create_sampler(self):
+        # Set the logging level for the Optuna’s root logger
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        # Propagate all of Optuna log outputs to the root logger
+        optuna.logging.enable_propagation()
+        # Disable the default handler of the Optuna’s root logger
+        optuna.logging.disable_default_handler()
 
-    def start(self) -> threading.Condition:
+        # Choose a sampler based on the value of hpo_algo_impl
+        sampler = samplers.create_sampler(self.hpo_algo_impl, self.samplerParams)
+        return samplers.create_history_bounded_sampler(sampler, self.samplerHistory)
+
+    def isMultiObjective(self) -> bool:
+        return bool(self.additionalObjectives)
+
+    def directions(self) -> list:
+        """Return the direction of every objective, starting with the direction of objective_function."""
+        return [self.direction] + [objective["direction"] for objective in self.additionalObjectives or []]
+
+    def create_pruner(self):
+        """Create the Optuna pruner of the experiment, a NopPruner if trials are never to be pruned."""
+        if not self.pruner:
+            return optuna.pruners.NopPruner()
+        params = {key: value for key, value in self.pruner.items() if key != "type"}
+        return PRUNERS[self.pruner["type"]](**params)
+
+    def start(self):
+        """
+        Create the study and ask for the first `parallel_trials` trials. The experiment is ready to accept results once
+        this returns, at which point startedFuture is resolved.
+        """
         try:
-            self.experimentStartedCond.acquire()
-            self.thread.daemon = True
-            self.thread.start()
+            sampler = self.create_sampler()
+            pruner = self.create_pruner()
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            try:
+                if not self.isRunning:
+                    # deleted while its start was queued, creating the study now would leave it behind in the storage,
+                    # to be recovered on restart. delete() waits for the lock, it cannot run while the study is created.
+                    logger.info("Experiment " + self.experiment_name + " was deleted before it started")
+                    self.startedFuture.set_exception(RuntimeError(HPOErrorConstants.EXPERIMENT_DELETED))
+                    return
+                self.startTime = time.time()
+                # Create a study object
+                self.study = optuna.create_study(directions=self.directions(), sampler=sampler, pruner=pruner,
+                                                 study_name=self.experiment_name, storage=self.storage)
+                if self.storage is not None:
+                    self.study.set_user_attr("search_space", self.search_space())
+                if self.warmStartTrials:
+                    self.warm_start()
+
+                self.updateExperimentStatus("Started")
+
+                for _ in range(min(self.parallel_trials, self.total_trials)):
+                    self.ask()
+                self.started = True
+            finally:
+                self.resultsAvailableCond.release()
+        except Exception as e:
+            self.updateExperimentStatus("Failed")
+            self.startedFuture.set_exception(e)
+            raise
+        self.startedFuture.set_result(True)
+
+    def set_warm_start(self, trials, enqueue_best=0):
+        """Seed the study with the given finished trials when the experiment starts."""
+        self.warmStartTrials = trials
+        self.warmStartEnqueue = enqueue_best
+
+    def warm_start(self):
+        """
+        Add the warm start trials to the study as finished trials, so that the sampler learns from them, and enqueue
+        the configs of the best ones to be run as the first trials. Tunable values outside of the search space are
+        dropped, as are trials that cannot be added. Must be called holding resultsAvailableCond.
+        """
+        distributions = tunable_distributions(self.tunables)
+        frozen_trials = []
+        for prior_trial in self.warmStartTrials:
+            params = {config["tunable_name"]: config["tunable_value"] for config in prior_trial["config"]
+                      if config["tunable_name"] in distributions}
+            values = [prior_trial["result_value"]] + prior_trial.get("additional_result_values", [])
+            if len(values) != len(self.directions()):
+                logger.warn("Skipping warm start trial of experiment " + self.experiment_name +
+                            ": it has a value for " + str(len(values)) + " objectives")
+                continue
+            try:
+                frozen_trials.append(optuna.trial.create_trial(
+                    params=params, distributions={name: distributions[name] for name in params},
+                    values=[float(value) for value in values]))
+            except ValueError as e:
+                logger.warn("Skipping warm start trial of experiment " + self.experiment_name + ": " + str(e))
+        self.study.add_trials(frozen_trials)
+
+        # the best trials of a multi-objective experiment are the best on objective_function
+        best_trials = sorted(frozen_trials, key=lambda frozen_trial: frozen_trial.values[0],
+                             reverse=self.direction == "maximize")
+        for frozen_trial in best_trials[:self.warmStartEnqueue]:
+            self.study.enqueue_trial(frozen_trial.params)
+        logger.info("Warm started experiment " + self.experiment_name + " with " + str(len(frozen_trials)) +
+                    " trials")
+
+    def get_trial_history(self) -> list:
+        """Return the completed trials of the study, in the format of warm start trials."""
+        if not self.hasStarted():
+            return []
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            frozen_trials = self.study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
         finally:
-            self.experimentStartedCond.release()
-        return self.experimentStartedCond
+            self.resultsAvailableCond.release()
+        history = []
+        for frozen_trial in frozen_trials:
+            prior_trial = {"config": [{"tunable_name": name, "tunable_value": value}
+                                      for name, value in frozen_trial.params.items()],
+                           "result_value": frozen_trial.values[0]}
+            if len(frozen_trial.values) > 1:
+                prior_trial["additional_result_values"] = frozen_trial.values[1:]
+            history.append(prior_trial)
+        return history
+
+    def resume(self):
+        """
+        Load the persisted study and continue the experiment from where it was interrupted. Trials that were waiting
+        for a result are registered as pending again, with the config they were originally given.
+        """
+        sampler = self.create_sampler()
+        pruner = self.create_pruner()
 
-    def hasStarted(self) -> bool:
-        started = False
         try:
-            self.experimentStartedCond.acquire()
-            started = self.started
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            self.study = optuna.load_study(study_name=self.experiment_name, storage=self.storage, sampler=sampler,
+                                           pruner=pruner)
+            self.stopReason = self.study.user_attrs.get("stop_reason")
+            self.startTime = time.time()
+
+            finished_trials = []
+            for frozen_trial in self.study.get_trials(deepcopy=False):
+                trial_number = frozen_trial.user_attrs.get("trial_number")
+                if trial_number is None:
+                    continue
+                self.trials_started = max(self.trials_started, trial_number + 1)
+                if frozen_trial.datetime_start is not None:
+                    self.startTime = min(self.startTime, frozen_trial.datetime_start.timestamp())
+                if frozen_trial.state.is_finished():
+                    finished_trials.append((trial_number, frozen_trial))
+                elif frozen_trial.state == optuna.trial.TrialState.RUNNING:
+                    trial = optuna.trial.Trial(self.study, frozen_trial._trial_id)
+                    trialDetails = TrialDetails(trial_number=trial_number, trial=trial)
+                    # suggesting an already sampled tunable returns the stored value
+                    trialDetails.trial_json_object = suggest_tunables(trial, self.tunables)
+                    # the wait for the result of a resumed trial is timed from the restart
+                    trialDetails.asked_time = time.perf_counter()
+                    self.pendingTrials[trial_number] = trialDetails
+                    if trial_number > self.trialDetails.trial_number:
+                        self.trialDetails = trialDetails
+
+            # replay the results in the order they were asked for, to restore the early stopping state and the trial
+            # history
+            for trial_number, frozen_trial in sorted(finished_trials, key=lambda finished_trial: finished_trial[0]):
+                # early stopping only considers objective_function
+                self.track_result(frozen_trial.values[0] if frozen_trial.values else None)
+                self.trialRecords.append(trial_record(trial_number, frozen_trial, self.tunables))
+
+            self.updateExperimentStatus("Started")
+            while len(self.pendingTrials) < self.parallel_trials and self.trials_started < self.total_trials and \
+                    self.stopReason is None:
+                self.ask()
+            self.started = True
+            self.startedFuture.set_result(True)
+
+            logger.info("Recovered experiment " + self.experiment_name + " at trial " +
+                        str(self.trials_started) + " of " + str(self.total_trials))
+            if not self.pendingTrials:
+                self.trialDetails = TrialDetails()
+                self.recommend()
         finally:
-            self.experimentStartedCond.release()
-        return started
+            self.resultsAvailableCond.release()
 
-    def notifyStarted(self):
-        # notify hpo_service.startExperiment() that experiment is ready to accept results
-        if not self.hasStarted():
-            try:
-                self.experimentStartedCond.acquire()
-                self.started = True
-                self.experimentStartedCond.notify()
-            finally:
-                self.experimentStartedCond.release()
+    def hasStarted(self) -> bool:
+        return self.startedFuture.done() and self.startedFuture.exception() is None
 
-    def perform_experiment(self):
+    def isStarting(self) -> bool:
+        """Return True while an experiment started in async mode has not yet sampled its first trial config."""
+        return not self.startedFuture.done()
+
+    def getStartError(self):
+        """Return the error message if the experiment could not be started, None otherwise."""
+        if self.startedFuture.done() and self.startedFuture.exception() is not None:
+            return HPOErrorConstants.EXPERIMENT_START_ERROR + " " + str(self.startedFuture.exception())
+
+    def getTrialNumber(self) -> int:
+        """Return the number of the most recently started trial."""
         try:
-            self.resultsAvailableCond.acquire()
-            self.resultsAvailableCond.wait()
-            if self.isRunning == False:
-                raise Exception("Stopping experiment: {}".format(self.experiment_name))
-            result_value = self.trialDetails.result_value
-            trial_result = self.trialDetails.trial_result
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            trial_number = self.trialDetails.trial_number
         finally:
             self.resultsAvailableCond.release()
-        return result_value, trial_result
+        return trial_number
 
-    def recommend(self):
+    def getTrialConfig(self, trial_number=None):
+        """
+        Return the tunable values of the given trial, or of the most recently started trial, as listed in its trial
+        json object, and mark the trial delivered. None if the given trial is not pending, e.g. because its result
+        arrived since it was validated.
         """
-        Perform Bayesian Optimization with Optuna using the appropriate sampler and recommend the best config.
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            if trial_number is None:
+                trialDetails = self.trialDetails
+            else:
+                trialDetails = self.pendingTrials.get(trial_number)
+                if trialDetails is None:
+                    return None
+            trialDetails.delivered = True
+            trialConfig = trialDetails.trial_json_object
+        finally:
+            self.resultsAvailableCond.release()
+        return trialConfig
 
-        Parameters:
-            experiment_name (str): The name of the application that is being optimized.
-            direction (str): Direction of optimization, minimize or maximize.
-            hpo_algo_impl (str): Hyperparameter optimization library to perform Bayesian Optimization.
-            id_ (str): The id of the application that is being optimized.
-            objective_function (str): The objective function that is being optimized.
-            tunables (list): A list containing the details of each tunable in a dictionary format.
-            value_type (string): Value type of the objective function.
+    def getTrialJsonObject(self, trial_number=None):
+        """Return the trial json object of the given trial, or of the most recent trial, see getTrialConfig."""
+        trialConfig = self.getTrialConfig(trial_number)
+        if trialConfig is not None:
+            return json.dumps(trialConfig)
+
+    def validate_additional_result_values(self, trial_result, additional_result_values) -> str:
+        """Return an error message unless a successful result has a value for every additional objective."""
+        if trial_result in ("failure", "prune"):
+            return ""
+        if len(additional_result_values or []) != len(self.additionalObjectives or []):
+            return HPOErrorConstants.ADDITIONAL_VALUES_MISMATCH
+        if any(value < 0 for value in additional_result_values or []):
+            return HPOErrorConstants.NEGATIVE_VALUE
+        return ""
+
+    def ask(self) -> TrialDetails:
+        """Ask the study for a new trial and register it as pending. Must be called holding resultsAvailableCond."""
+        with metrics.TRIAL_ASK_DURATION.time() as timer, self.profiling():
+            trial = self.study.ask()
+            trialDetails = TrialDetails(trial_number=self.trials_started, trial=trial)
+            # warm start trials take Optuna trial numbers too, so the experiment trial number is kept along with the
+            # trial
+            trial.set_user_attr("trial_number", trialDetails.trial_number)
+            trialDetails.trial_json_object = suggest_tunables(trial, self.tunables)
+        trialDetails.sampling_time = timer.elapsed
+        trialDetails.asked_time = time.perf_counter()
+        logger.debug("Experiment tunables: " + str(trialDetails.trial_json_object))
+
+        self.trials_started += 1
+        self.pendingTrials[trialDetails.trial_number] = trialDetails
+        self.trialDetails = trialDetails
+
+        trials_sum = self.total_trials - 1
+        status_to_send = "Running trial " + str(trialDetails.trial_number) + " of " + str(trials_sum)
+        self.updateExperimentStatus(status_to_send)
+        return trialDetails
+
+    def ask_batch(self, count) -> list:
         """
-        # Set the logging level for the Optuna’s root logger
-        optuna.logging.set_verbosity(optuna.logging.WARNING)
-        # Propagate all of Optuna log outputs to the root logger
-        optuna.logging.enable_propagation()
-        # Disable the default handler of the Optuna’s root logger
-        optuna.logging.disable_default_handler()
+        Return up to `count` trials to run, starting with the pending trials that have not been delivered to a client
+        yet, e.g. the trials asked once results arrived, then new trials asked for on top of the pending ones. The
+        batch is smaller when fewer trials are left to run.
+        """
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            if not self.isRunning:
+                return []
+            batch = [trialDetails for _, trialDetails in sorted(self.pendingTrials.items())
+                     if not trialDetails.delivered][:count]
+            while len(batch) < count and self.trials_started < self.total_trials and self.stopReason is None:
+                batch.append(self.ask())
+            for trialDetails in batch:
+                trialDetails.delivered = True
+        finally:
+            self.resultsAvailableCond.release()
+        return batch
 
-        # Choose a sampler based on the value of ml_algo_impl
-        if self.hpo_algo_impl == "optuna_tpe":
-            sampler = optuna.samplers.TPESampler()
-        elif self.hpo_algo_impl == "optuna_tpe_multivariate":
-            sampler = optuna.samplers.TPESampler(multivariate=True)
-        elif self.hpo_algo_impl == "optuna_skopt":
-            sampler = optuna.integration.SkoptSampler()
+    def get_trial_batch(self, count) -> list:
+        """Return the numbers and trial json objects of up to `count` trials to run, see ask_batch."""
+        return [{"trial_number": trialDetails.trial_number, "trial_config": trialDetails.trial_json_object}
+                for trialDetails in self.ask_batch(count)]
+
+    def getPendingTrialsAfter(self, trial_number) -> list:
+        """Return the pending trials numbered after the given trial, in the order they were started."""
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            pending = [trialDetails for number, trialDetails in sorted(self.pendingTrials.items())
+                       if number > trial_number]
+        finally:
+            self.resultsAvailableCond.release()
+        return pending
 
-        # Create a study object
+    def getTrialsAfter(self, trial_number) -> list:
+        """
+        Return the trials numbered after the given trial, pending or finished, ordered by trial number. Finished trials
+        only carry their trial number and config.
+        """
         try:
-            study = optuna.create_study(direction=self.direction, sampler=sampler, study_name=self.experiment_name)
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            trials = [trialDetails for number, trialDetails in self.pendingTrials.items() if number > trial_number]
+            # trials finish out of order, but only the most recently finished ones can be numbered after trial_number
+            finished = self.trials_started - 1 - trial_number - len(trials)
+            for trialRecord in reversed(self.trialRecords):
+                if finished <= 0:
+                    break
+                if trialRecord.trial_number > trial_number:
+                    trials.append(TrialDetails(trial_number=trialRecord.trial_number, trial_json_object=[
+                        {"tunable_name": name, "tunable_value": value} for name, value in trialRecord.config]))
+                    finished -= 1
+        finally:
+            self.resultsAvailableCond.release()
+        return sorted(trials, key=lambda trialDetails: trialDetails.trial_number)
 
-            # Update experiment html with the experiment name
+    def getPendingTrial(self, trial_number) -> TrialDetails:
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            trialDetails = self.pendingTrials.get(trial_number)
+        finally:
+            self.resultsAvailableCond.release()
+        return trialDetails
+
+    def report(self, trial_number, step, result_value):
+        """
+        Report an intermediate value of a pending trial at the given step. If the pruner decides that the trial is
+        unpromising, the trial is completed as pruned, the next trial is asked for and True is returned, so that the
+        client can stop running it. Returns None if the trial is not pending.
+        """
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            trialDetails: TrialDetails = self.pendingTrials.get(trial_number)
+            if not self.isRunning or trialDetails is None:
+                return None
+            trialDetails.trial.report(float(result_value), step)
+            should_prune = trialDetails.trial.should_prune()
+            if should_prune:
+                logger.info("Pruning trial " + str(trial_number) + " of experiment " + self.experiment_name +
+                            " at step " + str(step))
+                self.tell(trial_number, "prune", self.value_type, result_value)
+            return should_prune
+        finally:
+            self.resultsAvailableCond.release()
+
+    def tell(self, trial_number, trial_result, result_value_type, result_value, additional_result_values=None):
+        """
+        Complete a pending trial with the result posted by the client and ask for the next trial, if any are left.
+        Once every trial has completed, the recommended config is published. additional_result_values holds the
+        values of the additional objectives, in the order they are listed.
+        """
+        received_time = time.perf_counter()
+        try:
+            lock_wait = metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            if not self.isRunning:
+                return
+            trialDetails: TrialDetails = self.pendingTrials.pop(trial_number, None)
+            if trialDetails is None:
+                return
+            bookkeeping_start = time.perf_counter()
+            trialDetails.trial_result = trial_result
+            trialDetails.result_value_type = result_value_type
+            trialDetails.result_value = result_value
+            trialDetails.trial_result_received = 1
+
+            with metrics.TRIAL_TELL_DURATION.time(), self.profiling():
+                if trial_result in ("failure", "prune"):
+                    self.study.tell(trialDetails.trial, state=optuna.trial.TrialState.PRUNED)
+                    value = None
+                else:
+                    value = round(float(result_value), 2)
+                    if self.isMultiObjective():
+                        self.study.tell(trialDetails.trial,
+                                        [value] + [round(float(v), 2) for v in additional_result_values])
+                    else:
+                        self.study.tell(trialDetails.trial, value)
+            self.track_result(value)
+
+            self.trialRecords.append(TrialRecord(
+                trial_number, tuple((tunable["tunable_name"], tunable["tunable_value"])
+                                    for tunable in trialDetails.trial_json_object),
+                trial_result, value,
+                tuple(float(v) for v in additional_result_values) if value is not None and self.isMultiObjective()
+                else None))
+
+            if self.stopReason is None:
+                self.stopReason = self.check_early_stopping()
+                if self.stopReason is not None:
+                    logger.info("Stopping experiment " + self.experiment_name + " early: " + self.stopReason)
+                    if self.storage is not None:
+                        self.study.set_user_attr("stop_reason", self.stopReason)
+
+            # the next trial is asked for below, its sampling time is part of its own timing
+            self.trialTimings.append(TrialTiming(trial_number, trialDetails.sampling_time,
+                                                 received_time - trialDetails.asked_time, lock_wait,
+                                                 time.perf_counter() - bookkeeping_start))
+
+            # trials asked in a batch may exceed parallel_trials, top up only once fewer are pending. Once stopped
+            # early, no more trials are asked and the experiment completes when the pending trials have finished.
+            if self.trials_started < self.total_trials and len(self.pendingTrials) < self.parallel_trials and \
+                    self.stopReason is None:
+                self.ask()
+            elif not self.pendingTrials:
+                self.trialDetails = TrialDetails()
+                self.recommend()
+        finally:
+            self.resultsAvailableCond.release()
+
+    def tell_batch(self, results):
+        """Tell the results of several trials to the study, in the order they are given."""
+        for result in results:
+            self.tell(result["trial_number"], result["trial_result"], result["result_value_type"],
+                      result["result_value"], result.get("additional_result_values"))
+
+    @contextlib.contextmanager
+    def profiling(self):
+        """Profile the block if the experiment is profiled. Must be called holding resultsAvailableCond."""
+        enabled = False
+        if self.profiler is not None:
             try:
-                self.updateExperimentHtml("Started")
-            except:
-                logger.info("Error in updating experiment html")
+                self.profiler.enable()
+                enabled = True
+            except ValueError:
+                # Python 3.12 allows one profiler at a time, the block is left out while another experiment is profiled
+                pass
+        try:
+            yield
+        finally:
+            if enabled:
+                self.profiler.disable()
 
-            # Execute an optimization by using an 'Objective' instance
-            study.optimize(Objective(self), n_trials=self.total_trials, n_jobs=self.parallel_trials)
+    def get_timing_report(self) -> dict:
+        """
+        Return the timing of every finished trial, their total, mean and maximum per phase, and if the experiment is
+        profiled, the functions that took the most cumulative time while sampling and bookkeeping.
+        """
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            timings = [trialTiming.to_json() for trialTiming in self.trialTimings]
+            profile = None
+            if self.profiler is not None:
+                stream = io.StringIO()
+                try:
+                    pstats.Stats(self.profiler, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                        HPOSupportedTypes.PROFILE_LINES)
+                except TypeError:
+                    # nothing has been profiled yet
+                    pass
+                profile = stream.getvalue()
+        finally:
+            self.resultsAvailableCond.release()
 
-            self.trialDetails.trial_number = -1
+        summary = {}
+        for phase in TrialTiming.__slots__[1:]:
+            values = [timing[phase] for timing in timings]
+            summary[phase] = {"total": sum(values), "mean": sum(values) / len(values) if values else 0.0,
+                              "max": max(values, default=0.0)}
+        report = {"trials": timings, "summary": summary}
+        if profile is not None:
+            report["profile"] = profile
+        return report
 
+    def get_trial_records(self, offset, limit):
+        """Return the number of finished trials and the `limit` trials that finished from `offset` on, as json."""
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            total = len(self.trialRecords)
+            records = self.trialRecords[offset:offset + limit]
+        finally:
+            self.resultsAvailableCond.release()
+        return total, [trialRecord.to_json() for trialRecord in records]
+
+    def track_result(self, value):
+        """
+        Update the early stopping state with the objective_function value of a finished trial, None if the trial
+        failed.
+        """
+        if value is None:
+            self.trialsWithoutImprovement += 1
+            return
+        min_delta = 0
+        if self.earlyStopping:
+            min_delta = self.earlyStopping.get("min_delta", 0) * abs(self.bestValue or 0)
+        if self.bestValue is None or \
+                (self.direction == "maximize" and value > self.bestValue + min_delta) or \
+                (self.direction != "maximize" and value < self.bestValue - min_delta):
+            self.bestValue = value
+            self.trialsWithoutImprovement = 0
+        else:
+            self.trialsWithoutImprovement += 1
+
+    def check_early_stopping(self):
+        """Return why the experiment should stop early if one of the early stopping criteria is met, None otherwise."""
+        if not self.earlyStopping:
+            return None
+        patience = self.earlyStopping.get("patience")
+        if patience and self.trialsWithoutImprovement >= patience:
+            return "No improvement in the last " + str(self.trialsWithoutImprovement) + " trials"
+        max_duration = self.earlyStopping.get("max_duration")
+        if max_duration and time.time() - self.startTime >= max_duration:
+            return "Time budget of " + str(max_duration) + " seconds exceeded"
+        return None
+
+    def recommend(self):
+        """
+        Publish the best config found by the study as the recommended config. Tunable importance is evaluated
+        afterwards in the background so that it does not delay the recommended config, plots are only rendered when
+        they are requested.
+        """
+        try:
+            best_trial = self.best_trial()
             # Get the best parameter
-            logger.info("BEST PARAMETER: " + str(study.best_params))
+            logger.info("BEST PARAMETER: " + str(best_trial.params))
             # Get the best value
-            logger.info("BEST VALUE: " + str(study.best_value))
+            logger.info("BEST VALUE: " + str(best_trial.values))
             # Get the best trial
-            logger.info("BEST TRIAL: " + str(study.best_trial))
+            logger.info("BEST TRIAL: " + str(best_trial))
 
-            logger.debug("ALL TRIALS: " + str(trials))
+            optimal_value = {"objective_function": {
+                "name": self.objective_function,
+                "value": best_trial.values[0],
+                "value_type": self.value_type
+            }, "tunables": []}
+            if self.isMultiObjective():
+                optimal_value["additional_objectives"] = [
+                    {"name": objective["objective_function"], "value": value, "value_type": self.value_type}
+                    for objective, value in zip(self.additionalObjectives, best_trial.values[1:])]
 
-            # Generate tunable importance
-            self.generate_importance(study)
-
-            # Generate plots
-            self.generate_plots(study)
-
-            # Update experiment as complete
-            self.updateExperimentHtml("Completed")
+            for tunable in self.tunables:
+                # conditional tunables may not be part of the best trial
+                if tunable["name"] not in best_trial.params:
+                    continue
+                tunable_value = best_trial.params[tunable["name"]]
+                optimal_value["tunables"].append(
+                    {
+                        "name": tunable["name"],
+                        "value": tunable_value,
+                        "value_type": tunable["value_type"]
+                    }
+                )
 
-            try:
-                self.resultsAvailableCond.acquire()
-                optimal_value = {"objective_function": {
-                    "name": self.objective_function,
-                    "value": study.best_value,
-                    "value_type": self.value_type
-                }, "tunables": []}
-
-                for tunable in self.tunables:
-                    for key, value in study.best_params.items():
-                        if key == tunable["name"]:
-                            tunable_value = value
-                    optimal_value["tunables"].append(
-                        {
-                            "name": tunable["name"],
-                            "value": tunable_value,
-                            "value_type": tunable["value_type"]
-                        }
-                    )
-
-                self.recommended_config["id"] = self.id_
-                self.recommended_config["experiment_name"] = self.experiment_name
-                self.recommended_config["direction"] = self.direction
-                self.recommended_config["optimal_value"] = optimal_value
-            finally:
-                self.resultsAvailableCond.release()
+            self.recommended_config["id"] = self.id_
+            self.recommended_config["experiment_name"] = self.experiment_name
+            self.recommended_config["direction"] = self.direction
+            self.recommended_config["optimal_value"] = optimal_value
+            if self.stopReason is not None:
+                self.recommended_config["stop_reason"] = self.stopReason
 
             logger.info("RECOMMENDED CONFIG: " + str(self.recommended_config))
         except:
             logger.warn("Experiment stopped: " + str(self.experiment_name))
-            self.updateExperimentHtml("Stopped")
+            self.updateExperimentStatus("Stopped")
+            return
+
+        # Update experiment as complete
+        self.updateExperimentStatus("Completed")
+        for plot_type in HPOSupportedTypes.PLOT_TYPES:
+            logger.info("ACCESS " + plot_type + " CHART AT <REST_SERVICE_URL>/plot?" + "experiment_name=" +
+                        self.experiment_name + "&type=" + plot_type)
+
+        # Generate tunable importance
+        self.request_importance(refresh=True)
+
+    def best_trial(self) -> optuna.trial.FrozenTrial:
+        """
+        Return the best trial of the experiment. With multiple objectives, this is the trial of the Pareto front with
+        the best objective_function value.
+        """
+        best_trials = self.best_trials()
+        if not best_trials:
+            raise ValueError("No trials of experiment " + self.experiment_name + " are completed yet")
+        return best_trials[0]
+
+    def best_trials(self) -> list:
+        """
+        Return the completed trials of the experiment that are not beaten on every objective by another one, ordered by
+        their objective_function value. The warm start trials the study learned from are left out, they were not run
+        by this experiment and have no trial number.
+        """
+        signs = [-1 if direction == "maximize" else 1 for direction in self.directions()]
+        trials = [(frozen_trial, [sign * value for sign, value in zip(signs, frozen_trial.values)])
+                  for frozen_trial in self.study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+                  if "trial_number" in frozen_trial.user_attrs]
+        if not self.isMultiObjective():
+            best_value = min((values[0] for _, values in trials), default=None)
+            return [frozen_trial for frozen_trial, values in trials if values[0] == best_value]
+        best_trials = [frozen_trial for frozen_trial, values in trials
+                       if not any(dominates(other, values) for _, other in trials)]
+        return sorted(best_trials, key=lambda frozen_trial: frozen_trial.values[0],
+                      reverse=self.direction == "maximize")
+
+    def get_pareto_front(self) -> list:
+        """
+        Return the trials that are not beaten on every objective by another trial, ordered by their objective_function
+        value, as {"trial_number": ..., "objective_values": [...], "config": [...]}.
+        """
+        if not self.hasStarted():
+            return []
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            best_trials = self.best_trials()
+        finally:
+            self.resultsAvailableCond.release()
+        objective_functions = [self.objective_function] + \
+                              [objective["objective_function"] for objective in self.additionalObjectives or []]
+        return [{"trial_number": frozen_trial.user_attrs["trial_number"],
+                 "objective_values": [{"name": name, "value": value}
+                                      for name, value in zip(objective_functions, frozen_trial.values)],
+                 "config": [{"tunable_name": name, "tunable_value": value}
+                            for name, value in frozen_trial.params.items()]} for frozen_trial in best_trials]
+
+    def study_version(self) -> int:
+        """Return the number of finished trials, which identifies the state of the study plots are rendered from."""
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            version = self.trials_started - len(self.pendingTrials)
+        finally:
+            self.resultsAvailableCond.release()
+        return version
 
     def delete(self):
         try:
-            self.resultsAvailableCond.acquire()
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
             self.isRunning = False
-            # Update experiment html that it has deleted.
-            self.updateExperimentHtml("Deleted")
-            self.resultsAvailableCond.notify()
+            self.pendingTrials = {}
+            # released here rather than with the experiment, which streams may still hold on to
+            self.trialRecords = []
+            self.trialTimings = []
+            self.updateExperimentStatus("Deleted")
+            if self.storage is not None:
+                try:
+                    optuna.delete_study(study_name=self.experiment_name, storage=self.storage)
+                except KeyError:
+                    logger.warn("Study of experiment " + self.experiment_name + " was not found in storage")
         finally:
             self.resultsAvailableCond.release()
 
-    def generate_importance(self, study):
+    def request_importance(self, refresh=False):
+        """
+        Return the version and the future of the latest tunable importance evaluation. A new evaluation is submitted
+        if there is none yet, or if refresh is set and trials have finished since the latest one.
+        """
         try:
-            importance = optuna.importance.get_param_importances(study)
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            version = self.study_version()
+            if self.importanceFuture is None or (refresh and self.importanceVersion != version):
+                self.importanceVersion = version
+                self.importanceFuture = importance_executor.submit(self.generate_importance)
+            importanceVersion = self.importanceVersion
+            importanceFuture = self.importanceFuture
+        finally:
+            self.resultsAvailableCond.release()
+        return importanceVersion, importanceFuture
+
+    def get_importance(self, refresh=False):
+        """
+        Return the number of finished trials the tunable importance was evaluated for, and the importance of each
+        tunable. Raises ImportanceUnavailableError if importance cannot be evaluated for the trials of the study.
+        """
+        version, importanceFuture = self.request_importance(refresh)
+        return version, importanceFuture.result()
+
+    def generate_importance(self) -> dict:
+        try:
+            with metrics.IMPORTANCE_DURATION.time():
+                importance = optuna.importance.get_param_importances(self.study, target=self.plot_target())
             logger.info("TUNABLES IMPORTANCE: " + str(json.dumps(importance)))
+            return importance
         except ValueError:
-            logger.warn("Cannot evaluate tunable importance with only a single trial")
+            errorMsg = "Cannot evaluate tunable importance with only a single trial"
         except RuntimeError:
-            logger.warn("Encountered zero total variance to calculate tunable importance")
-        except:
-            logger.warn("Encountered issues calculating tunable importance")
+            errorMsg = "Encountered zero total variance to calculate tunable importance"
+        except Exception:
+            errorMsg = "Encountered issues calculating tunable importance"
+        logger.warn(errorMsg)
+        raise ImportanceUnavailableError(errorMsg)
+
+    def plot_target(self):
+        """Return the target that importance and plots are evaluated for, objective_function with multiple objectives."""
+        if self.isMultiObjective():
+            return lambda frozen_trial: frozen_trial.values[0]
+        return None
 
-    def generate_plots(self, study):
-        # Generate different plots
-        plots = ["tunable_importance", "optimization_history", "slice", "parallel_coordinate"]
-        for plot_type in plots:
-            plotmsg = ""
+    def generate_plot(self, plot_type) -> str:
+        """
+        Render a plot of the study as html.
+
+        Parameters:
+            plot_type (str): One of HPOSupportedTypes.PLOT_TYPES.
+        """
+        plotmsg = ""
+        if plot_type == "tunable_importance":
+            # reuse the cached importance rather than evaluating it again through plot_param_importances
             try:
-                dirName = "plots/" + self.experiment_name
-                os.makedirs(dirName, exist_ok=True)
-                plotsDir = os.path.dirname(os.path.realpath(dirName))
-
-                if plot_type == "tunable_importance":
-                    try:
-                        plotFile = plotsDir + "/" + self.experiment_name + "/tunable_importance.html"
-                        plot = optuna.visualization.plot_param_importances(study)
-                    except ValueError:
-                        plotmsg = "Cannot generate tunable importance with only a single trial!"
-                        logger.warn(plotmsg)
-                    except RuntimeError:
-                        plotmsg = "Encountered zero total variance to generate tunable importance!"
-                        logger.warn(plotmsg)
-                if plot_type == "optimization_history":
-                    plot = optuna.visualization.plot_optimization_history(study)
-                    plotFile = plotsDir + "/" + self.experiment_name + "/optimization_history.html"
-                if plot_type == "slice":
-                    plot = optuna.visualization.plot_slice(study)
-                    plotFile = plotsDir + "/" + self.experiment_name + "/slice.html"
-                if plot_type == "parallel_coordinate":
-                    plot = optuna.visualization.plot_parallel_coordinate(study)
-                    plotFile = plotsDir + "/" + self.experiment_name + "/parallel_coordinate.html"
-                # Commenting out contour plots as it gets hung sometimes when there are lot of tunables for a 100 trial experiment
-                #if plot_type == "contour":
-                #plot = optuna.visualization.plot_contour(study)
-                #plotFile = plotsDir + "/" + self.experiment_name + "/contour.html"
-
-                func = open(plotFile, "w")
-                if plotmsg != "":
-                    func.write("<html><head></head> <body> <h2>" + plotmsg + " </h2></body></html>")
-                    func.close()
-                else:
-                    func.write(plot.to_html())
-                    func.close()
-                    logger.info("ACCESS " + plot_type + " CHART AT <REST_SERVICE_URL>/plot?" + "experiment_name=" + self.experiment_name + "&type=" + plot_type)
-            except:
-                logger.warn("Issues creating " + plot_type + " html file")
+                _, importance = self.get_importance(refresh=True)
+                plot = go.Figure(go.Bar(x=list(importance.values())[::-1], y=list(importance.keys())[::-1],
+                                        orientation="h"))
+                plot.update_layout(title="Hyperparameter Importances", xaxis_title="Importance for Objective Value",
+                                   yaxis_title="Hyperparameter")
+            except ImportanceUnavailableError as e:
+                plotmsg = str(e) + "!"
+        elif plot_type == "optimization_history":
+            plot = optuna.visualization.plot_optimization_history(self.study, target=self.plot_target(),
+                                                                  target_name=self.objective_function)
+        elif plot_type == "slice":
+            plot = optuna.visualization.plot_slice(self.study, target=self.plot_target(),
+                                                   target_name=self.objective_function)
+        elif plot_type == "parallel_coordinate":
+            plot = optuna.visualization.plot_parallel_coordinate(self.study, target=self.plot_target(),
+                                                                 target_name=self.objective_function)
+        # Commenting out contour plots as it gets hung sometimes when there are lot of tunables for a 100 trial experiment
+        #elif plot_type == "contour":
+        #plot = optuna.visualization.plot_contour(self.study)
 
-    def delete_plots(self):
+        if plotmsg != "":
+            return "<html><head></head> <body> <h2>" + plotmsg + " </h2></body></html>"
+        return plot.to_html()
+
+    def updateExperimentStatus(self, exp_status):
+        # status is only kept in memory and rendered by the REST service on request
         try:
-            dirName = "plots/" + self.experiment_name
-            plotsDir = os.path.dirname(os.path.realpath(dirName))
-            exp_plots = os.path.join(plotsDir, self.experiment_name)
-            shutil.rmtree(exp_plots)
-            logger.info("Plots of experiment " + self.experiment_name + " are deleted.")
-        except:
-            logger.warn("Issue deleting the plots of " + self.experiment_name + " experiment")
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            self.status = exp_status
+            self.statusVersion += 1
+            self.resultsAvailableCond.notify_all()
+            for listener in self.statusListeners:
+                listener()
+        finally:
+            self.resultsAvailableCond.release()
 
-    def updateExperimentHtml(self, exp_status):
+    def addStatusListener(self, listener):
         try:
-            self.resultsAvailableCond.acquire()
-            filePath = pathlib.PurePath(__file__)
-            filename = os.path.join(filePath.parents[2], 'experiment.html')
-            addtable = """<table> \n
-                    <tr> <th>Experiment</th>    <th>Status</th>    <th>Plots Generated</th> </tr> \n
-                    <!--Add Experiments--> \n
-                    </table> \n """
-            if exp_status == "Completed":
-                updaterow = "<tr> <td> " + self.experiment_name + " </td> <td> " + exp_status + " </td> "\
-                        "<td><details><summary> Yes! Click here </summary><ul> "\
-                        "<li><a href=\"/plot?experiment_name=" + self.experiment_name + "&type=tunable_importance\">Tunable_Importance</a></li>" \
-                        "<li><a href=\"/plot?experiment_name=" + self.experiment_name + "&type=slice\">Slice</a></li>"\
-                        "<li><a href=\"/plot?experiment_name=" + self.experiment_name + "&type=optimization_history\">Optimization History</a></li>"\
-                        "<li><a href=\"/plot?experiment_name=" + self.experiment_name + "&type=parallel_coordinate\">Parallel_Coordinate</a></li></ul></li></ul>"\
-                        "</ul></details></td> </tr> \n"
-            elif exp_status == "Deleted":
-                self.delete_plots()
-                updaterow = " "
-            else:
-                updaterow = " <tr> <td> " + self.experiment_name + " </td> <td> " + exp_status + " </td> <td>  No </td> </tr> \n"
-
-            if exp_status == "Started":
-                with open(filename, 'r+') as f:
-                    lines = f.readlines()
-                    for i, line in enumerate(lines):
-                        if line.__contains__('No Experiments found!'):
-                            lines[i] = ""
-                            lines[i] = lines[i] + addtable
-                        f.truncate()
-                        f.seek(0)
-                        # rewrite into the file
-                        for line in lines:
-                            f.write(line)
-
-            with open(filename, 'r+') as f:
-                lines = f.readlines()
-                for i, line in enumerate(lines):
-                    if exp_status == "Started":
-                        if line.__contains__('<!--Add Experiments-->'):
-                            lines[i] = lines[i] + updaterow
-                    elif exp_status == "Completed" or exp_status == "Deleted" or exp_status == "Stopped" or exp_status.__contains__("Running"):
-                        if line.__contains__("<td> " + self.experiment_name + " </td>"):
-                            lines[i] = ""
-                            lines[i] = lines[i] + updaterow
-                    f.truncate()
-                    f.seek(0)
-                    # rewrite into the file
-                    for line in lines:
-                        f.write(line)
-        except:
-            logger.info("Issue updating experiment html")
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            self.statusListeners = self.statusListeners + [listener]
         finally:
             self.resultsAvailableCond.release()
 
-class Objective(TrialDetails):
-    """
-    A class used to define search space and return the actual slo value.
+    def removeStatusListener(self, listener):
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            self.statusListeners = [item for item in self.statusListeners if item is not listener]
+        finally:
+            self.resultsAvailableCond.release()
 
-    Parameters:
-        tunables (list): A list containing the details of each tunable in a dictionary format.
-    """
+    def waitForStatusUpdate(self, version, timeout) -> int:
+        """
+        Wait until the status has been updated since the given statusVersion, or until the timeout in seconds expires.
+        Return the current statusVersion.
+        """
+        try:
+            metrics.acquire(self.resultsAvailableCond, "resultsAvailableCond")
+            self.resultsAvailableCond.wait_for(lambda: self.statusVersion != version, timeout)
+            version = self.statusVersion
+        finally:
+            self.resultsAvailableCond.release()
+        return version
 
-    def __init__(self, experiment: HpoExperiment):
-        self.experiment: HpoExperiment = experiment
-        self.tunables = experiment.tunables
+    def hasFinished(self) -> bool:
+        """Return True once the experiment has completed, or has been stopped, deleted or failed to start."""
+        return self.status in FINISHED_STATUSES
 
-    def __call__(self, trial):
-        global trials
 
-        experiment_tunables = []
-        config = {}
+def dominates(values, other_values) -> bool:
+    """Return whether objective values, all to be minimized, are at least as good as others and better on one."""
+    return all(value <= other for value, other in zip(values, other_values)) and \
+        any(value < other for value, other in zip(values, other_values))
 
-        try:
-            self.experiment.resultsAvailableCond.acquire()
-            self.experiment.trialDetails.trial_number += 1
-            self.experiment.trialDetails.trial_json_object = {}
-            self.experiment.trialDetails.trial_result = ""
-            self.experiment.trialDetails.result_value_type = ""
-            self.experiment.trialDetails.result_value = 0
-        finally:
-            self.experiment.resultsAvailableCond.release()
 
-        try:
-            self.experiment.resultsAvailableCond.acquire()
-            # Define search space
-            for tunable in self.tunables:
-                if tunable["value_type"].lower() == "double":
-                    tunable_value = trial.suggest_discrete_uniform(
-                        tunable["name"], tunable["lower_bound"], tunable["upper_bound"], tunable["step"]
-                    )
-                elif tunable["value_type"].lower() == "integer":
-                    tunable_value = trial.suggest_int(
-                        tunable["name"], tunable["lower_bound"], tunable["upper_bound"], tunable["step"]
-                    )
-                elif tunable["value_type"].lower() == "categorical":
-                    tunable_value = trial.suggest_categorical(tunable["name"], tunable["choices"])
+def trial_record(trial_number, frozen_trial: optuna.trial.FrozenTrial, tunables) -> TrialRecord:
+    """Return the TrialRecord of a finished trial loaded from storage."""
+    config = tuple((tunable["name"], frozen_trial.params[tunable["name"]]) for tunable in tunables
+                   if tunable["name"] in frozen_trial.params)
+    if frozen_trial.state == optuna.trial.TrialState.COMPLETE:
+        values = frozen_trial.values
+        return TrialRecord(trial_number, config, "success", values[0], tuple(values[1:]) if len(values) > 1 else None)
+    # failed trials are told as pruned, only trials that reported intermediate values can have been pruned
+    return TrialRecord(trial_number, config, "prune" if frozen_trial.intermediate_values else "failure", None)
 
-                experiment_tunables.append({"tunable_name": tunable["name"], "tunable_value": tunable_value})
 
-            config["experiment_tunables"] = experiment_tunables
+def tunable_distributions(tunables):
+    """
+    Return the distribution of each tunable of the search space, as used by suggest_tunables.
 
-            logger.debug("Experiment tunables: " + str(experiment_tunables))
-            self.experiment.trialDetails.trial_json_object = experiment_tunables
+    Parameters:
+        tunables (list): A list containing the details of each tunable in a dictionary format.
 
-        finally:
-            self.experiment.resultsAvailableCond.release()
+    Returns:
+        distributions (dict): The optuna.distributions.BaseDistribution of each tunable, by tunable name.
+    """
+    distributions = {}
+    for tunable in tunables:
+        log = tunable.get("log", False)
+        if tunable["value_type"].lower() == "double":
+            distributions[tunable["name"]] = optuna.distributions.FloatDistribution(
+                tunable["lower_bound"], tunable["upper_bound"], log=log, step=None if log else tunable["step"])
+        elif tunable["value_type"].lower() == "integer":
+            distributions[tunable["name"]] = optuna.distributions.IntDistribution(
+                tunable["lower_bound"], tunable["upper_bound"], log=log, step=1 if log else tunable["step"])
+        elif tunable["value_type"].lower() == "categorical":
+            distributions[tunable["name"]] = optuna.distributions.CategoricalDistribution(tunable["choices"])
+    return distributions
 
-        self.experiment.notifyStarted()
 
-        # update experiment html
-        trials_sum = self.experiment.total_trials - 1
-        status_to_send = "Running trial " + str(self.experiment.trialDetails.trial_number) + " of " + str(trials_sum)
-        self.experiment.updateExperimentHtml(status_to_send)
+def suggest_tunables(trial, tunables):
+    """
+    Define the search space on the given trial and return the suggested value of each tunable.
 
-        actual_slo_value, experiment_status = self.experiment.perform_experiment()
+    Parameters:
+        trial (optuna.trial.Trial): The trial to suggest the tunable values for.
+        tunables (list): A list containing the details of each tunable in a dictionary format. A tunable with a
+            "condition" is only suggested if the tunable named in the condition, which has to be listed before it, was
+            suggested one of the condition values.
 
-        config["experiment_status"] = experiment_status
+    Returns:
+        experiment_tunables (list): A list of dictionaries with the name and suggested value of each tunable.
+    """
+    experiment_tunables = []
+    suggested = {}
 
-        trials.append(config)
+    for tunable in tunables:
+        condition = tunable.get("condition")
+        if condition is not None and suggested.get(condition["tunable"]) not in condition["values"]:
+            continue
+
+        if tunable["value_type"].lower() == "double":
+            if tunable.get("log", False):
+                tunable_value = trial.suggest_float(tunable["name"], tunable["lower_bound"], tunable["upper_bound"],
+                                                    log=True)
+            else:
+                tunable_value = trial.suggest_discrete_uniform(
+                    tunable["name"], tunable["lower_bound"], tunable["upper_bound"], tunable["step"]
+                )
+        elif tunable["value_type"].lower() == "integer":
+            if tunable.get("log", False):
+                tunable_value = trial.suggest_int(tunable["name"], tunable["lower_bound"], tunable["upper_bound"],
+                                                  log=True)
+            else:
+                tunable_value = trial.suggest_int(
+                    tunable["name"], tunable["lower_bound"], tunable["upper_bound"], step=tunable["step"]
+                )
+        elif tunable["value_type"].lower() == "categorical":
+            tunable_value = trial.suggest_categorical(tunable["name"], tunable["choices"])
 
-        if experiment_status == "failure":
-            raise optuna.TrialPruned()
+        suggested[tunable["name"]] = tunable_value
+        experiment_tunables.append({"tunable_name": tunable["name"], "tunable_value": tunable_value})
 
-        actual_slo_value = round(float(actual_slo_value), 2)
-        return actual_slo_value
+    return experiment_tunables
@@ -0,0 +1,189 @@
+"""
+Copyright (c) 2020, 2022 Red Hat, IBM Corporation and others.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import copy
+import heapq
+import random
+
+import optuna
+
+# SAMPLERS (dict): Factory of the sampler of every supported hpo_algo_impl, called with the sampler parameters of the
+# search space as keyword arguments.
+SAMPLERS = {}
+# MULTI_OBJECTIVE_SAMPLERS (set): The hpo_algo_impl whose sampler can optimize additional objectives.
+MULTI_OBJECTIVE_SAMPLERS = set()
+
+
+def register_sampler(hpo_algo_impl, multi_objective=False):
+    """
+    Register the decorated function as the factory of the sampler used for the given hpo_algo_impl, multi_objective
+    if the sampler supports studies with more than one objective.
+    """
+    def register(factory):
+        SAMPLERS[hpo_algo_impl] = factory
+        if multi_objective:
+            MULTI_OBJECTIVE_SAMPLERS.add(hpo_algo_impl)
+        return factory
+    return register
+
+
+def create_sampler(hpo_algo_impl, sampler_params=None) -> optuna.samplers.BaseSampler:
+    """
+    Create the sampler of an experiment.
+
+    Parameters:
+        hpo_algo_impl (str): One of the registered algorithms, e.g. "optuna_tpe".
+        sampler_params (dict): Keyword arguments of the sampler, e.g. {"n_startup_trials": 5, "seed": 42}. They
+            override the arguments the algorithm sets itself.
+
+    Returns:
+        sampler (optuna.samplers.BaseSampler): The sampler.
+
+    Raises:
+        KeyError: If hpo_algo_impl is not registered.
+        TypeError: If the sampler does not accept one of sampler_params.
+    """
+    return SAMPLERS[hpo_algo_impl](**(sampler_params or {}))
+
+
+@register_sampler("optuna_tpe", multi_objective=True)
+def tpe_sampler(**params):
+    return optuna.samplers.TPESampler(**params)
+
+
+@register_sampler("optuna_tpe_multivariate", multi_objective=True)
+def tpe_multivariate_sampler(**params):
+    return optuna.samplers.TPESampler(**{"multivariate": True, **params})
+
+
+@register_sampler("optuna_tpe_constant_liar", multi_objective=True)
+def tpe_constant_liar_sampler(**params):
+    # trials in progress are assumed to have the worst value seen so far, so parallel trials do not sample the same
+    # region
+    return optuna.samplers.TPESampler(**{"constant_liar": True, **params})
+
+
+@register_sampler("optuna_cmaes")
+def cmaes_sampler(**params):
+    # categorical tunables are sampled independently by the fallback sampler
+    return optuna.samplers.CmaEsSampler(**{"warn_independent_sampling": False, **params})
+
+
+@register_sampler("optuna_qmc", multi_objective=True)
+def qmc_sampler(**params):
+    return optuna.samplers.QMCSampler(**{"warn_independent_sampling": False, **params})
+
+
+@register_sampler("optuna_nsga2", multi_objective=True)
+def nsga2_sampler(**params):
+    return optuna.samplers.NSGAIISampler(**params)
+
+
+class HistoryBoundedSampler(optuna.samplers.BaseSampler):
+    """
+    Sampler that limits the finished trials another sampler learns from, so that the cost of suggesting a trial stays
+    flat as a study grows to thousands of trials. Either the `window` most recent finished trials are kept, or the
+    `top_k` best completed trials along with `random` other finished trials picked at random. Trials in progress are
+    always kept.
+    """
+
+    def __init__(self, sampler: optuna.samplers.BaseSampler, window=None, top_k=None, random=0):
+        self.sampler = sampler
+        self.window = window
+        self.top_k = top_k
+        self.random = random
+
+    def bounded_trials(self, trials, directions, trial_number) -> list:
+        """Return the trials to learn from out of the given trials, ordered by trial number."""
+        finished = [trial for trial in trials if trial.state.is_finished()]
+        running = [trial for trial in trials if not trial.state.is_finished()]
+        if self.window is not None:
+            kept = finished[-self.window:]
+        else:
+            completed = [trial for trial in finished if trial.state == optuna.trial.TrialState.COMPLETE]
+            # the best trials of a multi-objective study are the best on its first objective
+            sign = -1 if directions[0] == optuna.study.StudyDirection.MAXIMIZE else 1
+            kept = heapq.nsmallest(self.top_k, completed, key=lambda trial: sign * trial.values[0])
+            best = set(trial.number for trial in kept)
+            others = [trial for trial in finished if trial.number not in best]
+            # seeded with the trial number, so that every suggestion of a trial learns from the same trials
+            kept += random.Random(trial_number).sample(others, min(self.random, len(others)))
+        return sorted(kept + running, key=lambda trial: trial.number)
+
+    def view(self, study, trial_number) -> "BoundedStudy":
+        return BoundedStudy(study, self, trial_number)
+
+    def infer_relative_search_space(self, study, trial):
+        return self.sampler.infer_relative_search_space(self.view(study, trial.number), trial)
+
+    def sample_relative(self, study, trial, search_space):
+        return self.sampler.sample_relative(self.view(study, trial.number), trial, search_space)
+
+    def sample_independent(self, study, trial, param_name, param_distribution):
+        return self.sampler.sample_independent(self.view(study, trial.number), trial, param_name, param_distribution)
+
+    def before_trial(self, study, trial):
+        self.sampler.before_trial(self.view(study, trial.number), trial)
+
+    def after_trial(self, study, trial, state, values):
+        self.sampler.after_trial(self.view(study, trial.number), trial, state, values)
+
+    def reseed_rng(self):
+        self.sampler.reseed_rng()
+
+
+class BoundedStudy:
+    """The study as seen by the sampler of a HistoryBoundedSampler, listing only the trials it is to learn from."""
+
+    def __init__(self, study: optuna.study.Study, sampler: HistoryBoundedSampler, trial_number):
+        self.study = study
+        self.sampler = sampler
+        self.trial_number = trial_number
+
+    def __getattr__(self, name):
+        return getattr(self.study, name)
+
+    @property
+    def trials(self) -> list:
+        return self.get_trials()
+
+    def get_trials(self, deepcopy=True, states=None) -> list:
+        return self._get_trials(deepcopy, states)
+
+    def _get_trials(self, deepcopy=True, states=None, use_cache=False) -> list:
+        trials = self.sampler.bounded_trials(self.study._get_trials(deepcopy=False, use_cache=use_cache),
+                                             self.study.directions, self.trial_number)
+        if states is not None:
+            trials = [trial for trial in trials if trial.state in states]
+        return copy.deepcopy(trials) if deepcopy else trials
+
+
+def create_history_bounded_sampler(sampler, sampler_history) -> optuna.samplers.BaseSampler:
+    """
+    Wrap a sampler so that it learns from a bounded history of trials.
+
+    Parameters:
+        sampler (optuna.samplers.BaseSampler): The sampler of the experiment.
+        sampler_history (dict): Either {"window": n} to learn from the n most recent finished trials, or
+            {"top_k": k, "random": r} to learn from the k best completed trials and r other finished trials picked at
+            random. None to learn from every trial.
+
+    Returns:
+        sampler (optuna.samplers.BaseSampler): The sampler itself if sampler_history is None, its wrapper otherwise.
+    """
+    if not sampler_history:
+        return sampler
+    return HistoryBoundedSampler(sampler, sampler_history.get("window"), sampler_history.get("top_k"),
+                                 sampler_history.get("random", 0))
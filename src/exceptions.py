@@ -20,4 +20,7 @@ class Error(Exception):
 
 class ExperimentNotFoundError(Error):
     """Raised when the input value is too small"""
-    pass
\ No newline at end of file
+    pass
+class ImportanceUnavailableError(Error):
+    """Raised when tunable importance cannot be evaluated for the trials of a study"""
+    pass
@@ -13,7 +13,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\thpo.proto\x12\nhelloworld\"\x88\x02\n\x16RecommendedConfigReply\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x11\n\tdirection\x18\x02 \x01(\t\x12\x46\n\roptimal_value\x18\x03 \x01(\x0b\x32/.helloworld.RecommendedConfigReply.OptimalValue\x12+\n\x08tunables\x18\x04 \x03(\x0b\x32\x19.helloworld.TunableConfig\x1aM\n\x0cOptimalValue\x12\x1a\n\x12objective_function\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02\x12\x12\n\nvalue_type\x18\x03 \x01(\t\"\'\n\x16NumberExperimentsReply\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\"+\n\x13NewExperimentsReply\x12\x14\n\x0ctrial_number\x18\x01 \x01(\x05\"*\n\x14\x45xperimentsListReply\x12\x12\n\nexperiment\x18\x01 \x03(\t\"\x19\n\x17NumberExperimentsParams\"\x17\n\x15\x45xperimentsListParams\"\x16\n\x14\x45xperimentEmptyReply\"/\n\x14\x45xperimentNameParams\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\"9\n\x0f\x45xperimentTrial\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\r\n\x05trial\x18\x02 \x01(\x05\"\xcb\x01\n\x15\x45xperimentTrialResult\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\r\n\x05trial\x18\x02 \x01(\x05\x12\x38\n\x06result\x18\x03 \x01(\x0e\x32(.helloworld.ExperimentTrialResult.Result\x12\x12\n\nvalue_type\x18\x04 \x01(\t\x12\r\n\x05value\x18\x05 \x01(\x02\"-\n\x06Result\x12\x0b\n\x07SUCCESS\x10\x00\x12\x0b\n\x07\x46\x41ILURE\x10\x01\x12\t\n\x05PRUNE\x10\x02\"\xa5\x03\n\x11\x45xperimentDetails\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x14\n\x0ctotal_trials\x18\x02 \x01(\x05\x12\x17\n\x0fparallel_trials\x18\x03 \x01(\x05\x12\x15\n\rcurrent_trial\x18\x0c \x01(\x05\x12\x11\n\tdirection\x18\x04 \x01(\t\x12\x15\n\rhpo_algo_impl\x18\x05 \x01(\t\x12\x15\n\rexperiment_id\x18\x06 \x01(\t\x12\x1a\n\x12objective_function\x18\x07 \x01(\t\x12\x37\n\x08tunables\x18\x08 \x03(\x0b\x32%.helloworld.ExperimentDetails.Tunable\x12\x12\n\nvalue_type\x18\t \x01(\t\x12\x11\n\tslo_class\x18\n \x01(\t\x12\x0f\n\x07started\x18\x0b \x01(\x08\x1a\x63\n\x07Tunable\x12\x12\n\nvalue_type\x18\x01 \x01(\t\x12\x13\n\x0blower_bound\x18\x02 \x01(\x02\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x13\n\x0bupper_bound\x18\x04 \x01(\x02\x12\x0c\n\x04step\x18\x05 \x01(\x01\"@\n\rTunableConfig\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02\x12\x12\n\nvalue_type\x18\x03 \x01(\t\"8\n\x0bTrialConfig\x12)\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x19.helloworld.TunableConfig2\xaf\x06\n\nHpoService\x12^\n\x11NumberExperiments\x12#.helloworld.NumberExperimentsParams\x1a\".helloworld.NumberExperimentsReply\"\x00\x12X\n\x0f\x45xperimentsList\x12!.helloworld.ExperimentsListParams\x1a .helloworld.ExperimentsListReply\"\x00\x12Q\n\rNewExperiment\x12\x1d.helloworld.ExperimentDetails\x1a\x1f.helloworld.NewExperimentsReply\"\x00\x12X\n\x10\x44\x65leteExperiment\x12 .helloworld.ExperimentNameParams\x1a .helloworld.ExperimentEmptyReply\"\x00\x12Y\n\x14GetExperimentDetails\x12 .helloworld.ExperimentNameParams\x1a\x1d.helloworld.ExperimentDetails\"\x00\x12H\n\x0eGetTrialConfig\x12\x1b.helloworld.ExperimentTrial\x1a\x17.helloworld.TrialConfig\"\x00\x12Z\n\x11UpdateTrialResult\x12!.helloworld.ExperimentTrialResult\x1a .helloworld.ExperimentEmptyReply\"\x00\x12Y\n\x12GenerateNextConfig\x12 .helloworld.ExperimentNameParams\x1a\x1f.helloworld.NewExperimentsReply\"\x00\x12^\n\x14GetRecommendedConfig\x12 .helloworld.ExperimentNameParams\x1a\".helloworld.RecommendedConfigReply\"\x00\x42\x1c\n\rio.kruize.hpoB\x03HpoP\x01\xa2\x02\x03HLWb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\thpo.proto\x12\nhelloworld\"\xf1\x02\n\x16RecommendedConfigReply\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x11\n\tdirection\x18\x02 \x01(\t\x12\x46\n\roptimal_value\x18\x03 \x01(\x0b\x32/.helloworld.RecommendedConfigReply.OptimalValue\x12+\n\x08tunables\x18\x04 \x03(\x0b\x32\x19.helloworld.TunableConfig\x12\x13\n\x0bstop_reason\x18\x05 \x01(\t\x12R\n\x19\x61\x64\x64itional_optimal_values\x18\x06 \x03(\x0b\x32/.helloworld.RecommendedConfigReply.OptimalValue\x1aM\n\x0cOptimalValue\x12\x1a\n\x12objective_function\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02\x12\x12\n\nvalue_type\x18\x03 \x01(\t\"\'\n\x16NumberExperimentsReply\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\"+\n\x13NewExperimentsReply\x12\x14\n\x0ctrial_number\x18\x01 \x01(\x05\"*\n\x14\x45xperimentsListReply\x12\x12\n\nexperiment\x18\x01 \x03(\t\"\x19\n\x17NumberExperimentsParams\"\x17\n\x15\x45xperimentsListParams\"\x16\n\x14\x45xperimentEmptyReply\"/\n\x14\x45xperimentNameParams\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\"9\n\x0f\x45xperimentTrial\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\r\n\x05trial\x18\x02 \x01(\x05\"\xe6\x01\n\x15\x45xperimentTrialResult\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\r\n\x05trial\x18\x02 \x01(\x05\x12\x38\n\x06result\x18\x03 \x01(\x0e\x32(.helloworld.ExperimentTrialResult.Result\x12\x12\n\nvalue_type\x18\x04 \x01(\t\x12\r\n\x05value\x18\x05 \x01(\x01\x12\x19\n\x11\x61\x64\x64itional_values\x18\x06 \x03(\x01\"-\n\x06Result\x12\x0b\n\x07SUCCESS\x10\x00\x12\x0b\n\x07\x46\x41ILURE\x10\x01\x12\t\n\x05PRUNE\x10\x02\"|\n!ExperimentTrialIntermediateResult\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\r\n\x05trial\x18\x02 \x01(\x05\x12\x0c\n\x04step\x18\x03 \x01(\x05\x12\x12\n\nvalue_type\x18\x04 \x01(\t\x12\r\n\x05value\x18\x05 \x01(\x01\"(\n\x17IntermediateResultReply\x12\r\n\x05prune\x18\x01 \x01(\x08\"\xcd\x07\n\x11\x45xperimentDetails\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x14\n\x0ctotal_trials\x18\x02 \x01(\x05\x12\x17\n\x0fparallel_trials\x18\x03 \x01(\x05\x12\x15\n\rcurrent_trial\x18\x0c \x01(\x05\x12\x11\n\tdirection\x18\x04 \x01(\t\x12\x15\n\rhpo_algo_impl\x18\x05 \x01(\t\x12\x15\n\rexperiment_id\x18\x06 \x01(\t\x12\x1a\n\x12objective_function\x18\x07 \x01(\t\x12\x37\n\x08tunables\x18\x08 \x03(\x0b\x32%.helloworld.ExperimentDetails.Tunable\x12\x12\n\nvalue_type\x18\t \x01(\t\x12\x11\n\tslo_class\x18\n \x01(\t\x12\x0f\n\x07started\x18\x0b \x01(\x08\x12\x13\n\x0b\x61sync_start\x18\r \x01(\x08\x12)\n\nwarm_start\x18\x0e \x01(\x0b\x32\x15.helloworld.WarmStart\x12\x31\n\x0e\x65\x61rly_stopping\x18\x0f \x01(\x0b\x32\x19.helloworld.EarlyStopping\x12\x13\n\x0bstop_reason\x18\x10 \x01(\t\x12\"\n\x06pruner\x18\x11 \x01(\x0b\x32\x12.helloworld.Pruner\x12H\n\x0esampler_params\x18\x12 \x03(\x0b\x32\x30.helloworld.ExperimentDetails.SamplerParamsEntry\x12\x34\n\x15\x61\x64\x64itional_objectives\x18\x13 \x03(\x0b\x32\x15.helloworld.Objective\x12\x33\n\x0fsampler_history\x18\x14 \x01(\x0b\x32\x1a.helloworld.SamplerHistory\x1a\xf3\x01\n\x07Tunable\x12\x12\n\nvalue_type\x18\x01 \x01(\t\x12\x13\n\x0blower_bound\x18\x02 \x01(\x02\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x13\n\x0bupper_bound\x18\x04 \x01(\x02\x12\x0c\n\x04step\x18\x05 \x01(\x01\x12\x0f\n\x07\x63hoices\x18\x06 \x03(\t\x12\x0b\n\x03log\x18\x07 \x01(\x08\x12\x42\n\tcondition\x18\x08 \x01(\x0b\x32/.helloworld.ExperimentDetails.Tunable.Condition\x1a,\n\tCondition\x12\x0f\n\x07tunable\x18\x01 \x01(\t\x12\x0e\n\x06values\x18\x02 \x03(\t\x1a\x34\n\x12SamplerParamsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"?\n\x0eSamplerHistory\x12\x0e\n\x06window\x18\x01 \x01(\x05\x12\r\n\x05top_k\x18\x02 \x01(\x05\x12\x0e\n\x06random\x18\x03 \x01(\x05\":\n\tObjective\x12\x1a\n\x12objective_function\x18\x01 \x01(\t\x12\x11\n\tdirection\x18\x02 \x01(\t\"u\n\x06Pruner\x12\x0c\n\x04type\x18\x01 \x01(\t\x12.\n\x06params\x18\x02 \x03(\x0b\x32\x1e.helloworld.Pruner.ParamsEntry\x1a-\n\x0bParamsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"J\n\rEarlyStopping\x12\x10\n\x08patience\x18\x01 \x01(\x05\x12\x11\n\tmin_delta\x18\x02 \x01(\x01\x12\x14\n\x0cmax_duration\x18\x03 \x01(\x01\"\xd3\x01\n\tWarmStart\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12+\n\x06trials\x18\x02 \x03(\x0b\x32\x1b.helloworld.WarmStart.Trial\x12\x14\n\x0c\x65nqueue_best\x18\x03 \x01(\x05\x1aj\n\x05Trial\x12)\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x19.helloworld.TunableConfig\x12\x14\n\x0cresult_value\x18\x02 \x01(\x01\x12 \n\x18\x61\x64\x64itional_result_values\x18\x03 \x03(\x01\"\x94\x01\n\rTunableConfig\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02\x12\x12\n\nvalue_type\x18\x03 \x01(\t\x12\x16\n\x0c\x64ouble_value\x18\x04 \x01(\x01H\x00\x12\x13\n\tint_value\x18\x05 \x01(\x03H\x00\x12\x16\n\x0cstring_value\x18\x06 \x01(\tH\x00\x42\r\n\x0btyped_value\"8\n\x0bTrialConfig\x12)\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x19.helloworld.TunableConfig\":\n\x10TrialBatchParams\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"\x89\x01\n\x10TrialConfigBatch\x12\x32\n\x06trials\x18\x01 \x03(\x0b\x32\".helloworld.TrialConfigBatch.Trial\x1a\x41\n\x05Trial\x12\r\n\x05trial\x18\x01 \x01(\x05\x12)\n\x06\x63onfig\x18\x02 \x03(\x0b\x32\x19.helloworld.TunableConfig\"i\n\x1a\x45xperimentTrialResultBatch\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x32\n\x07results\x18\x02 \x03(\x0b\x32!.helloworld.ExperimentTrialResult\"C\n\x17TunableImportanceParams\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x0f\n\x07refresh\x18\x02 \x01(\x08\"\xa9\x01\n\x16TunableImportanceReply\x12\x0e\n\x06trials\x18\x01 \x01(\x05\x12H\n\nimportance\x18\x02 \x03(\x0b\x32\x34.helloworld.TunableImportanceReply.TunableImportance\x1a\x35\n\x11TunableImportance\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x12\n\nimportance\x18\x02 \x01(\x01\"\xb6\x01\n\x10ParetoFrontReply\x12\x1b\n\x13objective_functions\x18\x01 \x03(\t\x12\x32\n\x06trials\x18\x02 \x03(\x0b\x32\".helloworld.ParetoFrontReply.Trial\x1aQ\n\x05Trial\x12\r\n\x05trial\x18\x01 \x01(\x05\x12\x0e\n\x06values\x18\x02 \x03(\x01\x12)\n\x06\x63onfig\x18\x03 \x03(\x0b\x32\x19.helloworld.TunableConfig\"L\n\x12TrialHistoryParams\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x05\x12\r\n\x05limit\x18\x03 \x01(\x05\"\x8e\x02\n\x11TrialHistoryReply\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x33\n\x06trials\x18\x02 \x03(\x0b\x32#.helloworld.TrialHistoryReply.Trial\x1a\xb4\x01\n\x05Trial\x12\r\n\x05trial\x18\x01 \x01(\x05\x12\x38\n\x06result\x18\x02 \x01(\x0e\x32(.helloworld.ExperimentTrialResult.Result\x12\x12\n\x05value\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x19\n\x11\x61\x64\x64itional_values\x18\x04 \x03(\x01\x12)\n\x06\x63onfig\x18\x05 \x03(\x0b\x32\x19.helloworld.TunableConfigB\x08\n\x06_value\"\xc8\x01\n\x11TrialTimingsReply\x12\x39\n\x06trials\x18\x01 \x03(\x0b\x32).helloworld.TrialTimingsReply.TrialTiming\x12\x0f\n\x07profile\x18\x02 \x01(\t\x1ag\n\x0bTrialTiming\x12\r\n\x05trial\x18\x01 \x01(\x05\x12\x10\n\x08sampling\x18\x02 \x01(\x01\x12\x0f\n\x07waiting\x18\x03 \x01(\x01\x12\x11\n\tlock_wait\x18\x04 \x01(\x01\x12\x13\n\x0b\x62ookkeeping\x18\x05 \x01(\x01\"\x8d\x01\n\x0f\x45xperimentEvent\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x15\n\rcurrent_trial\x18\x02 \x01(\x05\x12>\n\x12recommended_config\x18\x03 \x01(\x0b\x32\".helloworld.RecommendedConfigReply\x12\x13\n\x0bstop_reason\x18\x04 \x01(\t\"o\n\x10TrialLoopRequest\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x0f\n\x07\x63redits\x18\x02 \x01(\x05\x12\x31\n\x06result\x18\x03 \x01(\x0b\x32!.helloworld.ExperimentTrialResult\"\xbd\x01\n\x0eTrialLoopReply\x12\x17\n\x0f\x65xperiment_name\x18\x01 \x01(\t\x12\x31\n\x05trial\x18\x02 \x01(\x0b\x32\".helloworld.TrialConfigBatch.Trial\x12\x10\n\x08\x66inished\x18\x03 \x01(\x08\x12>\n\x12recommended_config\x18\x04 \x01(\x0b\x32\".helloworld.RecommendedConfigReply\x12\r\n\x05\x65rror\x18\x05 \x01(\t2\xba\r\n\nHpoService\x12^\n\x11NumberExperiments\x12#.helloworld.NumberExperimentsParams\x1a\".helloworld.NumberExperimentsReply\"\x00\x12X\n\x0f\x45xperimentsList\x12!.helloworld.ExperimentsListParams\x1a .helloworld.ExperimentsListReply\"\x00\x12Q\n\rNewExperiment\x12\x1d.helloworld.ExperimentDetails\x1a\x1f.helloworld.NewExperimentsReply\"\x00\x12X\n\x10\x44\x65leteExperiment\x12 .helloworld.ExperimentNameParams\x1a .helloworld.ExperimentEmptyReply\"\x00\x12Y\n\x14GetExperimentDetails\x12 .helloworld.ExperimentNameParams\x1a\x1d.helloworld.ExperimentDetails\"\x00\x12H\n\x0eGetTrialConfig\x12\x1b.helloworld.ExperimentTrial\x1a\x17.helloworld.TrialConfig\"\x00\x12Z\n\x11UpdateTrialResult\x12!.helloworld.ExperimentTrialResult\x1a .helloworld.ExperimentEmptyReply\"\x00\x12p\n\x18ReportIntermediateResult\x12-.helloworld.ExperimentTrialIntermediateResult\x1a#.helloworld.IntermediateResultReply\"\x00\x12S\n\x13GetTrialConfigBatch\x12\x1c.helloworld.TrialBatchParams\x1a\x1c.helloworld.TrialConfigBatch\"\x00\x12\x64\n\x16UpdateTrialResultBatch\x12&.helloworld.ExperimentTrialResultBatch\x1a .helloworld.ExperimentEmptyReply\"\x00\x12Y\n\x12GenerateNextConfig\x12 .helloworld.ExperimentNameParams\x1a\x1f.helloworld.NewExperimentsReply\"\x00\x12^\n\x14GetRecommendedConfig\x12 .helloworld.ExperimentNameParams\x1a\".helloworld.RecommendedConfigReply\"\x00\x12\x61\n\x14GetTunableImportance\x12#.helloworld.TunableImportanceParams\x1a\".helloworld.TunableImportanceReply\"\x00\x12R\n\x0eGetParetoFront\x12 .helloworld.ExperimentNameParams\x1a\x1c.helloworld.ParetoFrontReply\"\x00\x12T\n\x0fGetTrialTimings\x12 .helloworld.ExperimentNameParams\x1a\x1d.helloworld.TrialTimingsReply\"\x00\x12R\n\x0fGetTrialHistory\x12\x1e.helloworld.TrialHistoryParams\x1a\x1d.helloworld.TrialHistoryReply\"\x00\x12X\n\x0cStreamTrials\x12 .helloworld.ExperimentNameParams\x1a\".helloworld.TrialConfigBatch.Trial\"\x00\x30\x01\x12T\n\x0fWatchExperiment\x12 .helloworld.ExperimentNameParams\x1a\x1b.helloworld.ExperimentEvent\"\x00\x30\x01\x12K\n\tTrialLoop\x12\x1c.helloworld.TrialLoopRequest\x1a\x1a.helloworld.TrialLoopReply\"\x00(\x01\x30\x01\x42\x1c\n\rio.kruize.hpoB\x03HpoP\x01\xa2\x02\x03HLWb\x06proto3')
 
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'hpo_pb2', globals())
@@ -21,38 +21,98 @@ if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
   DESCRIPTOR._serialized_options = b'\n\rio.kruize.hpoB\003HpoP\001\242\002\003HLW'
+  _EXPERIMENTDETAILS_SAMPLERPARAMSENTRY._options = None
+  _EXPERIMENTDETAILS_SAMPLERPARAMSENTRY._serialized_options = b'8\001'
+  _PRUNER_PARAMSENTRY._options = None
+  _PRUNER_PARAMSENTRY._serialized_options = b'8\001'
   _RECOMMENDEDCONFIGREPLY._serialized_start=26
-  _RECOMMENDEDCONFIGREPLY._serialized_end=290
-  _RECOMMENDEDCONFIGREPLY_OPTIMALVALUE._serialized_start=213
-  _RECOMMENDEDCONFIGREPLY_OPTIMALVALUE._serialized_end=290
-  _NUMBEREXPERIMENTSREPLY._serialized_start=292
-  _NUMBEREXPERIMENTSREPLY._serialized_end=331
-  _NEWEXPERIMENTSREPLY._serialized_start=333
-  _NEWEXPERIMENTSREPLY._serialized_end=376
-  _EXPERIMENTSLISTREPLY._serialized_start=378
-  _EXPERIMENTSLISTREPLY._serialized_end=420
-  _NUMBEREXPERIMENTSPARAMS._serialized_start=422
-  _NUMBEREXPERIMENTSPARAMS._serialized_end=447
-  _EXPERIMENTSLISTPARAMS._serialized_start=449
-  _EXPERIMENTSLISTPARAMS._serialized_end=472
-  _EXPERIMENTEMPTYREPLY._serialized_start=474
-  _EXPERIMENTEMPTYREPLY._serialized_end=496
-  _EXPERIMENTNAMEPARAMS._serialized_start=498
-  _EXPERIMENTNAMEPARAMS._serialized_end=545
-  _EXPERIMENTTRIAL._serialized_start=547
-  _EXPERIMENTTRIAL._serialized_end=604
-  _EXPERIMENTTRIALRESULT._serialized_start=607
-  _EXPERIMENTTRIALRESULT._serialized_end=810
-  _EXPERIMENTTRIALRESULT_RESULT._serialized_start=765
-  _EXPERIMENTTRIALRESULT_RESULT._serialized_end=810
-  _EXPERIMENTDETAILS._serialized_start=813
-  _EXPERIMENTDETAILS._serialized_end=1234
-  _EXPERIMENTDETAILS_TUNABLE._serialized_start=1135
-  _EXPERIMENTDETAILS_TUNABLE._serialized_end=1234
-  _TUNABLECONFIG._serialized_start=1236
-  _TUNABLECONFIG._serialized_end=1300
-  _TRIALCONFIG._serialized_start=1302
-  _TRIALCONFIG._serialized_end=1358
-  _HPOSERVICE._serialized_start=1361
-  _HPOSERVICE._serialized_end=2176
+  _RECOMMENDEDCONFIGREPLY._serialized_end=395
+  _RECOMMENDEDCONFIGREPLY_OPTIMALVALUE._serialized_start=318
+  _RECOMMENDEDCONFIGREPLY_OPTIMALVALUE._serialized_end=395
+  _NUMBEREXPERIMENTSREPLY._serialized_start=397
+  _NUMBEREXPERIMENTSREPLY._serialized_end=436
+  _NEWEXPERIMENTSREPLY._serialized_start=438
+  _NEWEXPERIMENTSREPLY._serialized_end=481
+  _EXPERIMENTSLISTREPLY._serialized_start=483
+  _EXPERIMENTSLISTREPLY._serialized_end=525
+  _NUMBEREXPERIMENTSPARAMS._serialized_start=527
+  _NUMBEREXPERIMENTSPARAMS._serialized_end=552
+  _EXPERIMENTSLISTPARAMS._serialized_start=554
+  _EXPERIMENTSLISTPARAMS._serialized_end=577
+  _EXPERIMENTEMPTYREPLY._serialized_start=579
+  _EXPERIMENTEMPTYREPLY._serialized_end=601
+  _EXPERIMENTNAMEPARAMS._serialized_start=603
+  _EXPERIMENTNAMEPARAMS._serialized_end=650
+  _EXPERIMENTTRIAL._serialized_start=652
+  _EXPERIMENTTRIAL._serialized_end=709
+  _EXPERIMENTTRIALRESULT._serialized_start=712
+  _EXPERIMENTTRIALRESULT._serialized_end=942
+  _EXPERIMENTTRIALRESULT_RESULT._serialized_start=897
+  _EXPERIMENTTRIALRESULT_RESULT._serialized_end=942
+  _EXPERIMENTTRIALINTERMEDIATERESULT._serialized_start=944
+  _EXPERIMENTTRIALINTERMEDIATERESULT._serialized_end=1068
+  _INTERMEDIATERESULTREPLY._serialized_start=1070
+  _INTERMEDIATERESULTREPLY._serialized_end=1110
+  _EXPERIMENTDETAILS._serialized_start=1113
+  _EXPERIMENTDETAILS._serialized_end=2086
+  _EXPERIMENTDETAILS_TUNABLE._serialized_start=1789
+  _EXPERIMENTDETAILS_TUNABLE._serialized_end=2032
+  _EXPERIMENTDETAILS_TUNABLE_CONDITION._serialized_start=1988
+  _EXPERIMENTDETAILS_TUNABLE_CONDITION._serialized_end=2032
+  _EXPERIMENTDETAILS_SAMPLERPARAMSENTRY._serialized_start=2034
+  _EXPERIMENTDETAILS_SAMPLERPARAMSENTRY._serialized_end=2086
+  _SAMPLERHISTORY._serialized_start=2088
+  _SAMPLERHISTORY._serialized_end=2151
+  _OBJECTIVE._serialized_start=2153
+  _OBJECTIVE._serialized_end=2211
+  _PRUNER._serialized_start=2213
+  _PRUNER._serialized_end=2330
+  _PRUNER_PARAMSENTRY._serialized_start=2285
+  _PRUNER_PARAMSENTRY._serialized_end=2330
+  _EARLYSTOPPING._serialized_start=2332
+  _EARLYSTOPPING._serialized_end=2406
+  _WARMSTART._serialized_start=2409
+  _WARMSTART._serialized_end=2620
+  _WARMSTART_TRIAL._serialized_start=2514
+  _WARMSTART_TRIAL._serialized_end=2620
+  _TUNABLECONFIG._serialized_start=2623
+  _TUNABLECONFIG._serialized_end=2771
+  _TRIALCONFIG._serialized_start=2773
+  _TRIALCONFIG._serialized_end=2829
+  _TRIALBATCHPARAMS._serialized_start=2831
+  _TRIALBATCHPARAMS._serialized_end=2889
+  _TRIALCONFIGBATCH._serialized_start=2892
+  _TRIALCONFIGBATCH._serialized_end=3029
+  _TRIALCONFIGBATCH_TRIAL._serialized_start=2964
+  _TRIALCONFIGBATCH_TRIAL._serialized_end=3029
+  _EXPERIMENTTRIALRESULTBATCH._serialized_start=3031
+  _EXPERIMENTTRIALRESULTBATCH._serialized_end=3136
+  _TUNABLEIMPORTANCEPARAMS._serialized_start=3138
+  _TUNABLEIMPORTANCEPARAMS._serialized_end=3205
+  _TUNABLEIMPORTANCEREPLY._serialized_start=3208
+  _TUNABLEIMPORTANCEREPLY._serialized_end=3377
+  _TUNABLEIMPORTANCEREPLY_TUNABLEIMPORTANCE._serialized_start=3324
+  _TUNABLEIMPORTANCEREPLY_TUNABLEIMPORTANCE._serialized_end=3377
+  _PARETOFRONTREPLY._serialized_start=3380
+  _PARETOFRONTREPLY._serialized_end=3562
+  _PARETOFRONTREPLY_TRIAL._serialized_start=3481
+  _PARETOFRONTREPLY_TRIAL._serialized_end=3562
+  _TRIALHISTORYPARAMS._serialized_start=3564
+  _TRIALHISTORYPARAMS._serialized_end=3640
+  _TRIALHISTORYREPLY._serialized_start=3643
+  _TRIALHISTORYREPLY._serialized_end=3913
+  _TRIALHISTORYREPLY_TRIAL._serialized_start=3733
+  _TRIALHISTORYREPLY_TRIAL._serialized_end=3913
+  _TRIALTIMINGSREPLY._serialized_start=3916
+  _TRIALTIMINGSREPLY._serialized_end=4116
+  _TRIALTIMINGSREPLY_TRIALTIMING._serialized_start=4013
+  _TRIALTIMINGSREPLY_TRIALTIMING._serialized_end=4116
+  _EXPERIMENTEVENT._serialized_start=4119
+  _EXPERIMENTEVENT._serialized_end=4260
+  _TRIALLOOPREQUEST._serialized_start=4262
+  _TRIALLOOPREQUEST._serialized_end=4373
+  _TRIALLOOPREPLY._serialized_start=4376
+  _TRIALLOOPREPLY._serialized_end=4565
+  _HPOSERVICE._serialized_start=4568
+  _HPOSERVICE._serialized_end=6290
 # @@protoc_insertion_point(module_scope)
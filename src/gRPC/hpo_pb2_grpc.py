@@ -50,6 +50,21 @@ class HpoServiceStub(object):
                 request_serializer=hpo__pb2.ExperimentTrialResult.SerializeToString,
                 response_deserializer=hpo__pb2.ExperimentEmptyReply.FromString,
                 )
+        self.ReportIntermediateResult = channel.unary_unary(
+                '/helloworld.HpoService/ReportIntermediateResult',
+                request_serializer=hpo__pb2.ExperimentTrialIntermediateResult.SerializeToString,
+                response_deserializer=hpo__pb2.IntermediateResultReply.FromString,
+                )
+        self.GetTrialConfigBatch = channel.unary_unary(
+                '/helloworld.HpoService/GetTrialConfigBatch',
+                request_serializer=hpo__pb2.TrialBatchParams.SerializeToString,
+                response_deserializer=hpo__pb2.TrialConfigBatch.FromString,
+                )
+        self.UpdateTrialResultBatch = channel.unary_unary(
+                '/helloworld.HpoService/UpdateTrialResultBatch',
+                request_serializer=hpo__pb2.ExperimentTrialResultBatch.SerializeToString,
+                response_deserializer=hpo__pb2.ExperimentEmptyReply.FromString,
+                )
         self.GenerateNextConfig = channel.unary_unary(
                 '/helloworld.HpoService/GenerateNextConfig',
                 request_serializer=hpo__pb2.ExperimentNameParams.SerializeToString,
@@ -60,6 +75,41 @@ class HpoServiceStub(object):
                 request_serializer=hpo__pb2.ExperimentNameParams.SerializeToString,
                 response_deserializer=hpo__pb2.RecommendedConfigReply.FromString,
                 )
+        self.GetTunableImportance = channel.unary_unary(
+                '/helloworld.HpoService/GetTunableImportance',
+                request_serializer=hpo__pb2.TunableImportanceParams.SerializeToString,
+                response_deserializer=hpo__pb2.TunableImportanceReply.FromString,
+                )
+        self.GetParetoFront = channel.unary_unary(
+                '/helloworld.HpoService/GetParetoFront',
+                request_serializer=hpo__pb2.ExperimentNameParams.SerializeToString,
+                response_deserializer=hpo__pb2.ParetoFrontReply.FromString,
+                )
+        self.GetTrialTimings = channel.unary_unary(
+                '/helloworld.HpoService/GetTrialTimings',
+                request_serializer=hpo__pb2.ExperimentNameParams.SerializeToString,
+                response_deserializer=hpo__pb2.TrialTimingsReply.FromString,
+                )
+        self.GetTrialHistory = channel.unary_unary(
+                '/helloworld.HpoService/GetTrialHistory',
+                request_serializer=hpo__pb2.TrialHistoryParams.SerializeToString,
+                response_deserializer=hpo__pb2.TrialHistoryReply.FromString,
+                )
+        self.StreamTrials = channel.unary_stream(
+                '/helloworld.HpoService/StreamTrials',
+                request_serializer=hpo__pb2.ExperimentNameParams.SerializeToString,
+                response_deserializer=hpo__pb2.TrialConfigBatch.Trial.FromString,
+                )
+        self.WatchExperiment = channel.unary_stream(
+                '/helloworld.HpoService/WatchExperiment',
+                request_serializer=hpo__pb2.ExperimentNameParams.SerializeToString,
+                response_deserializer=hpo__pb2.ExperimentEvent.FromString,
+                )
+        self.TrialLoop = channel.stream_stream(
+                '/helloworld.HpoService/TrialLoop',
+                request_serializer=hpo__pb2.TrialLoopRequest.SerializeToString,
+                response_deserializer=hpo__pb2.TrialLoopReply.FromString,
+                )
 
 
 class HpoServiceServicer(object):
@@ -108,6 +158,25 @@ class HpoServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReportIntermediateResult(self, request, context):
+        """report an intermediate value of a running trial, the reply tells whether the trial has been pruned
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTrialConfigBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateTrialResultBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GenerateNextConfig(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -120,6 +189,55 @@ class HpoServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetTunableImportance(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetParetoFront(self, request, context):
+        """trials that are not beaten on every objective by another trial
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTrialTimings(self, request, context):
+        """where the time of every finished trial went, to tell a slow sampler from lock contention or a slow client
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTrialHistory(self, request, context):
+        """finished trials with their config and result, a page at a time
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamTrials(self, request, context):
+        """push the config of every trial as it is started, until the experiment finishes
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchExperiment(self, request, context):
+        """push every status update, ending with the recommended config once the experiment completes
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TrialLoop(self, request_iterator, context):
+        """run trials of one or more experiments over a single stream, sending results and receiving the next configs, also
+        those asked and the completion caused by other clients
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_HpoServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -158,6 +276,21 @@ def add_HpoServiceServicer_to_server(servicer, server):
                     request_deserializer=hpo__pb2.ExperimentTrialResult.FromString,
                     response_serializer=hpo__pb2.ExperimentEmptyReply.SerializeToString,
             ),
+            'ReportIntermediateResult': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReportIntermediateResult,
+                    request_deserializer=hpo__pb2.ExperimentTrialIntermediateResult.FromString,
+                    response_serializer=hpo__pb2.IntermediateResultReply.SerializeToString,
+            ),
+            'GetTrialConfigBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTrialConfigBatch,
+                    request_deserializer=hpo__pb2.TrialBatchParams.FromString,
+                    response_serializer=hpo__pb2.TrialConfigBatch.SerializeToString,
+            ),
+            'UpdateTrialResultBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateTrialResultBatch,
+                    request_deserializer=hpo__pb2.ExperimentTrialResultBatch.FromString,
+                    response_serializer=hpo__pb2.ExperimentEmptyReply.SerializeToString,
+            ),
             'GenerateNextConfig': grpc.unary_unary_rpc_method_handler(
                     servicer.GenerateNextConfig,
                     request_deserializer=hpo__pb2.ExperimentNameParams.FromString,
@@ -168,6 +301,41 @@ def add_HpoServiceServicer_to_server(servicer, server):
                     request_deserializer=hpo__pb2.ExperimentNameParams.FromString,
                     response_serializer=hpo__pb2.RecommendedConfigReply.SerializeToString,
             ),
+            'GetTunableImportance': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTunableImportance,
+                    request_deserializer=hpo__pb2.TunableImportanceParams.FromString,
+                    response_serializer=hpo__pb2.TunableImportanceReply.SerializeToString,
+            ),
+            'GetParetoFront': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetParetoFront,
+                    request_deserializer=hpo__pb2.ExperimentNameParams.FromString,
+                    response_serializer=hpo__pb2.ParetoFrontReply.SerializeToString,
+            ),
+            'GetTrialTimings': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTrialTimings,
+                    request_deserializer=hpo__pb2.ExperimentNameParams.FromString,
+                    response_serializer=hpo__pb2.TrialTimingsReply.SerializeToString,
+            ),
+            'GetTrialHistory': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTrialHistory,
+                    request_deserializer=hpo__pb2.TrialHistoryParams.FromString,
+                    response_serializer=hpo__pb2.TrialHistoryReply.SerializeToString,
+            ),
+            'StreamTrials': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamTrials,
+                    request_deserializer=hpo__pb2.ExperimentNameParams.FromString,
+                    response_serializer=hpo__pb2.TrialConfigBatch.Trial.SerializeToString,
+            ),
+            'WatchExperiment': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchExperiment,
+                    request_deserializer=hpo__pb2.ExperimentNameParams.FromString,
+                    response_serializer=hpo__pb2.ExperimentEvent.SerializeToString,
+            ),
+            'TrialLoop': grpc.stream_stream_rpc_method_handler(
+                    servicer.TrialLoop,
+                    request_deserializer=hpo__pb2.TrialLoopRequest.FromString,
+                    response_serializer=hpo__pb2.TrialLoopReply.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'helloworld.HpoService', rpc_method_handlers)
@@ -298,6 +466,57 @@ class HpoService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def ReportIntermediateResult(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/helloworld.HpoService/ReportIntermediateResult',
+            hpo__pb2.ExperimentTrialIntermediateResult.SerializeToString,
+            hpo__pb2.IntermediateResultReply.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTrialConfigBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/helloworld.HpoService/GetTrialConfigBatch',
+            hpo__pb2.TrialBatchParams.SerializeToString,
+            hpo__pb2.TrialConfigBatch.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UpdateTrialResultBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/helloworld.HpoService/UpdateTrialResultBatch',
+            hpo__pb2.ExperimentTrialResultBatch.SerializeToString,
+            hpo__pb2.ExperimentEmptyReply.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GenerateNextConfig(request,
             target,
@@ -331,3 +550,122 @@ class HpoService(object):
             hpo__pb2.RecommendedConfigReply.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTunableImportance(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/helloworld.HpoService/GetTunableImportance',
+            hpo__pb2.TunableImportanceParams.SerializeToString,
+            hpo__pb2.TunableImportanceReply.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetParetoFront(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/helloworld.HpoService/GetParetoFront',
+            hpo__pb2.ExperimentNameParams.SerializeToString,
+            hpo__pb2.ParetoFrontReply.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTrialTimings(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/helloworld.HpoService/GetTrialTimings',
+            hpo__pb2.ExperimentNameParams.SerializeToString,
+            hpo__pb2.TrialTimingsReply.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTrialHistory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/helloworld.HpoService/GetTrialHistory',
+            hpo__pb2.TrialHistoryParams.SerializeToString,
+            hpo__pb2.TrialHistoryReply.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamTrials(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/helloworld.HpoService/StreamTrials',
+            hpo__pb2.ExperimentNameParams.SerializeToString,
+            hpo__pb2.TrialConfigBatch.Trial.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WatchExperiment(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/helloworld.HpoService/WatchExperiment',
+            hpo__pb2.ExperimentNameParams.SerializeToString,
+            hpo__pb2.ExperimentEvent.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def TrialLoop(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/helloworld.HpoService/TrialLoop',
+            hpo__pb2.TrialLoopRequest.SerializeToString,
+            hpo__pb2.TrialLoopReply.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
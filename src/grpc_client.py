@@ -18,6 +18,9 @@ from __future__ import print_function
 
 import logging
 import os
+import queue
+import subprocess
+from concurrent import futures
 
 import click
 import json
@@ -28,6 +31,7 @@ from google.protobuf.json_format import MessageToJson, ParseError
 from google.protobuf.json_format import Parse, ParseDict
 import json_validate
 from logger import get_logger
+from tunables import get_tunable_value
 
 logger = get_logger(__name__)
 
@@ -124,7 +128,9 @@ def config(name, trial):
 @click.option("--result", prompt=" Enter trial result", type=str)
 @click.option("--value_type", prompt=" Enter result type", type=str)
 @click.option("--value", prompt=" Enter result value", type=float)
-def result(name, trial, result, value_type, value):
+@click.option("--additional_value", multiple=True, type=float,
+              help="Value of an additional objective, repeated in the order the objectives are listed")
+def result(name, trial, result, value_type, value, additional_value):
     """Update results for a particular experiment trail"""
     trialResult: hpo_pb2.ExperimentTrialResult = hpo_pb2.ExperimentTrialResult()
     trialResult.experiment_name = name
@@ -132,10 +138,55 @@ def result(name, trial, result, value_type, value):
     trialResult.result = hpo_pb2._EXPERIMENTTRIALRESULT_RESULT.values_by_name[result].number
     trialResult.value_type = value_type
     trialResult.value = value
+    trialResult.additional_values.extend(additional_value)
     fun = lambda stub: stub.UpdateTrialResult(trialResult)
     hpo_pb2.TrialConfig = run(fun)
     click.echo("Success: Updated Trial Result")
 
+@main.command()
+@click.option("--name", prompt=" Enter name", type=str)
+@click.option("--trial", prompt=" Enter trial number", type=int)
+@click.option("--step", prompt=" Enter step", type=int)
+@click.option("--value_type", prompt=" Enter result type", type=str)
+@click.option("--value", prompt=" Enter intermediate value", type=float)
+def report(name, trial, step, value_type, value):
+    """Report an intermediate value of a running trial"""
+    intermediateResult = hpo_pb2.ExperimentTrialIntermediateResult(experiment_name=name, trial=trial, step=step,
+                                                                   value_type=value_type, value=value)
+    fun = lambda stub: stub.ReportIntermediateResult(intermediateResult)
+    reply: hpo_pb2.IntermediateResultReply = run(fun)
+    if reply.prune:
+        click.echo("Trial {} has been pruned, stop running it".format(trial))
+    else:
+        click.echo("Success: Reported Intermediate Value")
+
+@main.command()
+@click.option("--name", prompt=" Experiment name", type=str)
+@click.option("--count", prompt=" Number of trials", type=int)
+def config_batch(name, count):
+    """Obtain configuration sets for a batch of new trials"""
+    params: hpo_pb2.TrialBatchParams = hpo_pb2.TrialBatchParams()
+    params.experiment_name = name
+    params.count = count
+    fun = lambda stub: stub.GetTrialConfigBatch(params)
+    trialConfigBatch: hpo_pb2.TrialConfigBatch = run(fun)
+    json_obj = MessageToJson(trialConfigBatch)
+    click.echo(json_obj)
+
+@main.command()
+@click.option("--file", prompt=" Trial results file path", type=str)
+def result_batch(file):
+    """Update results for several trials of an experiment"""
+    with open(file, 'r') as json_file:
+        data = json.load(json_file)
+        try:
+            message: hpo_pb2.ExperimentTrialResultBatch = ParseDict(data, hpo_pb2.ExperimentTrialResultBatch())
+        except ParseError as pErr :
+            raise click.ClickException("Unable to parse: " + file)
+    fun = lambda stub: stub.UpdateTrialResultBatch(message)
+    run(fun)
+    click.echo("Success: Updated {} Trial Results".format(len(message.results)))
+
 @main.command()
 @click.option("--name", prompt=" Enter name", type=str)
 def next(name):
@@ -160,7 +211,142 @@ def recommended(name):
     click.echo("\t Optimal Value: {}".format(recommendedConfig.optimal_value.value))
     click.echo("\t Tunables: ")
     for tunable in recommendedConfig.tunables:
-        click.echo("\t\t {}: {}".format(tunable.name, tunable.value))
+        click.echo("\t\t {}: {}".format(tunable.name, get_tunable_value(tunable)))
+
+@main.command()
+@click.option("--name", prompt=" Enter name", type=str)
+@click.option("--refresh", is_flag=True, help="Evaluate importance again for the trials finished so far")
+def importance(name, refresh):
+    """Show the importance of each tunable of an experiment"""
+    params: hpo_pb2.TunableImportanceParams = hpo_pb2.TunableImportanceParams()
+    params.experiment_name = name
+    params.refresh = refresh
+    fun = lambda stub : stub.GetTunableImportance(params)
+    importanceReply: hpo_pb2.TunableImportanceReply = run(fun)
+    click.echo("Tunable importance for experiment {} after {} trials:".format(name, importanceReply.trials))
+    for tunable in importanceReply.importance:
+        click.echo("\t {}: {}".format(tunable.name, tunable.importance))
+
+@main.command()
+@click.option("--name", prompt=" Enter name", type=str)
+def pareto(name):
+    """Show the trials of the Pareto front of an experiment"""
+    experiment: hpo_pb2.ExperimentNameParams = hpo_pb2.ExperimentNameParams()
+    experiment.experiment_name = name
+    fun = lambda stub : stub.GetParetoFront(experiment)
+    paretoFrontReply: hpo_pb2.ParetoFrontReply = run(fun)
+    click.echo("Pareto front of experiment {} ({}):".format(name, ", ".join(paretoFrontReply.objective_functions)))
+    for trial in paretoFrontReply.trials:
+        click.echo("\t Trial {}: {}".format(trial.trial, ", ".join(str(value) for value in trial.values)))
+        for tunable in trial.config:
+            click.echo("\t\t {}: {}".format(tunable.name, get_tunable_value(tunable)))
+
+@main.command()
+@click.option("--name", prompt=" Enter name", type=str)
+@click.option("--offset", default=0, type=int, help="Number of finished trials to skip")
+@click.option("--limit", default=0, type=int, help="Maximum number of trials to show, 0 for the server default")
+def history(name, offset, limit):
+    """Show the finished trials of an experiment with their config and result"""
+    params = hpo_pb2.TrialHistoryParams(experiment_name=name, offset=offset, limit=limit)
+    fun = lambda stub : stub.GetTrialHistory(params)
+    trialHistoryReply: hpo_pb2.TrialHistoryReply = run(fun)
+    click.echo("Showing {} of {} finished trials of experiment {}:".format(len(trialHistoryReply.trials),
+                                                                           trialHistoryReply.total, name))
+    for trial in trialHistoryReply.trials:
+        result = hpo_pb2.ExperimentTrialResult.Result.Name(trial.result)
+        values = [trial.value] + list(trial.additional_values) if trial.HasField("value") else []
+        click.echo("\t Trial {}: {} {}".format(trial.trial, result, ", ".join(str(value) for value in values)))
+        for tunable in trial.config:
+            click.echo("\t\t {}: {}".format(tunable.name, get_tunable_value(tunable)))
+
+@main.command()
+@click.option("--name", prompt=" Enter name", type=str)
+def timing(name):
+    """Show where the time of every finished trial of an experiment went"""
+    experiment: hpo_pb2.ExperimentNameParams = hpo_pb2.ExperimentNameParams()
+    experiment.experiment_name = name
+    fun = lambda stub : stub.GetTrialTimings(experiment)
+    trialTimingsReply: hpo_pb2.TrialTimingsReply = run(fun)
+    click.echo("\t {:>6} {:>12} {:>12} {:>12} {:>12}".format("Trial", "Sampling", "Waiting", "Lock wait",
+                                                             "Bookkeeping"))
+    for timing in trialTimingsReply.trials:
+        click.echo("\t {:>6} {:>12.6f} {:>12.6f} {:>12.6f} {:>12.6f}".format(
+            timing.trial, timing.sampling, timing.waiting, timing.lock_wait, timing.bookkeeping))
+    if trialTimingsReply.profile:
+        click.echo(trialTimingsReply.profile)
+
+@main.command()
+@click.option("--name", prompt=" Enter name", type=str)
+def watch(name):
+    """Follow the status of an experiment until it finishes"""
+    experiment: hpo_pb2.ExperimentNameParams = hpo_pb2.ExperimentNameParams()
+    experiment.experiment_name = name
+    fun = lambda stub : [click.echo(MessageToJson(event)) for event in stub.WatchExperiment(experiment)]
+    run(fun)
+
+@main.command()
+@click.option("--name", prompt=" Enter name", type=str)
+def trials(name):
+    """Follow the configuration sets of an experiment as its trials start"""
+    experiment: hpo_pb2.ExperimentNameParams = hpo_pb2.ExperimentNameParams()
+    experiment.experiment_name = name
+    fun = lambda stub : [click.echo(MessageToJson(trial)) for trial in stub.StreamTrials(experiment)]
+    run(fun)
+
+@main.command()
+@click.option("--name", required=True, multiple=True, type=str, help="Experiment to run, can be repeated")
+@click.option("--command", prompt=" Trial command", type=str,
+              help="Shell command run for each trial, reading the trial config JSON on stdin and printing the result value")
+@click.option("--parallel", default=1, type=int, help="Number of trials run at once per experiment")
+@click.option("--objectives", default=1, type=int,
+              help="Number of result values the command prints, one per objective of the experiments")
+def run_loop(name, command, parallel, objectives):
+    """Run the trials of experiments with a command until they finish"""
+    loopRequests = queue.Queue()
+    for experiment_name in name:
+        loopRequests.put(hpo_pb2.TrialLoopRequest(experiment_name=experiment_name, credits=parallel))
+    executor = futures.ThreadPoolExecutor(max_workers=parallel * len(name))
+
+    def run_trial(experiment_name, trial: hpo_pb2.TrialConfigBatch.Trial):
+        config = [{"tunable_name": tunable.name, "tunable_value": get_tunable_value(tunable)}
+                  for tunable in trial.config]
+        process = subprocess.run(command, shell=True, input=json.dumps(config), capture_output=True, text=True)
+        loopRequest = hpo_pb2.TrialLoopRequest(experiment_name=experiment_name)
+        loopRequest.result.trial = trial.trial
+        loopRequest.result.value_type = "double"
+        try:
+            if process.returncode != 0:
+                raise ValueError(process.stderr)
+            values = [float(word) for word in process.stdout.split()[-objectives:]]
+            if len(values) != objectives:
+                raise IndexError
+            loopRequest.result.value = values[0]
+            loopRequest.result.additional_values.extend(values[1:])
+            loopRequest.result.result = hpo_pb2.ExperimentTrialResult.SUCCESS
+        except (ValueError, IndexError):
+            loopRequest.result.result = hpo_pb2.ExperimentTrialResult.FAILURE
+        click.echo("{}: trial {} {}".format(experiment_name, trial.trial,
+                                            hpo_pb2.ExperimentTrialResult.Result.Name(loopRequest.result.result)))
+        loopRequests.put(loopRequest)
+
+    def loop(stub):
+        running = set(name)
+        # the request stream ends once every experiment has finished
+        for loopReply in stub.TrialLoop(iter(loopRequests.get, None)):
+            if loopReply.error:
+                click.echo("{}: {}".format(loopReply.experiment_name, loopReply.error))
+            if loopReply.finished:
+                if loopReply.HasField("recommended_config"):
+                    click.echo("{}: finished, optimal value {}".format(
+                        loopReply.experiment_name, loopReply.recommended_config.optimal_value.value))
+                running.discard(loopReply.experiment_name)
+                if not running:
+                    loopRequests.put(None)
+            elif loopReply.HasField("trial"):
+                executor.submit(run_trial, loopReply.experiment_name, loopReply.trial)
+
+    run(loop)
+    executor.shutdown()
 
 def run(func):
     # NOTE(gRPC Python Team): .close() is possible on a channel and should be
@@ -195,6 +381,8 @@ def run(func):
                 raise click.ClickException(rpc_error.details())
             elif rpc_error.code() == grpc.StatusCode.ALREADY_EXISTS:
                 raise click.ClickException(rpc_error.details())
+            elif rpc_error.code() == grpc.StatusCode.FAILED_PRECONDITION:
+                raise click.ClickException(rpc_error.details())
             else:
                 raise click.ClickException("Received unknown RPC error: code={" + str(rpc_error.code()) + "} message={" + rpc_error.details() + "}")
         return
@@ -14,22 +14,31 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
+import json
+import os
+import queue
+import struct
+import threading
+import time
 from concurrent import futures
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 import grpc
-import json
 from gRPC import hpo_pb2, hpo_pb2_grpc
 import hpo_service
-from google.protobuf.json_format import MessageToJson
-from bayes_optuna.optuna_hpo import HpoExperiment
+import json_validate
+import metrics
+from bayes_optuna.optuna_hpo import FINISHED_STATUSES, HpoExperiment
+from bayes_optuna.samplers import SAMPLERS
 from gRPC.hpo_pb2 import NewExperimentsReply, RecommendedConfigReply, TunableConfig
-from exceptions import ExperimentNotFoundError
+from exceptions import ExperimentNotFoundError, ImportanceUnavailableError
+from tunables import get_tunable_value
+from utils import HPOErrorConstants, HPOSupportedTypes
 
 host_name="0.0.0.0"
-server_port = 50051
 
 class HpoService(hpo_pb2_grpc.HpoServiceServicer):
 
@@ -53,10 +62,19 @@ class HpoService(hpo_pb2_grpc.HpoServiceServicer):
             experimentDetailsReply.hpo_algo_impl = experiment.hpo_algo_impl
             # reply.id_ = experiment.id_
             experimentDetailsReply.objective_function = experiment.objective_function
-            # TODO:: expand tunables message
-            # reply.tunables = experiment.tunables
-            experimentDetailsReply.started = experiment.started
+            add_tunable_messages(experimentDetailsReply.tunables, experiment.tunables)
+            experimentDetailsReply.started = experiment.hasStarted()
             experimentDetailsReply.current_trial = experiment.trialDetails.trial_number
+            if experiment.stopReason is not None:
+                experimentDetailsReply.stop_reason = experiment.stopReason
+            if experiment.pruner:
+                set_pruner(experimentDetailsReply.pruner, experiment.pruner)
+            if experiment.samplerParams:
+                set_sampler_params(experimentDetailsReply.sampler_params, experiment.samplerParams)
+            for objective in experiment.additionalObjectives or []:
+                experimentDetailsReply.additional_objectives.add(**objective)
+            if experiment.samplerHistory:
+                experimentDetailsReply.sampler_history.CopyFrom(hpo_pb2.SamplerHistory(**experiment.samplerHistory))
             context.set_code(grpc.StatusCode.OK)
             return experimentDetailsReply
         except ExperimentNotFoundError:
@@ -66,31 +84,114 @@ class HpoService(hpo_pb2_grpc.HpoServiceServicer):
 
 
     def NewExperiment(self, request, context):
-        if request.hpo_algo_impl in ("optuna_tpe", "optuna_tpe_multivariate", "optuna_skopt"):
-            tunables = []
-            for tunable in request.tunables:
-                tunables.append(json.loads(MessageToJson(tunable, preserving_proto_field_name=True)))
+        if request.hpo_algo_impl in SAMPLERS:
+            try:
+                tunables = search_space_tunables(request.tunables)
+            except ValueError as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details('Invalid condition value: %s' % str(e))
+                return NewExperimentsReply()
+            validationError = json_validate.validate_tunables(tunables)
+            if validationError:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(validationError)
+                return NewExperimentsReply()
 
             # check if the experiment already exists and return error accordingly
             if hpo_service.instance.containsExperiment(request.experiment_name):
                 context.set_code(grpc.StatusCode.ALREADY_EXISTS)
                 context.set_details('Experiment %s already exists!' % request.experiment_name)
-                return
-            hpo_service.instance.newExperiment(None, request.experiment_name,
-                                               request.total_trials, request.parallel_trials,
-                                               request.direction, request.hpo_algo_impl,
-                                               request.objective_function,
-                                               tunables, request.value_type)
-            hpo_service.instance.startExperiment(request.experiment_name)
-            experiment: HpoExperiment = hpo_service.instance.getExperiment(request.experiment_name)
+                return NewExperimentsReply()
+            early_stopping = None
+            if request.HasField("early_stopping"):
+                early_stopping = {key: value for key, value in
+                                  (("patience", request.early_stopping.patience),
+                                   ("min_delta", request.early_stopping.min_delta),
+                                   ("max_duration", request.early_stopping.max_duration)) if value}
+                validationError = json_validate.validate_early_stopping(early_stopping)
+                if validationError:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(validationError)
+                    return NewExperimentsReply()
+            sampler_params = None
+            if request.sampler_params:
+                sampler_params = sampler_params_dict(request.sampler_params)
+                validationError = json_validate.validate_sampler_params(request.hpo_algo_impl, sampler_params)
+                if validationError:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(validationError)
+                    return NewExperimentsReply()
+            sampler_history = None
+            if request.HasField("sampler_history"):
+                sampler_history = {key: value for key, value in
+                                   (("window", request.sampler_history.window),
+                                    ("top_k", request.sampler_history.top_k),
+                                    ("random", request.sampler_history.random)) if value}
+                validationError = json_validate.validate_sampler_history(sampler_history)
+                if validationError:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(validationError)
+                    return NewExperimentsReply()
+            pruner = None
+            if request.HasField("pruner"):
+                pruner = pruner_dict(request.pruner)
+                validationError = json_validate.validate_pruner(pruner)
+                if validationError:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(validationError)
+                    return NewExperimentsReply()
+            additional_objectives = None
+            if request.additional_objectives:
+                additional_objectives = [{"objective_function": objective.objective_function,
+                                          "direction": objective.direction}
+                                         for objective in request.additional_objectives]
+                validationError = json_validate.validate_additional_objectives(
+                    additional_objectives, {"pruner": pruner, "hpo_algo_impl": request.hpo_algo_impl})
+                if validationError:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(validationError)
+                    return NewExperimentsReply()
+            warm_start = None
+            if request.HasField("warm_start"):
+                warm_start = warm_start_dict(request.warm_start)
+                validationError = json_validate.validate_warm_start(warm_start, {
+                    "tunables": tunables, "additional_objectives": additional_objectives})
+                if validationError:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(validationError)
+                    return NewExperimentsReply()
+            response = hpo_service.instance.newExperiment(None, request.experiment_name,
+                                                          request.total_trials, request.parallel_trials,
+                                                          request.direction, request.hpo_algo_impl,
+                                                          request.objective_function,
+                                                          tunables, request.value_type, warm_start,
+                                                          early_stopping, pruner, sampler_params,
+                                                          additional_objectives, sampler_history)
+            if response == HPOErrorConstants.WARM_START_NOT_FOUND:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details(response)
+                return NewExperimentsReply()
+            elif response:
+                context.set_code(grpc.StatusCode.ALREADY_EXISTS)
+                context.set_details('Experiment %s already exists!' % request.experiment_name)
+                return NewExperimentsReply()
+            response = hpo_service.instance.startExperiment(request.experiment_name, not request.async_start)
+            if response:
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(response)
+                return NewExperimentsReply()
             newExperimentReply: NewExperimentsReply = NewExperimentsReply()
-            newExperimentReply.trial_number = experiment.trialDetails.trial_number
+            if request.async_start:
+                newExperimentReply.trial_number = -1
+            else:
+                experiment: HpoExperiment = hpo_service.instance.getExperiment(request.experiment_name)
+                newExperimentReply.trial_number = experiment.trialDetails.trial_number
             context.set_code(grpc.StatusCode.OK)
             return newExperimentReply
         else:
             context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
             context.set_details('Invalid algorithm: %s' % request.hpo_algo_impl)
-            return
+            return NewExperimentsReply()
 
     def DeleteExperiment(self, request, context):
         if hpo_service.instance.containsExperiment(request.experiment_name):
@@ -102,16 +203,11 @@ class HpoService(hpo_pb2_grpc.HpoServiceServicer):
 
     def GetTrialConfig(self, request, context):
         if hpo_service.instance.containsExperiment(request.experiment_name):
-            if(hpo_service.instance.get_trial_number(request.experiment_name) == request.trial):
-                data = json.loads(hpo_service.instance.get_trial_json_object(request.experiment_name))
+            data = hpo_service.instance.get_trial_config(request.experiment_name, request.trial)
+            if data is not None:
                 trialConfig : hpo_pb2.TrialConfig = hpo_pb2.TrialConfig()
                 logger.debug("New config for experiment {}, trial {}".format(request.experiment_name, request.trial))
-                for config in data:
-                    tunable: hpo_pb2.TunableConfig = hpo_pb2.TunableConfig()
-                    tunable.name = config['tunable_name']
-                    tunable.value = config['tunable_value']
-                    trialConfig.config.extend([tunable])
-                    logger.debug("{}: {}".format(tunable.name, tunable.value))
+                add_tunable_configs(trialConfig.config, data)
 
                 context.set_code(grpc.StatusCode.OK)
                 return trialConfig
@@ -128,19 +224,105 @@ class HpoService(hpo_pb2_grpc.HpoServiceServicer):
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details('Experiment not found!')
             return hpo_pb2.ExperimentEmptyReply()
-        if ( request.trial != hpo_service.instance.get_trial_number(request.experiment_name)):
+        if not hpo_service.instance.is_trial_pending(request.experiment_name, request.trial):
             context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
             context.set_details('Invalid trial number!')
             return hpo_pb2.ExperimentEmptyReply()
+        validationError = hpo_service.instance.validate_additional_result_values(
+            request.experiment_name, TRIAL_RESULTS[request.result], request.additional_values)
+        if validationError:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(validationError)
+            return hpo_pb2.ExperimentEmptyReply()
 
         hpo_service.instance.set_result(request.experiment_name,
-                                        request.result,
+                                        request.trial,
+                                        TRIAL_RESULTS[request.result],
                                         request.value_type,
-                                        request.value)
+                                        request.value,
+                                        list(request.additional_values))
+        context.set_code(grpc.StatusCode.OK)
+        return hpo_pb2.ExperimentEmptyReply()
+
+    def ReportIntermediateResult(self, request, context):
+        if hpo_service.instance.doesNotContainExperiment(request.experiment_name):
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Experiment not found!')
+            return hpo_pb2.IntermediateResultReply()
+        if not hpo_service.instance.is_trial_pending(request.experiment_name, request.trial):
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details('Invalid trial number!')
+            return hpo_pb2.IntermediateResultReply()
+        if request.step < 0:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(HPOErrorConstants.INVALID_STEP)
+            return hpo_pb2.IntermediateResultReply()
+        if hpo_service.instance.is_multi_objective(request.experiment_name):
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(HPOErrorConstants.MULTI_OBJECTIVE_PRUNING)
+            return hpo_pb2.IntermediateResultReply()
+
+        prune = hpo_service.instance.report_result(request.experiment_name, request.trial, request.step,
+                                                   request.value)
+        context.set_code(grpc.StatusCode.OK)
+        return hpo_pb2.IntermediateResultReply(prune=prune)
+
+    def GetTrialConfigBatch(self, request, context):
+        if hpo_service.instance.doesNotContainExperiment(request.experiment_name):
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return hpo_pb2.TrialConfigBatch()
+        if request.count < 1:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(HPOErrorConstants.INVALID_BATCH_SIZE)
+            return hpo_pb2.TrialConfigBatch()
+        if hpo_service.instance.isExperimentStarting(request.experiment_name):
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details(HPOErrorConstants.EXPERIMENT_NOT_STARTED)
+            return hpo_pb2.TrialConfigBatch()
+
+        trialConfigBatch: hpo_pb2.TrialConfigBatch = hpo_pb2.TrialConfigBatch()
+        for trial in hpo_service.instance.get_trial_batch(request.experiment_name, request.count):
+            batchTrial = trialConfigBatch.trials.add(trial=trial["trial_number"])
+            add_tunable_configs(batchTrial.config, trial["trial_config"])
+        context.set_code(grpc.StatusCode.OK)
+        return trialConfigBatch
+
+    def UpdateTrialResultBatch(self, request, context):
+        if hpo_service.instance.doesNotContainExperiment(request.experiment_name):
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Experiment not found!')
+            return hpo_pb2.ExperimentEmptyReply()
+        trial_numbers = set()
+        for result in request.results:
+            if result.trial in trial_numbers or \
+                    not hpo_service.instance.is_trial_pending(request.experiment_name, result.trial):
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details('Invalid trial number: {}'.format(result.trial))
+                return hpo_pb2.ExperimentEmptyReply()
+            validationError = hpo_service.instance.validate_additional_result_values(
+                request.experiment_name, TRIAL_RESULTS[result.result], result.additional_values)
+            if validationError:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details('Trial {}: {}'.format(result.trial, validationError))
+                return hpo_pb2.ExperimentEmptyReply()
+            trial_numbers.add(result.trial)
+
+        hpo_service.instance.set_results(request.experiment_name,
+                                         [{"trial_number": result.trial,
+                                           "trial_result": TRIAL_RESULTS[result.result],
+                                           "result_value_type": result.value_type,
+                                           "result_value": result.value,
+                                           "additional_result_values": list(result.additional_values)}
+                                          for result in request.results])
         context.set_code(grpc.StatusCode.OK)
         return hpo_pb2.ExperimentEmptyReply()
 
     def GenerateNextConfig(self, request, context):
+        if hpo_service.instance.isExperimentStarting(request.experiment_name):
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details(HPOErrorConstants.EXPERIMENT_NOT_STARTED)
+            return NewExperimentsReply()
         trial_number = hpo_service.instance.get_trial_number(request.experiment_name)
         nextConfigReply : NewExperimentsReply = NewExperimentsReply()
         nextConfigReply.trial_number = trial_number
@@ -160,33 +342,690 @@ class HpoService(hpo_pb2_grpc.HpoServiceServicer):
 
         recommendedConfig = hpo_service.instance.get_recommended_config(request.experiment_name)
         recommendedConfigReply : RecommendedConfigReply = RecommendedConfigReply()
-        recommendedConfigReply.experiment_name = recommendedConfig["experiment_name"]
-        recommendedConfigReply.direction = recommendedConfig["direction"]
+        set_recommended_config(recommendedConfigReply, recommendedConfig)
+
+        context.set_code(grpc.StatusCode.OK)
+        return recommendedConfigReply
+
+    def StreamTrials(self, request, context):
+        try:
+            experiment: HpoExperiment = hpo_service.instance.getExperiment(request.experiment_name)
+        except ExperimentNotFoundError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return
+
+        last_trial_number = -1
+        version = -1
+        while context.is_active():
+            version = experiment.waitForStatusUpdate(version, HPOSupportedTypes.STREAM_POLL_INTERVAL)
+            for trialDetails in experiment.getTrialsAfter(last_trial_number):
+                trial = hpo_pb2.TrialConfigBatch.Trial(trial=trialDetails.trial_number)
+                add_tunable_configs(trial.config, trialDetails.trial_json_object)
+                last_trial_number = trialDetails.trial_number
+                yield trial
+            if experiment.hasFinished():
+                return
+
+    def WatchExperiment(self, request, context):
+        try:
+            experiment: HpoExperiment = hpo_service.instance.getExperiment(request.experiment_name)
+        except ExperimentNotFoundError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return
 
-        recommendedConfigReply.optimal_value.objective_function = recommendedConfig["optimal_value"]["objective_function"]["name"]
-        recommendedConfigReply.optimal_value.value = recommendedConfig["optimal_value"]["objective_function"]["value"]
-        recommendedConfigReply.optimal_value.value_type = recommendedConfig["optimal_value"]["objective_function"]["value_type"]
+        version = -1
+        while context.is_active():
+            new_version = experiment.waitForStatusUpdate(version, HPOSupportedTypes.STREAM_POLL_INTERVAL)
+            if new_version == version:
+                continue
+            version = new_version
+            status = experiment.status
+            experimentEvent: hpo_pb2.ExperimentEvent = hpo_pb2.ExperimentEvent()
+            experimentEvent.status = status
+            experimentEvent.current_trial = experiment.trialDetails.trial_number
+            experimentEvent.stop_reason = experiment.stopReason or ""
+            if status == "Completed":
+                set_recommended_config(experimentEvent.recommended_config,
+                                       hpo_service.instance.get_recommended_config(request.experiment_name))
+            yield experimentEvent
+            # the status may have changed since the event was made, the stream ends once it sent the final status
+            if status in FINISHED_STATUSES:
+                return
 
-        for tunable in recommendedConfig["optimal_value"]["tunables"]:
-            tunableConfig : TunableConfig = TunableConfig()
-            tunableConfig.name = tunable["name"]
-            tunableConfig.value = tunable["value"]
-            tunableConfig.value_type = tunable["value_type"]
-            recommendedConfigReply.tunables.append(tunableConfig)
+    def TrialLoop(self, request_iterator, context):
+        # experiments the client has joined on this stream, by name
+        loops = {}
+        # requests of the client and status updates of the joined experiments (None), in the order they happen
+        events = queue.SimpleQueue()
+        listener = lambda: events.put(None)
+
+        def read_requests():
+            try:
+                for loopRequest in request_iterator:
+                    events.put(loopRequest)
+            except grpc.RpcError:
+                pass
+            finally:
+                events.put(END_OF_REQUESTS)
+
+        threading.Thread(target=read_requests, name="trial-loop", daemon=True).start()
+        try:
+            while context.is_active():
+                try:
+                    event = events.get(timeout=HPOSupportedTypes.STREAM_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if event is END_OF_REQUESTS:
+                    return
+                if event is None:
+                    loopReplies = handle_loop_updates(loops)
+                else:
+                    loopReplies = handle_loop_request(loops, event, listener)
+                for loopReply in loopReplies:
+                    yield loopReply
+        finally:
+            close_loops(loops)
+
+    def GetTunableImportance(self, request, context):
+        if hpo_service.instance.doesNotContainExperiment(request.experiment_name):
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Experiment not found!')
+            return hpo_pb2.TunableImportanceReply()
 
+        try:
+            trials, importance = hpo_service.instance.get_importance(request.experiment_name, request.refresh)
+        except ImportanceUnavailableError as e:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(str(e))
+            return hpo_pb2.TunableImportanceReply()
+
+        importanceReply: hpo_pb2.TunableImportanceReply = hpo_pb2.TunableImportanceReply()
+        importanceReply.trials = trials
+        for name, value in importance.items():
+            importanceReply.importance.add(name=name, importance=value)
         context.set_code(grpc.StatusCode.OK)
-        return recommendedConfigReply
+        return importanceReply
+
+    def GetParetoFront(self, request, context):
+        try:
+            experiment: HpoExperiment = hpo_service.instance.getExperiment(request.experiment_name)
+        except ExperimentNotFoundError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return hpo_pb2.ParetoFrontReply()
+
+        paretoFrontReply: hpo_pb2.ParetoFrontReply = hpo_pb2.ParetoFrontReply()
+        paretoFrontReply.objective_functions.append(experiment.objective_function)
+        paretoFrontReply.objective_functions.extend(objective["objective_function"]
+                                                    for objective in experiment.additionalObjectives or [])
+        for trial in hpo_service.instance.get_pareto_front(request.experiment_name):
+            paretoTrial = paretoFrontReply.trials.add(trial=trial["trial_number"])
+            paretoTrial.values.extend(value["value"] for value in trial["objective_values"])
+            add_tunable_configs(paretoTrial.config, trial["config"])
+        context.set_code(grpc.StatusCode.OK)
+        return paretoFrontReply
+
+    def GetTrialHistory(self, request, context):
+        limit = request.limit or HPOSupportedTypes.TRIAL_HISTORY_LIMIT
+        if request.offset < 0 or not 1 <= limit <= HPOSupportedTypes.TRIAL_HISTORY_MAX_LIMIT:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(HPOErrorConstants.INVALID_PAGE + str(HPOSupportedTypes.TRIAL_HISTORY_MAX_LIMIT))
+            return hpo_pb2.TrialHistoryReply()
+        try:
+            total, trials = hpo_service.instance.get_trial_records(request.experiment_name, request.offset, limit)
+        except ExperimentNotFoundError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return hpo_pb2.TrialHistoryReply()
+
+        trialHistoryReply: hpo_pb2.TrialHistoryReply = hpo_pb2.TrialHistoryReply(total=total)
+        for trial in trials:
+            historyTrial = trialHistoryReply.trials.add(trial=trial["trial_number"],
+                                                        result=TRIAL_RESULT_MESSAGES[trial["trial_result"]])
+            if trial["result_value"] is not None:
+                historyTrial.value = trial["result_value"]
+            historyTrial.additional_values.extend(trial.get("additional_result_values", []))
+            add_tunable_configs(historyTrial.config, trial["config"])
+        context.set_code(grpc.StatusCode.OK)
+        return trialHistoryReply
+
+    def GetTrialTimings(self, request, context):
+        try:
+            report = hpo_service.instance.get_timing_report(request.experiment_name)
+        except ExperimentNotFoundError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return hpo_pb2.TrialTimingsReply()
+
+        trialTimingsReply: hpo_pb2.TrialTimingsReply = hpo_pb2.TrialTimingsReply(profile=report.get("profile", ""))
+        for timing in report["trials"]:
+            trialTimingsReply.trials.add(trial=timing["trial_number"], sampling=timing["sampling"],
+                                         waiting=timing["waiting"], lock_wait=timing["lock_wait"],
+                                         bookkeeping=timing["bookkeeping"])
+        context.set_code(grpc.StatusCode.OK)
+        return trialTimingsReply
+
+class AsyncHpoService(hpo_pb2_grpc.HpoServiceServicer):
+    """
+    HpoService for the asyncio server. Blocking calls into hpo_service are run on the executor, streams wait for
+    experiment updates on the event loop.
+    """
+
+    def __init__(self, executor: futures.ThreadPoolExecutor):
+        self.servicer = HpoService()
+        self.executor = executor
+
+    async def run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def NumberExperiments(self, request, context):
+        return await self.run_blocking(self.servicer.NumberExperiments, request, context)
+
+    async def ExperimentsList(self, request, context):
+        return await self.run_blocking(self.servicer.ExperimentsList, request, context)
+
+    async def GetExperimentDetails(self, request, context):
+        return await self.run_blocking(self.servicer.GetExperimentDetails, request, context)
+
+    async def NewExperiment(self, request, context):
+        return await self.run_blocking(self.servicer.NewExperiment, request, context)
+
+    async def DeleteExperiment(self, request, context):
+        return await self.run_blocking(self.servicer.DeleteExperiment, request, context)
+
+    async def GetTrialConfig(self, request, context):
+        return await self.run_blocking(self.servicer.GetTrialConfig, request, context)
+
+    async def UpdateTrialResult(self, request, context):
+        return await self.run_blocking(self.servicer.UpdateTrialResult, request, context)
+
+    async def ReportIntermediateResult(self, request, context):
+        return await self.run_blocking(self.servicer.ReportIntermediateResult, request, context)
+
+    async def GetTrialConfigBatch(self, request, context):
+        return await self.run_blocking(self.servicer.GetTrialConfigBatch, request, context)
+
+    async def UpdateTrialResultBatch(self, request, context):
+        return await self.run_blocking(self.servicer.UpdateTrialResultBatch, request, context)
+
+    async def GenerateNextConfig(self, request, context):
+        return await self.run_blocking(self.servicer.GenerateNextConfig, request, context)
+
+    async def GetRecommendedConfig(self, request, context):
+        return await self.run_blocking(self.servicer.GetRecommendedConfig, request, context)
+
+    async def GetTunableImportance(self, request, context):
+        return await self.run_blocking(self.servicer.GetTunableImportance, request, context)
+
+    async def GetParetoFront(self, request, context):
+        return await self.run_blocking(self.servicer.GetParetoFront, request, context)
+
+    async def GetTrialHistory(self, request, context):
+        return await self.run_blocking(self.servicer.GetTrialHistory, request, context)
+
+    async def GetTrialTimings(self, request, context):
+        return await self.run_blocking(self.servicer.GetTrialTimings, request, context)
+
+    async def StreamTrials(self, request, context):
+        try:
+            experiment: HpoExperiment = hpo_service.instance.getExperiment(request.experiment_name)
+        except ExperimentNotFoundError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return
+
+        last_trial_number = -1
+        updated, listener = self.listen(experiment)
+        try:
+            while True:
+                updated.clear()
+                trials = await self.run_blocking(experiment.getTrialsAfter, last_trial_number)
+                for trialDetails in trials:
+                    trial = hpo_pb2.TrialConfigBatch.Trial(trial=trialDetails.trial_number)
+                    add_tunable_configs(trial.config, trialDetails.trial_json_object)
+                    last_trial_number = trialDetails.trial_number
+                    yield trial
+                if experiment.hasFinished():
+                    return
+                await updated.wait()
+        finally:
+            experiment.removeStatusListener(listener)
+
+    async def WatchExperiment(self, request, context):
+        try:
+            experiment: HpoExperiment = hpo_service.instance.getExperiment(request.experiment_name)
+        except ExperimentNotFoundError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('Could not find experiment: %s' % request.experiment_name)
+            return
+
+        version = -1
+        updated, listener = self.listen(experiment)
+        try:
+            while True:
+                updated.clear()
+                if experiment.statusVersion != version:
+                    version = experiment.statusVersion
+                    status = experiment.status
+                    experimentEvent: hpo_pb2.ExperimentEvent = hpo_pb2.ExperimentEvent()
+                    experimentEvent.status = status
+                    experimentEvent.current_trial = experiment.trialDetails.trial_number
+                    experimentEvent.stop_reason = experiment.stopReason or ""
+                    if status == "Completed":
+                        set_recommended_config(experimentEvent.recommended_config,
+                                               await self.run_blocking(hpo_service.instance.get_recommended_config,
+                                                                       request.experiment_name))
+                    yield experimentEvent
+                    if status in FINISHED_STATUSES:
+                        return
+                await updated.wait()
+        finally:
+            experiment.removeStatusListener(listener)
+
+    async def TrialLoop(self, request_iterator, context):
+        # experiments the client has joined on this stream, by name
+        loops = {}
+        # requests of the client and status updates of the joined experiments (None), in the order they happen
+        events = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        listener = lambda: loop.call_soon_threadsafe(events.put_nowait, None)
+
+        async def read_requests():
+            try:
+                async for loopRequest in request_iterator:
+                    events.put_nowait(loopRequest)
+            finally:
+                events.put_nowait(END_OF_REQUESTS)
+
+        reader = asyncio.ensure_future(read_requests())
+        try:
+            while True:
+                event = await events.get()
+                if event is END_OF_REQUESTS:
+                    return
+                if event is None:
+                    loopReplies = await self.run_blocking(handle_loop_updates, loops)
+                else:
+                    loopReplies = await self.run_blocking(handle_loop_request, loops, event, listener)
+                for loopReply in loopReplies:
+                    yield loopReply
+        finally:
+            reader.cancel()
+            close_loops(loops)
+
+    def listen(self, experiment: HpoExperiment):
+        """
+        Return an asyncio.Event set on every status update of the experiment, and the listener setting it, which has to
+        be removed once the stream ends.
+        """
+        loop = asyncio.get_running_loop()
+        updated = asyncio.Event()
+        listener = lambda: loop.call_soon_threadsafe(updated.set)
+        experiment.addStatusListener(listener)
+        return updated, listener
+
+
+def handle_loop_request(loops, loopRequest, listener) -> list:
+    """
+    Process a request received on a TrialLoop stream and return the replies to send. listener is called on every
+    status update of the experiments joined on the stream.
+    """
+    loopReplies = []
+    name = loopRequest.experiment_name
+    trialLoop: TrialLoop = loops.get(name)
+    if trialLoop is None:
+        try:
+            trialLoop = loops[name] = TrialLoop(hpo_service.instance.getExperiment(name), listener)
+        except ExperimentNotFoundError:
+            loopReplies.append(hpo_pb2.TrialLoopReply(experiment_name=name, finished=True,
+                                                      error='Could not find experiment: %s' % name))
+            return loopReplies
+    experiment = trialLoop.experiment
+
+    trialLoop.credits += loopRequest.credits
+    if loopRequest.HasField("result"):
+        result = loopRequest.result
+        try:
+            validationError = hpo_service.instance.validate_additional_result_values(
+                name, TRIAL_RESULTS[result.result], result.additional_values)
+        except ExperimentNotFoundError:
+            # deleted since it was joined, the finished reply is sent below
+            validationError = 'Could not find experiment: %s' % name
+        if experiment.getPendingTrial(result.trial) is None:
+            loopReplies.append(hpo_pb2.TrialLoopReply(experiment_name=name,
+                                                      error='Invalid trial number: {}'.format(result.trial)))
+        elif validationError:
+            loopReplies.append(hpo_pb2.TrialLoopReply(experiment_name=name,
+                                                      error='Trial {}: {}'.format(result.trial, validationError)))
+        else:
+            experiment.tell(result.trial, TRIAL_RESULTS[result.result], result.value_type, result.value,
+                            list(result.additional_values))
+            trialLoop.credits += 1
+    return loopReplies + loop_updates(loops, name)
+
+
+def handle_loop_updates(loops) -> list:
+    """
+    Return the replies to send after a status update of experiments joined on a TrialLoop stream, e.g. trials asked
+    because results arrived over REST or another stream, or the experiment being completed or deleted.
+    """
+    loopReplies = []
+    for name in list(loops):
+        loopReplies += loop_updates(loops, name)
+    return loopReplies
+
+
+def loop_updates(loops, name) -> list:
+    """Return the trials of an experiment joined on a TrialLoop stream that are not sent yet, and whether it finished."""
+    loopReplies = []
+    trialLoop: TrialLoop = loops[name]
+    experiment = trialLoop.experiment
+    # wait for an experiment started in async mode
+    if experiment.startedFuture.exception() is not None:
+        loops.pop(name).close()
+        loopReplies.append(hpo_pb2.TrialLoopReply(experiment_name=name, finished=True,
+                                                  error=hpo_service.instance.getStartError(name)))
+        return loopReplies
+    for trialDetails in experiment.getPendingTrialsAfter(trialLoop.last_trial_number)[:trialLoop.credits]:
+        loopReply = hpo_pb2.TrialLoopReply(experiment_name=name)
+        loopReply.trial.trial = trialDetails.trial_number
+        add_tunable_configs(loopReply.trial.config, trialDetails.trial_json_object)
+        trialLoop.last_trial_number = trialDetails.trial_number
+        trialLoop.credits -= 1
+        trialDetails.delivered = True
+        loopReplies.append(loopReply)
+    if experiment.hasFinished():
+        loops.pop(name).close()
+        loopReply = hpo_pb2.TrialLoopReply(experiment_name=name, finished=True)
+        if experiment.status == "Completed":
+            set_recommended_config(loopReply.recommended_config, experiment.recommended_config)
+        elif experiment.status == "Deleted":
+            loopReply.error = 'Could not find experiment: %s' % name
+        loopReplies.append(loopReply)
+    return loopReplies
+
+
+def close_loops(loops):
+    for trialLoop in loops.values():
+        trialLoop.close()
+    loops.clear()
+
+
+class TrialLoop:
+    """State of an experiment joined on a TrialLoop stream."""
+
+    def __init__(self, experiment: HpoExperiment, listener):
+        self.experiment = experiment
+        # number of trial configs the client is still ready to receive
+        self.credits = 0
+        # most recent trial sent on the stream
+        self.last_trial_number = -1
+        self.listener = listener
+        experiment.addStatusListener(listener)
+
+    def close(self):
+        self.experiment.removeStatusListener(self.listener)
+
+
+def set_recommended_config(recommendedConfigReply, recommendedConfig):
+    """Fill a RecommendedConfigReply from the recommended config of an experiment."""
+    recommendedConfigReply.experiment_name = recommendedConfig["experiment_name"]
+    recommendedConfigReply.direction = recommendedConfig["direction"]
+    recommendedConfigReply.stop_reason = recommendedConfig.get("stop_reason", "")
+
+    recommendedConfigReply.optimal_value.objective_function = recommendedConfig["optimal_value"]["objective_function"]["name"]
+    recommendedConfigReply.optimal_value.value = recommendedConfig["optimal_value"]["objective_function"]["value"]
+    recommendedConfigReply.optimal_value.value_type = recommendedConfig["optimal_value"]["objective_function"]["value_type"]
+    for objective in recommendedConfig["optimal_value"].get("additional_objectives", []):
+        recommendedConfigReply.additional_optimal_values.add(objective_function=objective["name"],
+                                                             value=objective["value"],
+                                                             value_type=objective["value_type"])
+
+    for tunable in recommendedConfig["optimal_value"]["tunables"]:
+        tunableConfig : TunableConfig = TunableConfig()
+        tunableConfig.name = tunable["name"]
+        set_tunable_value(tunableConfig, tunable["value"])
+        tunableConfig.value_type = tunable["value_type"]
+        recommendedConfigReply.tunables.append(tunableConfig)
+
+
+def add_tunable_configs(configs, trial_json_object):
+    """Append the tunable values of a trial json object to a repeated TunableConfig field."""
+    for config in trial_json_object:
+        tunable: hpo_pb2.TunableConfig = configs.add()
+        tunable.name = config['tunable_name']
+        set_tunable_value(tunable, config['tunable_value'])
+        logger.debug("{}: {}".format(tunable.name, config['tunable_value']))
+
+
+def set_tunable_value(tunableConfig, value):
+    """Set the typed value of a TunableConfig, and its float value for clients reading numbers from it."""
+    if isinstance(value, str):
+        tunableConfig.string_value = value
+    elif isinstance(value, int):
+        tunableConfig.int_value = value
+        tunableConfig.value = value
+    else:
+        tunableConfig.double_value = value
+        tunableConfig.value = value
+
+
+def search_space_tunables(tunableMessages) -> list:
+    """Return the tunables of the search space from the ExperimentDetails.Tunable messages of a new experiment."""
+    tunables = []
+    value_types = {}
+    for tunableMessage in tunableMessages:
+        tunable = {"name": tunableMessage.name, "value_type": tunableMessage.value_type}
+        if tunableMessage.value_type == "categorical":
+            tunable["choices"] = list(tunableMessage.choices)
+        elif tunableMessage.value_type == "integer":
+            tunable["lower_bound"] = int(tunableMessage.lower_bound)
+            tunable["upper_bound"] = int(tunableMessage.upper_bound)
+            tunable["step"] = int(tunableMessage.step)
+        else:
+            # the float bounds, and a step a client computed as a float, read back with the precision they were sent
+            # with, e.g. 0.1 instead of 0.10000000149
+            tunable["lower_bound"] = shortest_float(tunableMessage.lower_bound)
+            tunable["upper_bound"] = shortest_float(tunableMessage.upper_bound)
+            tunable["step"] = shortest_float(tunableMessage.step)
+        if tunableMessage.log:
+            tunable["log"] = True
+        if tunableMessage.HasField("condition"):
+            # condition values are sent as strings, compare them with the values of the tunable they refer to
+            value_type = value_types.get(tunableMessage.condition.tunable)
+            if value_type == "integer":
+                values = [int(value) for value in tunableMessage.condition.values]
+            elif value_type == "double":
+                values = [float(value) for value in tunableMessage.condition.values]
+            else:
+                values = list(tunableMessage.condition.values)
+            tunable["condition"] = {"tunable": tunableMessage.condition.tunable, "values": values}
+        value_types[tunableMessage.name] = tunableMessage.value_type
+        tunables.append(tunable)
+    return tunables
+
+
+def add_tunable_messages(tunableMessages, tunables):
+    """Append the tunables of a search space to a repeated ExperimentDetails.Tunable field."""
+    for tunable in tunables:
+        tunableMessage: hpo_pb2.ExperimentDetails.Tunable = tunableMessages.add()
+        tunableMessage.name = tunable["name"]
+        tunableMessage.value_type = tunable["value_type"]
+        if "choices" in tunable:
+            tunableMessage.choices.extend(str(choice) for choice in tunable["choices"])
+        if "lower_bound" in tunable:
+            tunableMessage.lower_bound = tunable["lower_bound"]
+            tunableMessage.upper_bound = tunable["upper_bound"]
+        if "step" in tunable:
+            tunableMessage.step = tunable["step"]
+        tunableMessage.log = tunable.get("log", False)
+        if "condition" in tunable:
+            tunableMessage.condition.tunable = tunable["condition"]["tunable"]
+            tunableMessage.condition.values.extend(str(value) for value in tunable["condition"]["values"])
+
+
+def warm_start_dict(warmStart: hpo_pb2.WarmStart) -> dict:
+    """Return the warm start option of a new experiment from a WarmStart message."""
+    warm_start = {}
+    # enqueue_best is 0 when it is not set
+    if warmStart.enqueue_best:
+        warm_start["enqueue_best"] = warmStart.enqueue_best
+    if warmStart.experiment_name:
+        warm_start["experiment_name"] = warmStart.experiment_name
+    if warmStart.trials:
+        warm_start["trials"] = []
+        for trial in warmStart.trials:
+            prior_trial = {"config": [{"tunable_name": tunable.name, "tunable_value": get_tunable_value(tunable)}
+                                      for tunable in trial.config],
+                           "result_value": trial.result_value}
+            if trial.additional_result_values:
+                prior_trial["additional_result_values"] = list(trial.additional_result_values)
+            warm_start["trials"].append(prior_trial)
+    return warm_start
+
+
+def pruner_dict(prunerMessage: hpo_pb2.Pruner) -> dict:
+    """Return the pruner option of a new experiment from a Pruner message, with integral parameters as int."""
+    pruner = {"type": prunerMessage.type}
+    for param, value in prunerMessage.params.items():
+        pruner[param] = int(value) if value.is_integer() else value
+    return pruner
+
+
+def set_pruner(prunerMessage: hpo_pb2.Pruner, pruner):
+    prunerMessage.type = pruner["type"]
+    for param, value in pruner.items():
+        if param != "type":
+            prunerMessage.params[param] = value
+
+
+def sampler_params_dict(samplerParams) -> dict:
+    """Return the sampler_params option of a new experiment, parsing every value as JSON if it is valid JSON."""
+    sampler_params = {}
+    for param, value in samplerParams.items():
+        try:
+            sampler_params[param] = json.loads(value)
+        except ValueError:
+            sampler_params[param] = value
+    return sampler_params
+
+
+def set_sampler_params(samplerParams, sampler_params):
+    for param, value in sampler_params.items():
+        samplerParams[param] = value if isinstance(value, str) else json.dumps(value)
+
+
+def shortest_float(value) -> float:
+    """
+    Return the shortest decimal that rounds to the same 32-bit float as value. A value that is not a 32-bit float, e.g. a
+    double sent with its full precision, is returned as is.
+    """
+    try:
+        packed = struct.pack('<f', value)
+    except OverflowError:
+        return value
+    if struct.unpack('<f', packed)[0] != value:
+        return value
+    for precision in range(6, 10):
+        rounded = float('{0:.{1}g}'.format(value, precision))
+        if struct.pack('<f', rounded) == packed:
+            return rounded
+    return value
+
+
+# REST trial result status of each ExperimentTrialResult.Result
+TRIAL_RESULTS = {
+    hpo_pb2.ExperimentTrialResult.SUCCESS: "success",
+    hpo_pb2.ExperimentTrialResult.FAILURE: "failure",
+    hpo_pb2.ExperimentTrialResult.PRUNE: "prune"
+}
+TRIAL_RESULT_MESSAGES = {trial_result: result for result, trial_result in TRIAL_RESULTS.items()}
+# queued once the client of a TrialLoop stream stops sending requests
+END_OF_REQUESTS = object()
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Observe the duration of every unary RPC by method. Streams are left out, they last as long as the client wants."""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        behavior = handler.unary_unary
+
+        def observed(request, context):
+            start = time.perf_counter()
+            try:
+                return behavior(request, context)
+            finally:
+                metrics.GRPC_REQUEST_DURATION.observe(time.perf_counter() - start, method)
+
+        return grpc.unary_unary_rpc_method_handler(observed, request_deserializer=handler.request_deserializer,
+                                                   response_serializer=handler.response_serializer)
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """MetricsInterceptor for the asyncio server."""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        behavior = handler.unary_unary
+
+        async def observed(request, context):
+            start = time.perf_counter()
+            try:
+                return await behavior(request, context)
+            finally:
+                metrics.GRPC_REQUEST_DURATION.observe(time.perf_counter() - start, method)
+
+        return grpc.unary_unary_rpc_method_handler(observed, request_deserializer=handler.request_deserializer,
+                                                   response_serializer=handler.response_serializer)
+
+
+def server_options():
+    maxStreams = int(os.environ.get(HPOSupportedTypes.GRPC_MAX_CONCURRENT_STREAMS_ENV,
+                                    HPOSupportedTypes.GRPC_MAX_CONCURRENT_STREAMS))
+    maxMessageSize = int(os.environ.get(HPOSupportedTypes.GRPC_MAX_MESSAGE_SIZE_ENV,
+                                        HPOSupportedTypes.GRPC_MAX_MESSAGE_SIZE))
+    return [("grpc.max_concurrent_streams", maxStreams),
+            ("grpc.max_send_message_length", maxMessageSize),
+            ("grpc.max_receive_message_length", maxMessageSize)]
+
 
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    server_port = int(os.environ.get(HPOSupportedTypes.GRPC_PORT_ENV, HPOSupportedTypes.GRPC_PORT))
+    workers = int(os.environ.get(HPOSupportedTypes.GRPC_WORKERS_ENV, HPOSupportedTypes.GRPC_WORKERS))
+    if os.environ.get(HPOSupportedTypes.GRPC_SERVER_ENV, HPOSupportedTypes.GRPC_SERVER) == "aio":
+        asyncio.run(serve_aio(server_port, workers))
+        return
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers), options=server_options(),
+                         interceptors=[MetricsInterceptor()])
     hpo_pb2_grpc.add_HpoServiceServicer_to_server(HpoService(), server)
     server.add_insecure_port(host_name + ':' + str(server_port))
-    logger.info("Starting gRPC server at http://%s:%s" % (host_name, server_port))
+    logger.info("Starting gRPC server at http://%s:%s with %s workers" % (host_name, server_port, workers))
 
     server.start()
     server.wait_for_termination()
 
 
+async def serve_aio(server_port, workers):
+    server = grpc.aio.server(options=server_options(), interceptors=[AsyncMetricsInterceptor()])
+    executor = futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grpc")
+    hpo_pb2_grpc.add_HpoServiceServicer_to_server(AsyncHpoService(executor), server)
+    server.add_insecure_port(host_name + ':' + str(server_port))
+    logger.info("Starting asyncio gRPC server at http://%s:%s with %s workers" % (host_name, server_port, workers))
+
+    await server.start()
+    await server.wait_for_termination()
+
+
 if __name__ == '__main__':
     logging.basicConfig()
     serve()
@@ -14,11 +14,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import os
 import threading
-import json
+from concurrent import futures
 from bayes_optuna import optuna_hpo
 from exceptions import ExperimentNotFoundError
 from logger import get_logger
+import metrics
+from plot_cache import PlotCache
 from utils import HPOErrorConstants, HPOSupportedTypes, HPOMessages
 
 logger = get_logger(__name__)
@@ -29,125 +32,242 @@ class HpoService:
     optimized configurations
     """
 
-    def __init__(self):
+    def __init__(self, storage_url=None):
+        # experiments is replaced, never modified in place: lookups read the current dict without locking, while
+        # creating and deleting experiments copy it under expStateLock and publish the copy.
         self.experiments = {}
-        self.expStateCond = threading.Condition()  #We might weant a more fine grained locking mechanism, e.g.readerwriterlock
+        self.expStateLock = threading.Lock()
+        self.storage = optuna_hpo.create_storage(storage_url)
+        self.plotCache = PlotCache(int(os.environ.get(HPOSupportedTypes.PLOT_CACHE_SIZE_ENV,
+                                                      HPOSupportedTypes.PLOT_CACHE_SIZE)))
+        # starts experiments created in async mode
+        self.startExecutor = futures.ThreadPoolExecutor(max_workers=HPOSupportedTypes.START_WORKERS,
+                                                        thread_name_prefix="start")
+
+    def recoverExperiments(self):
+        """Reload the experiments persisted in storage, e.g. after the service was restarted."""
+        if self.storage is None:
+            return
+        for experiment in optuna_hpo.recover_experiments(self.storage):
+            try:
+                metrics.acquire(self.expStateLock, "expStateLock")
+                experiments = dict(self.experiments)
+                experiments[experiment.experiment_name] = experiment
+                self.experiments = experiments
+            finally:
+                self.expStateLock.release()
 
     def newExperiment(self, id_, experiment_name, total_trials, parallel_trials, direction, hpo_algo_impl,
-                      objective_function, tunables, value_type):
+                      objective_function, tunables, value_type, warm_start=None, early_stopping=None, pruner=None,
+                      sampler_params=None, additional_objectives=None, sampler_history=None):
+        """
+        Create an experiment. warm_start optionally seeds the study with the completed trials of the experiment named
+        by its "experiment_name", or with its uploaded "trials", and runs the configs of the "enqueue_best" best of them
+        again first. early_stopping optionally holds the criteria to stop the experiment before total_trials, pruner
+        the pruner deciding on intermediate values whether to stop a trial early and sampler_params the keyword
+        arguments of the sampler of hpo_algo_impl. additional_objectives lists the objectives optimized along with
+        objective_function. sampler_history optionally bounds the finished trials the sampler learns from.
+        """
         try:
-            self.expStateCond.acquire()
+            metrics.acquire(self.expStateLock, "expStateLock")
+            # checked under the lock so that concurrent requests cannot create the same experiment twice
+            if experiment_name in self.experiments:
+                logger.error(HPOErrorConstants.EXPERIMENT_EXISTS)
+                return HPOErrorConstants.EXPERIMENT_EXISTS
             trial_details = optuna_hpo.TrialDetails()
-            self.experiments[experiment_name] = optuna_hpo.HpoExperiment(experiment_name, total_trials, parallel_trials,
-                                                                     direction, hpo_algo_impl, id_, objective_function,
-                                                                     tunables, value_type, trial_details)
+            experiment = optuna_hpo.HpoExperiment(experiment_name, total_trials, parallel_trials, direction,
+                                                  hpo_algo_impl, id_, objective_function, tunables, value_type,
+                                                  trial_details, self.storage, early_stopping, pruner,
+                                                  sampler_params, additional_objectives, sampler_history)
+            if warm_start:
+                if "experiment_name" in warm_start:
+                    source: optuna_hpo.HpoExperiment = self.experiments.get(warm_start["experiment_name"])
+                    if source is None:
+                        logger.error(HPOErrorConstants.WARM_START_NOT_FOUND)
+                        return HPOErrorConstants.WARM_START_NOT_FOUND
+                    warm_start_trials = source.get_trial_history()
+                else:
+                    warm_start_trials = warm_start["trials"]
+                experiment.set_warm_start(warm_start_trials, warm_start.get("enqueue_best", 0))
+            experiments = dict(self.experiments)
+            experiments[experiment_name] = experiment
+            self.experiments = experiments
         finally:
-            self.expStateCond.release()
+            self.expStateLock.release()
 
     def deleteExperiment(self, experiment_name):
         try:
-            self.expStateCond.acquire()
-            if self.containsExperiment(experiment_name):
-                experiment: optuna_hpo.HpoExperiment = self.experiments[experiment_name]
-                del self.experiments[experiment_name]
-                experiment.delete()
+            metrics.acquire(self.expStateLock, "expStateLock")
+            experiments = dict(self.experiments)
+            experiment: optuna_hpo.HpoExperiment = experiments.pop(experiment_name, None)
+            self.experiments = experiments
         finally:
-            self.expStateCond.release()
+            self.expStateLock.release()
 
-    def startExperiment(self, name):
-        try:
-            self.expStateCond.acquire()
-            experiment: optuna_hpo.HpoExperiment = self.experiments.get(name)
-        finally:
-            self.expStateCond.release()
+        if experiment is not None:
+            experiment.delete()
+            self.plotCache.evict(experiment_name)
+
+    def startExperiment(self, name, wait=True):
+        """
+        Start an experiment. By default, this returns once the first trial config is available, or with an error message
+        if the experiment could not be started, in which case the experiment is removed. With wait=False, the
+        experiment is started in the background and the caller polls isExperimentStarting() for readiness.
+        """
+        experiment: optuna_hpo.HpoExperiment = self.experiments.get(name)
+        if not wait:
+            self.startExecutor.submit(self._startExperiment, experiment)
+            return
 
-        started: threading.Condition = experiment.start()
         try:
-            started.acquire()
-            value = started.wait(10)  # wait with timeout of 10s
-        finally:
-            started.release()
-        # check experiment-start status, it will be timed out if the response is delayed from the implemented algo
-        # for more than 10 seconds .
-        if not value:
-            logger.error(HPOErrorConstants.EXPERIMENT_TIMED_OUT)
-            return HPOErrorConstants.EXPERIMENT_TIMED_OUT
+            experiment.start()
+        except Exception as e:
+            logger.error(HPOErrorConstants.EXPERIMENT_START_ERROR + " " + str(e))
+            self.deleteExperiment(name)
+            return HPOErrorConstants.EXPERIMENT_START_ERROR + " " + str(e)
 
-    def containsExperiment(self, name):
-        result = False
+    def _startExperiment(self, experiment: optuna_hpo.HpoExperiment):
         try:
-            self.expStateCond.acquire()
-            if self.experiments is not None or self.experiments:
-                result = name in self.experiments.keys()
-        finally:
-            self.expStateCond.release()
+            experiment.start()
+        except Exception as e:
+            logger.error(HPOErrorConstants.EXPERIMENT_START_ERROR + " " + str(e))
+
+    def isExperimentStarting(self, name):
+        """Return True while an experiment started in async mode has not yet sampled its first trial config."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.isStarting()
+
+    def getStartError(self, name):
+        """Return the error message if an experiment could not be started, None otherwise."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.getStartError()
 
-        return result
+    def containsExperiment(self, name):
+        return name in self.experiments
 
     def doesNotContainExperiment(self, name):
         return not self.containsExperiment(name)
 
     def getExperimentsList(self):
-        try:
-            self.expStateCond.acquire()
-            expKeys = self.experiments.keys()
-        finally:
-            self.expStateCond.release()
+        return list(self.experiments.keys())
 
-        return expKeys
+    def getExperimentsStatus(self):
+        """
+        Return the name and status of every experiment, in the order the experiments were created, and why it stopped
+        early if it did.
+        """
+        experimentsStatus = []
+        for experiment in self.experiments.values():
+            experimentStatus = {"experiment_name": experiment.experiment_name, "status": experiment.status}
+            if experiment.stopReason is not None:
+                experimentStatus["stop_reason"] = experiment.stopReason
+            experimentsStatus.append(experimentStatus)
+        return experimentsStatus
 
     def getExperiment(self, name) -> optuna_hpo.HpoExperiment:
-        if self.doesNotContainExperiment(name):
+        experiment = self.experiments.get(name)
+        if experiment is None:
             logger.error(HPOErrorConstants.EXPERIMENT_NOT_FOUND)
             raise ExperimentNotFoundError
-        try:
-            self.expStateCond.acquire()
-            expname = self.experiments.get(name)
-        finally:
-            self.expStateCond.release()
-
-        return expname
+        return experiment
 
     def get_trial_number(self, name):
+        """Return the number of the most recently started trial."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.getTrialNumber()
 
+    def is_trial_pending(self, name, trial_number):
+        """Return True if the trial has been started and is still waiting for its result."""
         experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
-        """Return the trial number."""
-        if experiment.hpo_algo_impl in ("optuna_tpe", "optuna_tpe_multivariate", "optuna_skopt"):
-            try:
-                experiment.resultsAvailableCond.acquire()
-                trial_number = experiment.trialDetails.trial_number
-            finally:
-                experiment.resultsAvailableCond.release()
-        return trial_number
+        return experiment.getPendingTrial(trial_number) is not None
+
+    def get_trial_config(self, name, trial_number):
+        """Return the tunable values of a pending trial, as listed in its trial json object, or None."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.getTrialConfig(trial_number)
 
-    def get_trial_json_object(self, id_):
+    def get_trial_json_object(self, id_, trial_number=None):
+        """
+        Return the trial json object of the given trial, or of the most recently started trial. None if the given trial
+        is not pending, e.g. because its result arrived since it was validated.
+        """
         experiment: optuna_hpo.HpoExperiment = self.getExperiment(id_)
-        """Return the trial json object."""
-        if experiment.hpo_algo_impl in ("optuna_tpe", "optuna_tpe_multivariate", "optuna_skopt"):
-            try:
-                experiment.resultsAvailableCond.acquire()
-                trialConfig = json.dumps(experiment.trialDetails.trial_json_object)
-            finally:
-                experiment.resultsAvailableCond.release()
-            return trialConfig
+        return experiment.getTrialJsonObject(trial_number)
 
-    def set_result(self, id_, trial_result, result_value_type, result_value):
+    def validate_additional_result_values(self, name, trial_result, additional_result_values):
+        """Return an error message unless a successful result has a value for every additional objective."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.validate_additional_result_values(trial_result, additional_result_values)
+
+    def set_result(self, id_, trial_number, trial_result, result_value_type, result_value,
+                   additional_result_values=None):
+        """Tell the result of a trial to the study, which then asks for the next trial."""
         experiment: optuna_hpo.HpoExperiment = self.getExperiment(id_)
-        """Set the details of a trial."""
-        if experiment.hpo_algo_impl in ("optuna_tpe", "optuna_tpe_multivariate", "optuna_skopt"):
-            try:
-                experiment.resultsAvailableCond.acquire()
-                experiment.trialDetails.trial_result = trial_result
-                experiment.trialDetails.result_value_type = result_value_type
-                experiment.trialDetails.result_value = result_value
-                experiment.resultsAvailableCond.notify()
-            finally:
-                experiment.resultsAvailableCond.release()
+        experiment.tell(trial_number, trial_result, result_value_type, result_value, additional_result_values)
+
+    def is_multi_objective(self, name):
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.isMultiObjective()
+
+    def get_pareto_front(self, name):
+        """Return the trials of the Pareto front of the experiment, ordered by their objective_function value."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.get_pareto_front()
+
+    def get_pending_trials(self, name):
+        """Return the number and config of every trial of the experiment that is waiting for its result."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return [{"trial_number": trialDetails.trial_number, "config": trialDetails.trial_json_object}
+                for trialDetails in experiment.getPendingTrialsAfter(-1)]
+
+    def get_trial_records(self, name, offset, limit):
+        """Return the number of finished trials of the experiment and `limit` of them from `offset` on."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.get_trial_records(offset, limit)
+
+    def get_timing_report(self, name):
+        """Return where the time of every finished trial of the experiment went, and its profile if it is profiled."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.get_timing_report()
+
+    def report_result(self, name, trial_number, step, result_value):
+        """Report an intermediate value of a pending trial, return True if the trial has been pruned."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return bool(experiment.report(trial_number, step, result_value))
+
+    def get_trial_batch(self, name, count):
+        """Return the numbers and trial json objects of up to `count` trials to run, see HpoExperiment.ask_batch."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.get_trial_batch(count)
+
+    def set_results(self, id_, results):
+        """Tell the results of several trials to the study, in the order they are given."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(id_)
+        experiment.tell_batch(results)
+
+    def get_plot(self, name, plot_type) -> bytes:
+        """Return the html of a plot of the experiment, rendering it only if it is not cached for the current trials."""
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        version = experiment.study_version()
+        plot = self.plotCache.get(name, plot_type, version)
+        if plot is None:
+            with metrics.PLOT_DURATION.time(plot_type):
+                plot = experiment.generate_plot(plot_type).encode('utf-8')
+            self.plotCache.put(name, plot_type, version, plot)
+        return plot
+
+    def get_importance(self, name, refresh=False):
+        """
+        Return the number of finished trials the tunable importance was evaluated for and the importance of each
+        tunable. With refresh, importance is evaluated again if trials have finished since it was last evaluated.
+        """
+        experiment: optuna_hpo.HpoExperiment = self.getExperiment(name)
+        return experiment.get_importance(refresh)
 
     def get_recommended_config(self, id_):
         experiment: optuna_hpo.HpoExperiment = self.getExperiment(id_)
         try:
-            experiment.resultsAvailableCond.acquire()
+            metrics.acquire(experiment.resultsAvailableCond, "resultsAvailableCond")
             recommendedConfig = experiment.recommended_config
         finally:
             experiment.resultsAvailableCond.release()
@@ -155,4 +275,12 @@ class HpoService:
         return recommendedConfig
 
 
-instance: HpoService = HpoService()
+instance: HpoService = HpoService(os.environ.get(HPOSupportedTypes.STORAGE_ENV))
+
+# read without locking when /metrics is requested, experiments is replaced rather than modified in place
+metrics.Gauge("hpo_experiments", "Number of experiments, including finished ones.",
+              lambda: len(instance.experiments))
+metrics.Gauge("hpo_experiments_running", "Number of experiments that have not finished.",
+              lambda: sum(1 for experiment in instance.experiments.values() if not experiment.hasFinished()))
+metrics.Gauge("hpo_trials_running", "Number of trials waiting for their result.",
+              lambda: sum(len(experiment.pendingTrials) for experiment in instance.experiments.values()))
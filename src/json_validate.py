@@ -1,5 +1,6 @@
 import jsonschema
 from jsonschema import validate, draft7_format_checker
+from bayes_optuna import samplers
 from utils import HPOSupportedTypes, HPOErrorConstants
 from logger import get_logger
 
@@ -27,6 +28,7 @@ result_trial_schema = {
         "trial_result": {"type": "string"},
         "result_value_type": {"type": "string"},
         "result_value": {"type": "number"},
+        "additional_result_values": {"type": "array", "items": {"type": "number"}},
         "operation": {
             "enum": [
                 "EXP_TRIAL_RESULT"
@@ -37,6 +39,68 @@ result_trial_schema = {
     "additionalProperties": False
 }
 
+intermediate_result_trial_schema = {
+    "type": "object",
+    "properties": {
+        "experiment_name": {"type": "string"},
+        "trial_number": {"type": "integer"},
+        "step": {"type": "integer"},
+        "result_value_type": {"type": "string"},
+        "result_value": {"type": "number"},
+        "operation": {
+            "enum": [
+                "EXP_TRIAL_INTERMEDIATE_RESULT"
+            ]
+        }
+    },
+    "required": ["experiment_name", "trial_number", "step", "result_value_type", "result_value", "operation"],
+    "additionalProperties": False
+}
+
+batch_trial_generate_schema = {
+    "type": "object",
+    "properties": {
+        "experiment_name": {"type": "string"},
+        "count": {"type": "integer"},
+        "operation": {
+            "enum": [
+                "EXP_TRIAL_GENERATE_BATCH"
+            ]
+        }
+    },
+    "required": ["experiment_name", "count", "operation"],
+    "additionalProperties": False
+}
+
+batch_result_trial_schema = {
+    "type": "object",
+    "properties": {
+        "experiment_name": {"type": "string"},
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "trial_number": {"type": "integer"},
+                    "trial_result": {"type": "string"},
+                    "result_value_type": {"type": "string"},
+                    "result_value": {"type": "number"},
+                    "additional_result_values": {"type": "array", "items": {"type": "number"}}
+                },
+                "required": ["trial_number", "trial_result", "result_value_type", "result_value"],
+                "additionalProperties": False
+            }
+        },
+        "operation": {
+            "enum": [
+                "EXP_TRIAL_RESULT_BATCH"
+            ]
+        }
+    },
+    "required": ["experiment_name", "results", "operation"],
+    "additionalProperties": False
+}
+
 delete_experiment_schema = {
     "type": "object",
     "properties": {
@@ -68,6 +132,16 @@ trial_generate_schema = {
                 "experiment_id": {"type": "string"},
                 "value_type": {"type": "string"},
                 "hpo_algo_impl": {"type": "string"},
+                "sampler_params": {"type": "object"},
+                "sampler_history": {
+                    "type": "object",
+                    "properties": {
+                        "window": {"type": "integer"},
+                        "top_k": {"type": "integer"},
+                        "random": {"type": "integer"}
+                    },
+                    "additionalProperties": False
+                },
                 "objective_function": {"type": "string"},
                 "function_variables": {
                     "type": "array",
@@ -76,19 +150,95 @@ trial_generate_schema = {
                 },
                 "tunables": {
                     "type": "array",
-                    "value_type": {"type": "string"},
-                    "name": {"type": "string"},
-                    "lower_bound": {"type": "number"},
-                    "upper_bound": {"type": "number"},
-                    "step": {"type": "number"},
-                    "choices": {"type": "array"}
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "value_type": {"type": "string"},
+                            "name": {"type": "string"},
+                            "lower_bound": {"type": "number"},
+                            "upper_bound": {"type": "number"},
+                            "step": {"type": "number"},
+                            "choices": {"type": "array"},
+                            "log": {"type": "boolean"},
+                            "condition": {
+                                "type": "object",
+                                "properties": {
+                                    "tunable": {"type": "string"},
+                                    "values": {"type": "array", "minItems": 1}
+                                },
+                                "required": ["tunable", "values"],
+                                "additionalProperties": False
+                            }
+                        }
+                    }
+                },
+                "additional_objectives": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "objective_function": {"type": "string"},
+                            "direction": {"type": "string"}
+                        },
+                        "required": ["objective_function", "direction"],
+                        "additionalProperties": False
+                    }
+                },
+                "early_stopping": {
+                    "type": "object",
+                    "properties": {
+                        "patience": {"type": "integer"},
+                        "min_delta": {"type": "number"},
+                        "max_duration": {"type": "number"}
+                    },
+                    "additionalProperties": False
+                },
+                "pruner": {
+                    "type": "object",
+                    "properties": {
+                        "type": {"type": "string"}
+                    },
+                    "required": ["type"],
+                    "additionalProperties": {"type": "number"}
+                },
+                "warm_start": {
+                    "type": "object",
+                    "properties": {
+                        "experiment_name": {"type": "string"},
+                        "trials": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "config": {
+                                        "type": "array",
+                                        "items": {
+                                            "type": "object",
+                                            "properties": {
+                                                "tunable_name": {"type": "string"},
+                                                "tunable_value": {}
+                                            },
+                                            "required": ["tunable_name", "tunable_value"],
+                                            "additionalProperties": False
+                                        }
+                                    },
+                                    "result_value": {"type": "number"},
+                                    "additional_result_values": {"type": "array", "items": {"type": "number"}}
+                                },
+                                "required": ["config", "result_value"]
+                            }
+                        },
+                        "enqueue_best": {"type": "integer"}
+                    },
+                    "additionalProperties": False
                 },
                 "direction": {"type": "string"}
             },
             "required": ["experiment_name", "experiment_id", "total_trials", "objective_function", "tunables",
                          "direction"],
             "additionalProperties": False
-        }
+        },
+        "async": {"type": "boolean"}
     },
     "required": ["search_space", "operation"],
     "additionalProperties": False
@@ -108,6 +258,21 @@ def validate_trial_generate_json(trial_generate_json):
                      format_checker=draft7_format_checker)
         elif trial_generate_json["operation"] == "EXP_TRIAL_RESULT":
             validate(instance=trial_generate_json, schema=result_trial_schema, format_checker=draft7_format_checker)
+        elif trial_generate_json["operation"] == "EXP_TRIAL_INTERMEDIATE_RESULT":
+            validate(instance=trial_generate_json, schema=intermediate_result_trial_schema,
+                     format_checker=draft7_format_checker)
+            if trial_generate_json["step"] < 0:
+                errorMsg = HPOErrorConstants.INVALID_STEP
+        elif trial_generate_json["operation"] == "EXP_TRIAL_GENERATE_BATCH":
+            validate(instance=trial_generate_json, schema=batch_trial_generate_schema,
+                     format_checker=draft7_format_checker)
+            if trial_generate_json["count"] < 1:
+                errorMsg = HPOErrorConstants.INVALID_BATCH_SIZE
+        elif trial_generate_json["operation"] == "EXP_TRIAL_RESULT_BATCH":
+            validate(instance=trial_generate_json, schema=batch_result_trial_schema,
+                     format_checker=draft7_format_checker)
+            if not trial_generate_json["results"]:
+                errorMsg = HPOErrorConstants.INVALID_BATCH_SIZE
         elif trial_generate_json["operation"] == "EXP_DELETE":
             validate(instance=trial_generate_json, schema=delete_experiment_schema, format_checker=draft7_format_checker)
         elif not str(trial_generate_json["operation"]) or not str(trial_generate_json["operation"]).strip() or \
@@ -119,7 +284,8 @@ def validate_trial_generate_json(trial_generate_json):
         return errorMsg
     except jsonschema.exceptions.ValidationError as err:
         property_absolute_path = err.absolute_path
-        property_name = property_absolute_path[1]
+        # the innermost property, e.g. a field of one of the results of a batch
+        property_name = str(property_absolute_path[-1]) if property_absolute_path else ""
         # Check if the exception is due to parameters data type mismatch and prepare the response accordingly
         if any(word in err.message for word in HPOErrorConstants.JSON_NULL_VALUES):
             errorMsg = "Parameter " + property_name + " " + err.message
@@ -146,16 +312,145 @@ def validate_search_space(search_space):
         elif str(key) == "total_trials" and search_space[key] < 1:
             validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.INVALID_TOTAL_TRIALS])
 
+        # Check if parallel trials is less than one
+        elif str(key) == "parallel_trials" and search_space[key] < 1:
+            validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.INVALID_PARALLEL_TRIALS])
+
         # Check if the direction is supported
         elif str(key) == "direction" and str(search_space[key]) not in HPOSupportedTypes.DIRECTIONS_SUPPORTED:
             validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.DIRECTION_NOT_SUPPORTED])
 
         # Check if hpo_algo_impl is supported
-        elif str(key) == "hpo_algo_impl" and str(search_space[key]) not in HPOSupportedTypes.ALGOS_SUPPORTED:
+        elif str(key) == "hpo_algo_impl" and str(search_space[key]) not in samplers.SAMPLERS:
             validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.HPO_ALGO_NOT_SUPPORTED])
 
+        # Check if the sampler accepts the sampler parameters
+        elif str(key) == "sampler_params" and \
+                validate_sampler_params(search_space.get("hpo_algo_impl", HPOSupportedTypes.HPO_ALGO), search_space[key]):
+            validationErrorMsg = ",".join([validationErrorMsg, validate_sampler_params(
+                search_space.get("hpo_algo_impl", HPOSupportedTypes.HPO_ALGO), search_space[key])])
+
+        # Check if the sampler history is bounded either by a window or by the best trials
+        elif str(key) == "sampler_history" and validate_sampler_history(search_space[key]):
+            validationErrorMsg = ",".join([validationErrorMsg, validate_sampler_history(search_space[key])])
+
         # Check if value_type is supported
         elif str(key) == "value_type" and str(search_space[key]) not in HPOSupportedTypes.VALUE_TYPES_SUPPORTED:
             validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.VALUE_TYPE_NOT_SUPPORTED])
 
+        # Check if the early stopping criteria are positive
+        elif str(key) == "early_stopping" and validate_early_stopping(search_space[key]):
+            validationErrorMsg = ",".join([validationErrorMsg, validate_early_stopping(search_space[key])])
+
+        # Check if the pruner and its parameters are supported
+        elif str(key) == "pruner" and validate_pruner(search_space[key]):
+            validationErrorMsg = ",".join([validationErrorMsg, validate_pruner(search_space[key])])
+
+        # Check if the directions of the additional objectives are supported, and that trials are not pruned
+        elif str(key) == "additional_objectives" and validate_additional_objectives(search_space[key], search_space):
+            validationErrorMsg = ",".join([validationErrorMsg,
+                                           validate_additional_objectives(search_space[key], search_space)])
+
+        # Check if the warm start refers to either an experiment or a trial history
+        elif str(key) == "warm_start" and validate_warm_start(search_space[key], search_space):
+            validationErrorMsg = ",".join([validationErrorMsg, validate_warm_start(search_space[key], search_space)])
+
+        # Check if the tunables are complete
+        elif str(key) == "tunables" and validate_tunables(search_space[key]):
+            validationErrorMsg = ",".join([validationErrorMsg, validate_tunables(search_space[key])])
+
+    return validationErrorMsg.lstrip(',')
+
+
+def validate_tunables(tunables):
+    validationErrorMsg = ""
+    names = []
+
+    for tunable in tunables:
+        # Check if a categorical tunable has choices to pick from
+        if tunable.get("value_type") == "categorical" and not tunable.get("choices"):
+            validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.MISSING_CHOICES + str(tunable.get("name"))])
+
+        # Check if a conditional tunable depends on one of the values of a tunable listed before it
+        condition = tunable.get("condition")
+        if condition is not None and (not isinstance(condition, dict) or condition.get("tunable") not in names):
+            validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.INVALID_CONDITION + str(tunable.get("name"))])
+        elif condition is not None and (not isinstance(condition.get("values"), list) or not condition["values"]):
+            validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.INVALID_CONDITION_VALUES + str(tunable.get("name"))])
+
+        # Check if a tunable sampled in the log domain has a positive lower bound
+        if tunable.get("log") and not (isinstance(tunable.get("lower_bound"), (int, float)) and tunable["lower_bound"] > 0):
+            validationErrorMsg = ",".join([validationErrorMsg, HPOErrorConstants.INVALID_LOG_BOUND + str(tunable.get("name"))])
+
+        names.append(tunable.get("name"))
+
     return validationErrorMsg.lstrip(',')
+
+
+def validate_warm_start(warm_start, search_space):
+    if ("experiment_name" in warm_start) == ("trials" in warm_start):
+        return HPOErrorConstants.INVALID_WARM_START
+    # the schema lets integral floats such as 2.0 through
+    if "enqueue_best" in warm_start and (not isinstance(warm_start["enqueue_best"], int) or
+                                         warm_start["enqueue_best"] < 1):
+        return HPOErrorConstants.INVALID_WARM_START_ENQUEUE
+    # Check if the warm start trials are configs of the search space with a value for every objective
+    names = [tunable.get("name") for tunable in search_space.get("tunables") or []]
+    objectives = 1 + len(search_space.get("additional_objectives") or [])
+    for trial in warm_start.get("trials", []):
+        for config in trial["config"]:
+            if config["tunable_name"] not in names:
+                return HPOErrorConstants.INVALID_WARM_START_TUNABLE + str(config["tunable_name"])
+        if 1 + len(trial.get("additional_result_values", [])) != objectives:
+            return HPOErrorConstants.INVALID_WARM_START_VALUES
+    return ""
+
+
+def validate_early_stopping(early_stopping):
+    if early_stopping.get("patience", 1) < 1 or early_stopping.get("min_delta", 0) < 0 or \
+            early_stopping.get("max_duration", 1) <= 0:
+        return HPOErrorConstants.INVALID_EARLY_STOPPING
+    return ""
+
+
+def validate_sampler_params(hpo_algo_impl, sampler_params):
+    # an unsupported hpo_algo_impl is reported on its own
+    if hpo_algo_impl not in samplers.SAMPLERS:
+        return ""
+    try:
+        samplers.create_sampler(hpo_algo_impl, sampler_params)
+    except (TypeError, ValueError, AttributeError) as e:
+        return HPOErrorConstants.INVALID_SAMPLER_PARAMS + str(e)
+    return ""
+
+
+def validate_sampler_history(sampler_history):
+    window = sampler_history.get("window")
+    top_k = sampler_history.get("top_k")
+    if (window is None) == (top_k is None) or (window is not None and (window < 1 or "random" in sampler_history)) or \
+            (top_k is not None and (top_k < 1 or sampler_history.get("random", 0) < 0)):
+        return HPOErrorConstants.INVALID_SAMPLER_HISTORY
+    return ""
+
+
+def validate_additional_objectives(additional_objectives, search_space):
+    if any(objective["direction"] not in HPOSupportedTypes.DIRECTIONS_SUPPORTED for objective in additional_objectives):
+        return HPOErrorConstants.DIRECTION_NOT_SUPPORTED
+    # Optuna does not support intermediate values of trials with multiple objectives
+    if additional_objectives and search_space.get("pruner"):
+        return HPOErrorConstants.MULTI_OBJECTIVE_PRUNING
+    # an unsupported hpo_algo_impl is reported on its own
+    hpo_algo_impl = search_space.get("hpo_algo_impl")
+    if additional_objectives and hpo_algo_impl in samplers.SAMPLERS and \
+            hpo_algo_impl not in samplers.MULTI_OBJECTIVE_SAMPLERS:
+        return HPOErrorConstants.MULTI_OBJECTIVE_SAMPLER + str(hpo_algo_impl)
+    return ""
+
+
+def validate_pruner(pruner):
+    if pruner.get("type") not in HPOSupportedTypes.PRUNERS_SUPPORTED:
+        return HPOErrorConstants.PRUNER_NOT_SUPPORTED
+    for param, value in pruner.items():
+        if param != "type" and (param not in HPOSupportedTypes.PRUNERS_SUPPORTED[pruner["type"]] or value < 0):
+            return HPOErrorConstants.INVALID_PRUNER_PARAMETER + param
+    return ""
@@ -0,0 +1,145 @@
+"""
+Copyright (c) 2020, 2022 Red Hat, IBM Corporation and others.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import bisect
+import threading
+import time
+
+# CONTENT_TYPE (str): Content type of the Prometheus text exposition format served at /metrics.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds of the histogram buckets, from lock waits of a few microseconds to plots of several seconds
+DURATION_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# metrics rendered at /metrics, in the order they were created
+registry = []
+
+
+def escape(label_value) -> str:
+    return str(label_value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    A Prometheus histogram of durations in seconds, with one series per value of its label, e.g. one per operation.
+    """
+
+    def __init__(self, name, documentation, label=None, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = buckets
+        # series (dict): Per label value, the count of observations in each bucket, the last one for +Inf, followed by
+        # the sum of the observations.
+        self.series = {}
+        self.lock = threading.Lock()
+        registry.append(self)
+
+    def observe(self, value, label_value=""):
+        try:
+            self.lock.acquire()
+            series = self.series.get(label_value)
+            if series is None:
+                series = self.series[label_value] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+        finally:
+            self.lock.release()
+
+    def time(self, label_value=""):
+        """Return a context manager observing the time spent in its block."""
+        return Timer(self, label_value)
+
+    def render(self) -> list:
+        try:
+            self.lock.acquire()
+            series = {label_value: list(counts) for label_value, counts in self.series.items()}
+        finally:
+            self.lock.release()
+
+        lines = ["# HELP " + self.name + " " + self.documentation, "# TYPE " + self.name + " histogram"]
+        for label_value, counts in sorted(series.items()):
+            labels = self.label + "=\"" + escape(label_value) + "\"," if self.label else ""
+            cumulative = 0
+            for bound, count in zip([str(bucket) for bucket in self.buckets] + ["+Inf"], counts):
+                cumulative += count
+                lines.append(self.name + "_bucket{" + labels + "le=\"" + bound + "\"} " + str(cumulative))
+            labels = "{" + labels.rstrip(",") + "}" if labels else ""
+            lines.append(self.name + "_sum" + labels + " " + repr(counts[-1]))
+            lines.append(self.name + "_count" + labels + " " + str(cumulative))
+        return lines
+
+
+class Timer:
+    # elapsed (float): Seconds spent in the block, once it has exited.
+    elapsed: float = None
+
+    def __init__(self, histogram: Histogram, label_value):
+        self.histogram = histogram
+        self.label_value = label_value
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed = time.perf_counter() - self.start
+        self.histogram.observe(self.elapsed, self.label_value)
+
+
+class Gauge:
+    """A Prometheus gauge whose value is read from a function whenever the metrics are rendered."""
+
+    def __init__(self, name, documentation, function):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+        registry.append(self)
+
+    def render(self) -> list:
+        return ["# HELP " + self.name + " " + self.documentation, "# TYPE " + self.name + " gauge",
+                self.name + " " + str(self.function())]
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def acquire(lock, lock_name) -> float:
+    """Acquire a lock or condition, observing how long it was waited for, and return the seconds waited."""
+    start = time.perf_counter()
+    lock.acquire()
+    waited = time.perf_counter() - start
+    LOCK_WAIT.observe(waited, lock_name)
+    return waited
+
+
+REST_REQUEST_DURATION = Histogram("hpo_rest_request_duration_seconds",
+                                  "Time spent serving REST requests, by operation or path.", "operation")
+GRPC_REQUEST_DURATION = Histogram("hpo_grpc_request_duration_seconds",
+                                  "Time spent serving unary gRPC requests, by method.", "method")
+TRIAL_ASK_DURATION = Histogram("hpo_trial_ask_duration_seconds",
+                               "Time spent asking the sampler for the config of a new trial.")
+TRIAL_TELL_DURATION = Histogram("hpo_trial_tell_duration_seconds",
+                                "Time spent telling the result of a trial to the study.")
+LOCK_WAIT = Histogram("hpo_lock_wait_seconds", "Time spent waiting for a lock, by lock.", "lock")
+IMPORTANCE_DURATION = Histogram("hpo_importance_duration_seconds", "Time spent evaluating tunable importance.")
+PLOT_DURATION = Histogram("hpo_plot_duration_seconds", "Time spent rendering plots, by plot type.", "type")
+THREADS = Gauge("hpo_threads", "Number of live threads.", threading.active_count)
@@ -0,0 +1,69 @@
+"""
+Copyright (c) 2020, 2022 Red Hat, IBM Corporation and others.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class PlotCache:
+    """
+    A least recently used cache of rendered plots, bounded by the total size in bytes of the cached plots.
+
+    Entries are keyed by experiment name, plot type and study version, so a plot is rendered again once more trials
+    have completed.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.plots = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, experiment_name, plot_type, version):
+        key = (experiment_name, plot_type, version)
+        try:
+            self.lock.acquire()
+            plot = self.plots.get(key)
+            if plot is not None:
+                self.plots.move_to_end(key)
+        finally:
+            self.lock.release()
+        return plot
+
+    def put(self, experiment_name, plot_type, version, plot: bytes):
+        if len(plot) > self.max_bytes:
+            return
+        key = (experiment_name, plot_type, version)
+        try:
+            self.lock.acquire()
+            # older versions of the same plot are never requested again
+            for stale_key in [k for k in self.plots if k[:2] == key[:2]]:
+                self.size -= len(self.plots.pop(stale_key))
+            self.plots[key] = plot
+            self.size += len(plot)
+            while self.size > self.max_bytes:
+                _, evicted = self.plots.popitem(last=False)
+                self.size -= len(evicted)
+        finally:
+            self.lock.release()
+
+    def evict(self, experiment_name):
+        try:
+            self.lock.acquire()
+            for key in [k for k in self.plots if k[0] == experiment_name]:
+                self.size -= len(self.plots.pop(key))
+        finally:
+            self.lock.release()
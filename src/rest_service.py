@@ -13,7 +13,13 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import html
+import queue
+import selectors
+import socket
 import threading
+import time
+from concurrent import futures
 from http.server import BaseHTTPRequestHandler, HTTPServer
 import re
 from email.message import EmailMessage
@@ -21,14 +27,16 @@ import json
 import os
 import pathlib
 from json import JSONDecodeError
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, quote
 
+from exceptions import ExperimentNotFoundError, ImportanceUnavailableError
 from json_validate import validate_trial_generate_json
 from tunables import get_all_tunables
 from logger import get_logger
 from utils import HPOErrorConstants, HPOSupportedTypes, HPOMessages
 
 import hpo_service
+import metrics
 
 logger = get_logger(__name__)
 autotune_object_ids = {}
@@ -38,6 +46,10 @@ filePath = pathlib.PurePath(__file__)
 welcome_page = os.path.join(filePath.parents[1], 'index.html')
 experiment_page = os.path.join(filePath.parents[1], 'experiment.html')
 
+# experiment.html is only a template, the experiment table is rendered into it for every /listexperiments request
+with open(experiment_page) as template:
+	experiment_template = template.read()
+
 
 class HTTPRequestHandler(BaseHTTPRequestHandler):
 	"""
@@ -45,24 +57,55 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 
 	The handler will parse the request and the headers, then call a method specific to the request type. The method name
 	is constructed from the request. For example, for the request method GET, the do_GET() method will be called.
+
+	Connections are kept alive between requests (HTTP/1.1) until they have been idle for `timeout` seconds.
 	"""
+	protocol_version = "HTTP/1.1"
+	timeout = HPOSupportedTypes.REST_KEEPALIVE_TIMEOUT
+	# headers and body are written separately, avoid waiting for delayed ACKs on kept alive connections
+	disable_nagle_algorithm = True
 
-	def _set_response(self, status_code, return_value):
+	def _set_response(self, status_code, return_value, content_type='text/html'):
 		# TODO: add status_message
+		if isinstance(return_value, str):
+			return_value = return_value.encode('utf-8')
 		self.send_response(status_code)
-		self.send_header('Content-type', 'text/html')
+		self.send_header('Content-type', content_type)
+		# required to keep the connection alive
+		self.send_header('Content-Length', str(len(return_value)))
 		self.end_headers()
-		self.wfile.write(return_value.encode('utf-8'))
+		self.wfile.write(return_value)
 
 	def do_POST(self):
-		"""Serve a POST request."""
+		"""Serve a POST request, observing its duration by operation."""
+		start = time.perf_counter()
+		# set to the operation of the request once it is valid
+		self.operation = "POST"
+		try:
+			self.handle_post()
+		finally:
+			metrics.REST_REQUEST_DURATION.observe(time.perf_counter() - start, self.operation)
+
+	def do_GET(self):
+		"""Serve a GET request, observing its duration by path."""
+		start = time.perf_counter()
+		path = urlparse(self.path).path
+		try:
+			self.handle_get()
+		finally:
+			metrics.REST_REQUEST_DURATION.observe(time.perf_counter() - start,
+												  path if path in HPOSupportedTypes.GET_PATHS else "GET")
+
+	def handle_post(self):
+		# always consume the body, so that a kept alive connection is left at the start of the next request
+		length = int(self.headers.get('content-length', 0))
+		body = self.rfile.read(length)
 		if re.search(HPOSupportedTypes.API_ENDPOINT + "$", self.path):
 			msg = EmailMessage()
 			msg['content-type'] = self.headers.get('content-type')
 			content_type, params = msg.get_content_type(), msg['content-type'].params
 			if content_type == HPOSupportedTypes.CONTENT_TYPE:
-				length = int(self.headers.get('content-length'))
-				str_object = self.rfile.read(length).decode('utf8')
+				str_object = body.decode('utf8')
 				try:
 					json_object = json.loads(str_object)
 				except JSONDecodeError as jde:
@@ -82,12 +125,19 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 					logger.error(isInvalid)
 					self._set_response(400, isInvalid)
 				else:
+					self.operation = json_object["operation"]
 					if json_object["operation"] == "EXP_TRIAL_GENERATE_NEW":
 						self.handle_generate_new_operation(json_object)
 					elif json_object["operation"] == "EXP_TRIAL_GENERATE_SUBSEQUENT":
 						self.handle_generate_subsequent_operation(json_object)
 					elif json_object["operation"] == "EXP_TRIAL_RESULT":
 						self.handle_result_operation(json_object)
+					elif json_object["operation"] == "EXP_TRIAL_INTERMEDIATE_RESULT":
+						self.handle_intermediate_result_operation(json_object)
+					elif json_object["operation"] == "EXP_TRIAL_GENERATE_BATCH":
+						self.handle_generate_batch_operation(json_object)
+					elif json_object["operation"] == "EXP_TRIAL_RESULT_BATCH":
+						self.handle_result_batch_operation(json_object)
 					elif json_object["operation"] == "EXP_DELETE":
 						self.handle_delete_operation(json_object)
 					else:
@@ -97,8 +147,7 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 		else:
 			self._set_response(404, HPOErrorConstants.NOT_FOUND)
 
-	def do_GET(self):
-		"""Serve a GET request."""
+	def handle_get(self):
 		if re.search(HPOSupportedTypes.API_ENDPOINT, self.path):
 			query = parse_qs(urlparse(self.path).query)
 			if "experiment_name" not in query or "trial_number" not in query:
@@ -111,22 +160,32 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 				logger.error(error_msg)
 				self._set_response(400, error_msg)
 				return
-			if self.validate_experiment_name(query["experiment_name"][0]):
+			experiment = self.lookup_experiment(query["experiment_name"][0])
+			if experiment is None:
 				return
 
-			error_msg = self.validate_trialNumber(query["experiment_name"][0], query["trial_number"][0])
+			error_msg = self.validate_trialNumber(experiment, query["trial_number"][0])
 			if error_msg:
 				self._set_response(400, error_msg)
 			else:
-				logger.info("Experiment_Name = " + str(
-					hpo_service.instance.getExperiment(query["experiment_name"][0]).experiment_name))
-				logger.info("Trial_Number = " + str(
-					hpo_service.instance.getExperiment(query["experiment_name"][0]).trialDetails.trial_number))
-				data = hpo_service.instance.get_trial_json_object(query["experiment_name"][0])
-				self._set_response(200, data)
+				trial_number = int(query["trial_number"][0])
+				logger.info("Experiment_Name = " + query["experiment_name"][0])
+				logger.info("Trial_Number = " + str(trial_number))
+				data = experiment.getTrialJsonObject(trial_number)
+				if data is None:
+					# the result of the trial arrived since it was validated
+					logger.error(HPOErrorConstants.TRIAL_PRECEDES)
+					self._set_response(400, HPOErrorConstants.TRIAL_PRECEDES)
+				else:
+					self._set_response(200, data)
 		elif re.search("/listexperiments", self.path):
-			data = self.listExperiments()
-			self._set_response(200, data)
+			query = parse_qs(urlparse(self.path).query)
+			if "format" in query and query["format"][0] == "json":
+				data = json.dumps(hpo_service.instance.getExperimentsStatus())
+				self._set_response(200, data, HPOSupportedTypes.CONTENT_TYPE)
+			else:
+				data = self.listExperiments()
+				self._set_response(200, data)
 		elif re.search("/plot", self.path):
 			query = parse_qs(urlparse(self.path).query)
 			if "experiment_name" not in query:
@@ -134,24 +193,104 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 				logger.error(error_msg)
 				self._set_response(400, error_msg)
 				return
-			# TODO : Validate plot type
 			if "type" not in query:
 				logger.info("Plot type not defined. Defaulting it to tunable_importance")
 				plot_type = "tunable_importance"
 			else:
 				plot_type = query["type"][0]
+			if plot_type not in HPOSupportedTypes.PLOT_TYPES:
+				logger.error(HPOErrorConstants.INVALID_PLOT_TYPE)
+				self._set_response(400, HPOErrorConstants.INVALID_PLOT_TYPE)
+				return
 
 			error_msg = self.validate_experiment_name(query["experiment_name"][0])
 			if error_msg:
 				self._set_response(400, error_msg)
 			else:
-				logger.info("Experiment_Name = " + str(
-					hpo_service.instance.getExperiment(query["experiment_name"][0]).experiment_name))
+				logger.info("Experiment_Name = " + query["experiment_name"][0])
 				data = self.getPlots(query["experiment_name"][0], plot_type)
 				if data:
 					self._set_response(200, data)
 				else:
 					self._set_response(404, 'Plot Unavailable!')
+		elif re.search("/paretofront", self.path):
+			query = parse_qs(urlparse(self.path).query)
+			if "experiment_name" not in query:
+				error_msg = HPOErrorConstants.MISSING_PARAMETERS
+				logger.error(error_msg)
+				self._set_response(400, error_msg)
+				return
+			if self.validate_experiment_name(query["experiment_name"][0]):
+				return
+			data = {"experiment_name": query["experiment_name"][0],
+					"pareto_front": hpo_service.instance.get_pareto_front(query["experiment_name"][0])}
+			self._set_response(200, json.dumps(data), HPOSupportedTypes.CONTENT_TYPE)
+		elif urlparse(self.path).path == "/pending_trials":
+			query = parse_qs(urlparse(self.path).query)
+			if "experiment_name" not in query:
+				error_msg = HPOErrorConstants.MISSING_PARAMETERS
+				logger.error(error_msg)
+				self._set_response(400, error_msg)
+				return
+			if self.validate_experiment_name(query["experiment_name"][0]):
+				return
+			data = {"experiment_name": query["experiment_name"][0],
+					"pending_trials": hpo_service.instance.get_pending_trials(query["experiment_name"][0])}
+			self._set_response(200, json.dumps(data), HPOSupportedTypes.CONTENT_TYPE)
+		elif urlparse(self.path).path == "/trials":
+			query = parse_qs(urlparse(self.path).query)
+			if "experiment_name" not in query:
+				error_msg = HPOErrorConstants.MISSING_PARAMETERS
+				logger.error(error_msg)
+				self._set_response(400, error_msg)
+				return
+			if self.validate_experiment_name(query["experiment_name"][0]):
+				return
+			try:
+				offset = int(query.get("offset", [0])[0])
+				limit = int(query.get("limit", [HPOSupportedTypes.TRIAL_HISTORY_LIMIT])[0])
+			except ValueError:
+				offset = limit = -1
+			if offset < 0 or not 1 <= limit <= HPOSupportedTypes.TRIAL_HISTORY_MAX_LIMIT:
+				error_msg = HPOErrorConstants.INVALID_PAGE + str(HPOSupportedTypes.TRIAL_HISTORY_MAX_LIMIT)
+				logger.error(error_msg)
+				self._set_response(400, error_msg)
+				return
+			total, trials = hpo_service.instance.get_trial_records(query["experiment_name"][0], offset, limit)
+			data = {"experiment_name": query["experiment_name"][0], "total": total, "offset": offset,
+					"limit": limit, "trials": trials}
+			self._set_response(200, json.dumps(data), HPOSupportedTypes.CONTENT_TYPE)
+		elif re.search("/timing", self.path):
+			query = parse_qs(urlparse(self.path).query)
+			if "experiment_name" not in query:
+				error_msg = HPOErrorConstants.MISSING_PARAMETERS
+				logger.error(error_msg)
+				self._set_response(400, error_msg)
+				return
+			if self.validate_experiment_name(query["experiment_name"][0]):
+				return
+			data = {"experiment_name": query["experiment_name"][0],
+					**hpo_service.instance.get_timing_report(query["experiment_name"][0])}
+			self._set_response(200, json.dumps(data), HPOSupportedTypes.CONTENT_TYPE)
+		elif re.search("/importance", self.path):
+			query = parse_qs(urlparse(self.path).query)
+			if "experiment_name" not in query:
+				error_msg = HPOErrorConstants.MISSING_PARAMETERS
+				logger.error(error_msg)
+				self._set_response(400, error_msg)
+				return
+			if self.validate_experiment_name(query["experiment_name"][0]):
+				return
+			refresh = "refresh" in query and query["refresh"][0].lower() == "true"
+			try:
+				trials, importance = hpo_service.instance.get_importance(query["experiment_name"][0], refresh)
+			except ImportanceUnavailableError as e:
+				self._set_response(400, str(e))
+				return
+			data = {"experiment_name": query["experiment_name"][0], "trials": trials, "tunable_importance": importance}
+			self._set_response(200, json.dumps(data), HPOSupportedTypes.CONTENT_TYPE)
+		elif self.path == "/metrics":
+			self._set_response(200, metrics.render(), metrics.CONTENT_TYPE)
 		elif self.path == "/health":
 			if self.getHomeScreen():
 				self._set_response(200, 'OK')
@@ -170,19 +309,27 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 		return content
 
 	def listExperiments(self):
-		fin = open(experiment_page)
-		content = fin.read()
-		fin.close()
-		return content
+		"""Render the experiment status page from the in-memory status of the experiments."""
+		experiments = hpo_service.instance.getExperimentsStatus()
+		if not experiments:
+			return experiment_template
+
+		rows = ""
+		# most recently created experiments are listed first
+		for experiment in reversed(experiments):
+			rows = rows + render_experiment_row(experiment["experiment_name"], experiment["status"])
+		table = "<table> \n" \
+				"<tr> <th>Experiment</th>    <th>Status</th>    <th>Plots Generated</th> </tr> \n" \
+				+ rows + \
+				"</table> \n"
+		# the table holds experiment names, it is not a replacement template
+		return re.sub(".*No Experiments found!.*\n", lambda match: table, experiment_template)
 
 	def getPlots(self, experiment_name, plot_type):
-		dirName = "plots/" + experiment_name
-		plotsDir = os.path.dirname(os.path.realpath(dirName))
-		plotFile = plotsDir + "/" + experiment_name + "/" + plot_type + ".html"
-		fin = open(plotFile)
-		content = fin.read()
-		fin.close()
-		return content
+		try:
+			return hpo_service.instance.get_plot(experiment_name, plot_type)
+		except Exception as e:
+			logger.warn("Issues generating " + plot_type + " plot: " + str(e))
 
 	def handle_generate_new_operation(self, json_object):
 		"""Process EXP_TRIAL_GENERATE_NEW operation."""
@@ -193,26 +340,30 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 		else:
 			search_space_json = json_object["search_space"]
 			search_space = self.setDefaults(search_space_json)
-			if not search_space:
-				self._set_response(400, HPOErrorConstants.PARALLEL_TRIALS_ERROR)
-			else:
-				response = get_search_create_study(search_space, json_object["operation"])
-				if response:
-					self._set_response(400, response)
-					return
-				trial_number = hpo_service.instance.get_trial_number(json_object["search_space"]["experiment_name"])
-				self._set_response(200, HPOMessages.EXPERIMENT_STATUS + str(trial_number).join(["Trial "," started.."]))
+			wait = not json_object.get("async", False)
+			response = get_search_create_study(search_space, json_object["operation"], wait)
+			if response:
+				self._set_response(400, response)
+				return
+			if not wait:
+				self._set_response(202, HPOMessages.EXPERIMENT_STARTING)
+				return
+			trial_number = hpo_service.instance.get_trial_number(json_object["search_space"]["experiment_name"])
+			self._set_response(200, HPOMessages.EXPERIMENT_STATUS + str(trial_number).join(["Trial "," started.."]))
 
 	def handle_generate_subsequent_operation(self, json_object):
 		"""Process EXP_TRIAL_GENERATE_SUBSEQUENT operation."""
 		experiment_name = json_object["experiment_name"]
-		existingExperiment = hpo_service.instance.containsExperiment(experiment_name)
-		if not existingExperiment:
-			logger.error(HPOErrorConstants.EXPERIMENT_NOT_FOUND)
-			self._set_response(404, HPOErrorConstants.EXPERIMENT_NOT_FOUND)
+		experiment = self.lookup_experiment(experiment_name)
+		if experiment is None:
 			return
+		startError = experiment.getStartError()
+		if experiment.isStarting():
+			self._set_response(202, HPOMessages.EXPERIMENT_STARTING)
+		elif startError:
+			self._set_response(400, startError)
 		else:
-			trial_number = hpo_service.instance.get_trial_number(experiment_name)
+			trial_number = experiment.getTrialNumber()
 			if trial_number == -1:
 				logger.error(HPOMessages.TRIAL_COMPLETION_STATUS + experiment_name)
 				self._set_response(400, HPOMessages.TRIAL_COMPLETION_STATUS + experiment_name)
@@ -221,14 +372,17 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 
 	def handle_result_operation(self, json_object):
 		"""Process EXP_TRIAL_RESULT operation."""
-		if self.validate_experiment_name(json_object["experiment_name"]):
+		experiment = self.lookup_experiment(json_object["experiment_name"])
+		if experiment is None:
 			return
 
-		trialValidationError = self.validate_trialNumber(json_object["experiment_name"],
-																		str(json_object["trial_number"]))
+		trialValidationError = self.validate_trialNumber(experiment, str(json_object["trial_number"]))
 		resultDataValidationError = self.validate_result_data(json_object["trial_result"],
 															  json_object["result_value_type"],
 															  json_object["result_value"])
+		if not trialValidationError and not resultDataValidationError:
+			resultDataValidationError = experiment.validate_additional_result_values(
+				json_object["trial_result"], json_object.get("additional_result_values"))
 		if trialValidationError:
 			self._set_response(400, trialValidationError)
 			logger.error(trialValidationError)
@@ -236,10 +390,80 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 			self._set_response(400, resultDataValidationError)
 			logger.error(resultDataValidationError)
 		else:
-			hpo_service.instance.set_result(json_object["experiment_name"], json_object["trial_result"],
-											json_object["result_value_type"], json_object["result_value"])
+			experiment.tell(json_object["trial_number"], json_object["trial_result"], json_object["result_value_type"],
+							json_object["result_value"], json_object.get("additional_result_values"))
 			self._set_response(200, HPOMessages.RESULT_STATUS)
 
+	def handle_intermediate_result_operation(self, json_object):
+		"""
+		Process EXP_TRIAL_INTERMEDIATE_RESULT operation. The reply tells whether the trial has been pruned, in which
+		case the client should stop running it and not post its result.
+		"""
+		experiment = self.lookup_experiment(json_object["experiment_name"])
+		if experiment is None:
+			return
+
+		validationError = self.validate_trialNumber(experiment, str(json_object["trial_number"]))
+		if not validationError:
+			validationError = self.validate_result_data("success", json_object["result_value_type"],
+														json_object["result_value"])
+		if not validationError and experiment.isMultiObjective():
+			validationError = HPOErrorConstants.MULTI_OBJECTIVE_PRUNING
+		if validationError:
+			self._set_response(400, validationError)
+			logger.error(validationError)
+		else:
+			prune = bool(experiment.report(json_object["trial_number"], json_object["step"],
+										   json_object["result_value"]))
+			self._set_response(200, json.dumps({"trial_number": json_object["trial_number"], "prune": prune}),
+							   HPOSupportedTypes.CONTENT_TYPE)
+
+	def handle_generate_batch_operation(self, json_object):
+		"""Process EXP_TRIAL_GENERATE_BATCH operation."""
+		experiment_name = json_object["experiment_name"]
+		experiment = self.lookup_experiment(experiment_name)
+		if experiment is None:
+			return
+		startError = experiment.getStartError()
+		if experiment.isStarting():
+			self._set_response(202, HPOMessages.EXPERIMENT_STARTING)
+		elif startError:
+			self._set_response(400, startError)
+		else:
+			batch = experiment.get_trial_batch(json_object["count"])
+			if not batch:
+				logger.error(HPOMessages.TRIAL_COMPLETION_STATUS + experiment_name)
+				self._set_response(400, HPOMessages.TRIAL_COMPLETION_STATUS + experiment_name)
+			else:
+				self._set_response(200, json.dumps(batch), HPOSupportedTypes.CONTENT_TYPE)
+
+	def handle_result_batch_operation(self, json_object):
+		"""Process EXP_TRIAL_RESULT_BATCH operation. Nothing is posted unless every result in the batch is valid."""
+		experiment = self.lookup_experiment(json_object["experiment_name"])
+		if experiment is None:
+			return
+
+		trial_numbers = set()
+		for result in json_object["results"]:
+			validationError = self.validate_trialNumber(experiment, str(result["trial_number"]))
+			if not validationError:
+				validationError = self.validate_result_data(result["trial_result"], result["result_value_type"],
+															result["result_value"])
+			if not validationError:
+				validationError = experiment.validate_additional_result_values(
+					result["trial_result"], result.get("additional_result_values"))
+			if not validationError and result["trial_number"] in trial_numbers:
+				validationError = HPOErrorConstants.DUPLICATE_TRIAL
+			if validationError:
+				validationError = "Trial " + str(result["trial_number"]) + ": " + validationError
+				self._set_response(400, validationError)
+				logger.error(validationError)
+				return
+			trial_numbers.add(result["trial_number"])
+
+		experiment.tell_batch(json_object["results"])
+		self._set_response(200, HPOMessages.RESULT_STATUS)
+
 	def validate_experiment_name(self, experiment_name):
 		error_msg = ""
 		if not experiment_name or experiment_name.isspace() or experiment_name == "null":
@@ -254,19 +478,45 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 
 		return error_msg
 
-	def validate_trialNumber(self, experiment_name, trial_number):
-		current_trial_number = hpo_service.instance.get_trial_number(experiment_name)
+	def lookup_experiment(self, experiment_name):
+		"""
+		Validate the experiment name and return the experiment, or None once the error response has been sent. The
+		request works on the returned experiment from then on, so that a concurrent delete cannot remove it between
+		two checks of the same request.
+		"""
+		if not experiment_name or experiment_name.isspace() or experiment_name == "null":
+			error_msg = "Parameters" + HPOErrorConstants.VALUE_MISSING
+			self._set_response(400, error_msg)
+			logger.error(error_msg)
+			return None
+		try:
+			return hpo_service.instance.getExperiment(experiment_name)
+		except ExperimentNotFoundError:
+			self._set_response(404, HPOErrorConstants.EXPERIMENT_NOT_FOUND)
+			return None
+
+	def validate_trialNumber(self, experiment, trial_number):
 		errorMsg = ""
-		if not int(trial_number) == current_trial_number:
-			try:
-				if int(trial_number) < 0:
-					errorMsg = HPOErrorConstants.NEGATIVE_TRIAL
-				elif int(trial_number) > current_trial_number:
-					errorMsg = HPOErrorConstants.TRIAL_EXCEEDED
-				else:
-					errorMsg = HPOErrorConstants.TRIAL_PRECEDES
-			except ValueError:
-				errorMsg = HPOErrorConstants.NON_INTEGER_VALUE
+		try:
+			trial_number = int(trial_number)
+		except ValueError:
+			return HPOErrorConstants.NON_INTEGER_VALUE
+
+		if experiment.isStarting():
+			return HPOErrorConstants.EXPERIMENT_NOT_STARTED
+		startError = experiment.getStartError()
+		if startError:
+			return startError
+
+		# any trial that is still waiting for its result is valid, not only the most recent one
+		if experiment.getPendingTrial(trial_number) is None:
+			current_trial_number = experiment.getTrialNumber()
+			if trial_number < 0:
+				errorMsg = HPOErrorConstants.NEGATIVE_TRIAL
+			elif trial_number > current_trial_number:
+				errorMsg = HPOErrorConstants.TRIAL_EXCEEDED
+			else:
+				errorMsg = HPOErrorConstants.TRIAL_PRECEDES
 
 		return errorMsg
 
@@ -298,14 +548,27 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 			search_space["value_type"] = HPOSupportedTypes.VALUE_TYPE
 		if "parallel_trials" not in search_space:
 			search_space["parallel_trials"] = HPOSupportedTypes.N_JOBS
-		elif search_space["parallel_trials"] != 1:
-			logger.error(HPOErrorConstants.PARALLEL_TRIALS_ERROR)
-			return
 
 		return search_space
 
 
-def get_search_create_study(search_space_json, operation):
+def render_experiment_row(experiment_name, exp_status):
+	# experiment names are chosen by clients, they are escaped rather than rendered as html
+	name = html.escape(experiment_name)
+	exp_status = html.escape(exp_status)
+	if exp_status == "Completed":
+		plot_links = ""
+		for plot_type, plot_name in (("tunable_importance", "Tunable_Importance"), ("slice", "Slice"),
+									 ("optimization_history", "Optimization History"),
+									 ("parallel_coordinate", "Parallel_Coordinate")):
+			plot_links = plot_links + "<li><a href=\"/plot?experiment_name=" + html.escape(quote(experiment_name)) + \
+						 "&type=" + plot_type + "\">" + plot_name + "</a></li>"
+		return "<tr> <td> " + name + " </td> <td> " + exp_status + " </td> " \
+			   "<td><details><summary> Yes! Click here </summary><ul> " + plot_links + "</ul></details></td> </tr> \n"
+	return "<tr> <td> " + name + " </td> <td> " + exp_status + " </td> <td>  No </td> </tr> \n"
+
+
+def get_search_create_study(search_space_json, operation, wait=True):
 	if operation == "EXP_TRIAL_GENERATE_NEW":
 		experiment_name, total_trials, parallel_trials, direction, hpo_algo_impl, id_, objective_function, tunables, \
 		value_type = get_all_tunables(search_space_json)
@@ -313,18 +576,155 @@ def get_search_create_study(search_space_json, operation):
 		logger.info("Total Trials = " + str(total_trials))
 		logger.info("Parallel Trials = " + str(parallel_trials))
 
-		hpo_service.instance.newExperiment(id_, experiment_name, total_trials, parallel_trials, direction,
-										   hpo_algo_impl, objective_function, tunables, value_type)
+		response = hpo_service.instance.newExperiment(id_, experiment_name, total_trials, parallel_trials, direction,
+													  hpo_algo_impl, objective_function, tunables, value_type,
+													  search_space_json.get("warm_start"),
+													  search_space_json.get("early_stopping"),
+													  search_space_json.get("pruner"),
+													  search_space_json.get("sampler_params"),
+													  search_space_json.get("additional_objectives"),
+													  search_space_json.get("sampler_history"))
+		if response:
+			return response
 		logger.info("Starting Experiment: " + experiment_name)
-		# check response, it will have error message if the experiment timed out else nothing will be returned
-		response = hpo_service.instance.startExperiment(experiment_name)
+		# check response, it will have error message if the experiment failed to start else nothing will be returned
+		response = hpo_service.instance.startExperiment(experiment_name, wait)
 		if response:
 			return response
 
 
+class PooledHTTPServer(HTTPServer):
+	"""
+	A HTTP server handling requests on a bounded pool of worker threads, so that a slow request does not block other
+	clients such as health probes.
+
+	Kept alive connections wait for their next request on a selector thread, a connection is only handed to a worker
+	once a request arrives on it, so idle connections do not hold workers and the pool size only bounds the number of
+	requests handled at the same time. Connections idle for longer than the handler timeout are closed.
+	"""
+
+	def __init__(self, server_address, RequestHandlerClass, max_workers):
+		super().__init__(server_address, RequestHandlerClass)
+		self.executor = futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rest")
+		self.selector = selectors.DefaultSelector()
+		self.parked = queue.SimpleQueue()
+		self.wakeupReader, self.wakeupWriter = socket.socketpair()
+		self.wakeupReader.setblocking(False)
+		self.wakeupWriter.setblocking(False)
+		self.selector.register(self.wakeupReader, selectors.EVENT_READ)
+		self.closed = False
+		threading.Thread(target=self.wait_for_requests, name="rest-selector", daemon=True).start()
+
+	def process_request(self, request, client_address):
+		# the handler is set up once per connection and kept across requests, instead of handling them all in __init__
+		handler = self.RequestHandlerClass.__new__(self.RequestHandlerClass)
+		handler.request = request
+		handler.client_address = client_address
+		handler.server = self
+		try:
+			handler.setup()
+		except Exception:
+			self.handle_error(request, client_address)
+			self.shutdown_request(request)
+			return
+		self.park(handler)
+
+	def park(self, handler):
+		"""Give a connection back to the selector thread to wait for its next request."""
+		handler.idleSince = time.monotonic()
+		self.parked.put(handler)
+		try:
+			self.wakeupWriter.send(b"\0")
+		except BlockingIOError:
+			# the selector thread has not read previous wakeups yet, it will pick up the handler anyway
+			pass
+
+	def wait_for_requests(self):
+		"""Hand kept alive connections to the workers when a request arrives, close the ones idle for too long."""
+		timeout = self.RequestHandlerClass.timeout
+		while not self.closed:
+			for key, _ in self.selector.select(timeout=1):
+				if key.fileobj is self.wakeupReader:
+					try:
+						while self.wakeupReader.recv(4096):
+							pass
+					except BlockingIOError:
+						pass
+				else:
+					self.selector.unregister(key.fileobj)
+					try:
+						self.executor.submit(self.serve_request, key.data)
+					except RuntimeError:
+						# the interpreter is shutting down, no more requests are handled
+						self.close_connection(key.data)
+			while not self.parked.empty():
+				handler = self.parked.get()
+				self.selector.register(handler.request, selectors.EVENT_READ, handler)
+			if timeout is not None:
+				now = time.monotonic()
+				for key in list(self.selector.get_map().values()):
+					if key.data is not None and now - key.data.idleSince > timeout:
+						self.selector.unregister(key.fileobj)
+						self.close_connection(key.data)
+		for key in list(self.selector.get_map().values()):
+			if key.data is not None:
+				self.close_connection(key.data)
+		self.selector.close()
+
+	def serve_request(self, handler):
+		"""Handle the request that arrived on a connection, then park the connection again unless it was closed."""
+		while True:
+			handler.close_connection = True
+			try:
+				handler.handle_one_request()
+			except Exception:
+				self.handle_error(handler.request, handler.client_address)
+				handler.close_connection = True
+			if handler.close_connection or self.closed:
+				self.close_connection(handler)
+				return
+			if not self.has_buffered_request(handler):
+				self.park(handler)
+				return
+
+	@staticmethod
+	def has_buffered_request(handler) -> bool:
+		"""Return whether the client already sent (pipelined) its next request, the selector would not see it."""
+		timeout = handler.request.gettimeout()
+		handler.request.settimeout(0)
+		try:
+			return bool(handler.rfile.peek(1))
+		except OSError:
+			return False
+		finally:
+			handler.request.settimeout(timeout)
+
+	def close_connection(self, handler):
+		try:
+			handler.finish()
+		except Exception:
+			pass
+		self.shutdown_request(handler.request)
+
+	def server_close(self):
+		self.closed = True
+		try:
+			self.wakeupWriter.send(b"\0")
+		except OSError:
+			pass
+		super().server_close()
+		self.executor.shutdown(wait=False)
+
+
 def main(server_port=8085):
     hpo_instance = HPOSupportedTypes(server_port=server_port)
-    server = HTTPServer((HPOSupportedTypes.SERVER_HOSTNAME,  hpo_instance.SERVER_PORT), HTTPRequestHandler)
+    server_address = (HPOSupportedTypes.SERVER_HOSTNAME,  hpo_instance.SERVER_PORT)
+    if os.environ.get(HPOSupportedTypes.REST_SERVER_ENV, HPOSupportedTypes.REST_SERVER) == "single":
+        server = HTTPServer(server_address, HTTPRequestHandler)
+    else:
+        workers = int(os.environ.get(HPOSupportedTypes.REST_WORKERS_ENV, HPOSupportedTypes.REST_WORKERS))
+        server = PooledHTTPServer(server_address, HTTPRequestHandler, workers)
+        logger.info("REST Service handling requests with %s workers" % workers)
     logger.info("Access REST Service at http://%s:%s" % ("localhost",  hpo_instance.SERVER_PORT))
     server.serve_forever()
 
@@ -16,6 +16,7 @@ limitations under the License.
 import sys
 
 import rest_service
+import hpo_service
 import threading
 import signal
 from logger import get_logger
@@ -29,6 +30,9 @@ signal.signal(signal.SIGINT, signal_handler)
 
 def main():
 
+    # reload the experiments that were persisted before the service was restarted
+    hpo_service.instance.recoverExperiments()
+
     if ( len(sys.argv) == 1 ) or ( len(sys.argv) == 2 and sys.argv[1] == "BOTH" ) or ( len(sys.argv) == 3 and sys.argv[1] == "BOTH" ):
         import grpc_service
         gRPCservice = threading.Thread(target=grpc_service.serve)
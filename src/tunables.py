@@ -42,3 +42,11 @@ def get_all_tunables(search_space_json):
     hpo_algo_impl = search_space_json["hpo_algo_impl"]
     tunables = search_space_json["tunables"]
     return experiment_name, total_trials, parallel_trials, direction, hpo_algo_impl, id_, objective_function, tunables, value_type
+
+
+def get_tunable_value(tunableConfig):
+    """Return the typed value of a gRPC TunableConfig, falling back to its float value."""
+    typed_value = tunableConfig.WhichOneof("typed_value")
+    if typed_value is None:
+        return tunableConfig.value
+    return getattr(tunableConfig, typed_value)
@@ -18,9 +18,13 @@ limitations under the License.
 class HPOSupportedTypes:
     DIRECTIONS_SUPPORTED = ("minimize", "maximize")
     VALUE_TYPES_SUPPORTED = ("double", "int", "float")
-    OPTUNA_ALGOS = ("optuna_tpe", "optuna_tpe_multivariate", "optuna_skopt")
-    ALGOS_SUPPORTED = (OPTUNA_ALGOS)
-    TRIAL_RESULT_STATUS = ("success", "failure", "error")
+    TRIAL_RESULT_STATUS = ("success", "failure", "prune", "error")
+    # Pruners that stop unpromising trials on their intermediate values, with the parameters each of them accepts
+    PRUNERS_SUPPORTED = {
+        "median": ("n_startup_trials", "n_warmup_steps", "interval_steps"),
+        "hyperband": ("min_resource", "max_resource", "reduction_factor"),
+        "successive_halving": ("min_resource", "reduction_factor", "min_early_stopping_rate")
+    }
 
     # Default Values
     HPO_ALGO = "optuna_tpe"
@@ -30,6 +34,49 @@ class HPOSupportedTypes:
     SERVER_HOSTNAME = "0.0.0.0"
     API_ENDPOINT = "/experiment_trials"
     CONTENT_TYPE = "application/json"
+    # Paths of GET requests whose durations are observed separately, any other path is observed as "GET"
+    GET_PATHS = (API_ENDPOINT, "/listexperiments", "/plot", "/importance", "/paretofront", "/timing", "/pending_trials", "/trials", "/health", "/metrics", "/")
+    # REST server mode, "threaded" handles requests on a pool of REST_WORKERS threads, "single" one at a time
+    REST_SERVER_ENV = "HPO_REST_SERVER"
+    REST_SERVER = "threaded"
+    REST_WORKERS_ENV = "HPO_REST_WORKERS"
+    REST_WORKERS = 16
+    # Seconds an idle kept alive connection is held open
+    REST_KEEPALIVE_TIMEOUT = 30
+    # gRPC server mode, "threaded" handles RPCs on a pool of GRPC_WORKERS threads, "aio" on an asyncio event loop that
+    # hands blocking work to a pool of GRPC_WORKERS threads and waits for stream updates without holding a thread
+    GRPC_SERVER_ENV = "HPO_GRPC_SERVER"
+    GRPC_SERVER = "threaded"
+    GRPC_PORT_ENV = "HPO_GRPC_PORT"
+    GRPC_PORT = 50051
+    GRPC_WORKERS_ENV = "HPO_GRPC_WORKERS"
+    GRPC_WORKERS = 10
+    # Maximum number of concurrent RPCs and streams on one client connection
+    GRPC_MAX_CONCURRENT_STREAMS_ENV = "HPO_GRPC_MAX_CONCURRENT_STREAMS"
+    GRPC_MAX_CONCURRENT_STREAMS = 100
+    # Maximum size in bytes of a message sent or received
+    GRPC_MAX_MESSAGE_SIZE_ENV = "HPO_GRPC_MAX_MESSAGE_SIZE"
+    GRPC_MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+    # Optuna storage URL to persist experiments to, e.g. sqlite:///hpo.db or journal:/path/to/hpo.log
+    STORAGE_ENV = "HPO_STORAGE"
+    # Maximum size in bytes of the rendered plots kept in memory
+    PLOT_CACHE_SIZE_ENV = "HPO_PLOT_CACHE_SIZE"
+    PLOT_CACHE_SIZE = 64 * 1024 * 1024
+    PLOT_TYPES = ("tunable_importance", "optimization_history", "slice", "parallel_coordinate")
+    # Number of threads evaluating tunable importance in the background
+    IMPORTANCE_WORKERS_ENV = "HPO_IMPORTANCE_WORKERS"
+    IMPORTANCE_WORKERS = 2
+    # Profile the sampling and bookkeeping of the trials of every experiment with cProfile when set to "true"
+    PROFILE_TRIALS_ENV = "HPO_PROFILE_TRIALS"
+    # Number of functions listed in the profile of an experiment, by cumulative time
+    PROFILE_LINES = 30
+    # Number of trials listed by /trials when no limit is given, and the largest limit accepted
+    TRIAL_HISTORY_LIMIT = 100
+    TRIAL_HISTORY_MAX_LIMIT = 1000
+    # Number of threads starting experiments created in async mode
+    START_WORKERS = 4
+    # Seconds a gRPC stream waits for an experiment update before checking whether the client is still connected
+    STREAM_POLL_INTERVAL = 1
 
     def __init__(self, server_port=None):
         if server_port is not None:
@@ -51,7 +98,12 @@ class HPOErrorConstants:
     MISSING_PARAMETERS = "Missing required parameters!"
     EXPERIMENT_NOT_FOUND = "Experiment not found!"
     EXPERIMENT_EXISTS = "Experiment already exists!"
-    EXPERIMENT_TIMED_OUT = "Starting experiment timed out!"
+    EXPERIMENT_START_ERROR = "Starting experiment failed!"
+    EXPERIMENT_NOT_STARTED = "Experiment has not started yet!"
+    EXPERIMENT_DELETED = "Experiment was deleted before it started!"
+    INVALID_BATCH_SIZE = "Batch size must be greater than zero!"
+    INVALID_PAGE = "Offset should not be negative and limit should be from 1 to "
+    DUPLICATE_TRIAL = "Duplicate trial number in batch!"
 
     INVALID_TOTAL_TRIALS = "Total trials should be greater than 0!"
     NEGATIVE_TRIAL = "Trial number cannot be negative!"
@@ -60,14 +112,34 @@ class HPOErrorConstants:
     NON_INTEGER_VALUE = "Only Integer value is allowed!"
     NEGATIVE_VALUE = "result_value cannot be negative!"
     VALUE_TYPE_MISMATCH = "Value and value type do not match!"
-    PARALLEL_TRIALS_ERROR = "Parallel Trials value should be '1' only!"
+    INVALID_PARALLEL_TRIALS = "Parallel trials should be greater than 0!"
     JSON_STRUCTURE_ERROR = "Invalid JSON structure: "
+    INVALID_PLOT_TYPE = "Plot type not supported!"
+    MISSING_CHOICES = "Categorical tunable has no choices: "
+    INVALID_EARLY_STOPPING = "Early stopping patience and max_duration should be greater than 0 and min_delta not negative!"
+    WARM_START_NOT_FOUND = "Experiment to warm start from not found!"
+    INVALID_WARM_START = "Warm start needs either an experiment_name or trials!"
+    INVALID_WARM_START_TUNABLE = "Warm start trial config has a tunable that is not in the search space: "
+    INVALID_WARM_START_VALUES = "Warm start trials need a result value for every objective!"
+    INVALID_WARM_START_ENQUEUE = "Warm start enqueue_best must be a positive integer!"
+    INVALID_CONDITION = "Condition has to refer to a tunable listed before: "
+    INVALID_CONDITION_VALUES = "Condition needs a list of values of the tunable it refers to: "
+    INVALID_LOG_BOUND = "Lower bound of a log tunable has to be greater than 0: "
+    PRUNER_NOT_SUPPORTED = "Pruner not supported!"
+    INVALID_PRUNER_PARAMETER = "Pruner parameter not supported or negative: "
+    INVALID_STEP = "Step should not be negative!"
+    INVALID_SAMPLER_PARAMS = "Sampler parameters not supported: "
+    INVALID_SAMPLER_HISTORY = "Sampler history needs either a window or a top_k greater than 0, and random not negative!"
+    ADDITIONAL_VALUES_MISMATCH = "Number of additional result values does not match the additional objectives!"
+    MULTI_OBJECTIVE_PRUNING = "Intermediate values and pruners are not supported with additional objectives!"
+    MULTI_OBJECTIVE_SAMPLER = "Additional objectives are not supported by hpo_algo_impl: "
 
     JSON_NULL_VALUES = ("is not of type 'string'", "is not of type 'integer'", "is not of type 'number'")
 
 
 class HPOMessages:
     EXPERIMENT_STATUS="Experiment posted successfully! "
+    EXPERIMENT_STARTING = "Experiment is starting.."
     RESULT_STATUS = "Result posted successfully!"
     TRIAL_COMPLETION_STATUS = "Trials completed for experiment: "
     EXPERIMENT_DELETE = "Experiment deleted!"
@@ -0,0 +1,102 @@
+"""
+Copyright (c) 2020, 2022 Red Hat, IBM Corporation and others.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Fixtures of the unit tests, which run the modules of src/ in-process against a fresh HpoService for every test.
+"""
+import json
+import os
+import sys
+from concurrent import futures
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+import hpo_service
+
+# tunables of the test experiments, the objective is minimal at x = 3, y = 7
+TUNABLES = [
+    {"value_type": "double", "name": "x", "lower_bound": 1, "upper_bound": 10, "step": 0.5},
+    {"value_type": "integer", "name": "y", "lower_bound": 1, "upper_bound": 10, "step": 1}
+]
+
+
+def objective(config) -> float:
+    """Return the objective value of a trial config, a list of {"tunable_name": ..., "tunable_value": ...}."""
+    values = {tunable["tunable_name"]: tunable["tunable_value"] for tunable in config}
+    return (values["x"] - 3) ** 2 + (values["y"] - 7) ** 2 + 1
+
+
+def search_space(experiment_name, total_trials=5, parallel_trials=1, **options) -> dict:
+    """Return the search space of a test experiment as posted over REST, with options added to it."""
+    space = {"experiment_name": experiment_name, "experiment_id": "a1", "total_trials": total_trials,
+             "parallel_trials": parallel_trials, "value_type": "double", "hpo_algo_impl": "optuna_tpe",
+             "objective_function": "response_time", "tunables": TUNABLES, "direction": "minimize",
+             "sampler_params": {"seed": 42}}
+    space.update(options)
+    return space
+
+
+@pytest.fixture
+def new_service():
+    """Return a function creating an HpoService, e.g. on a storage."""
+    services = []
+
+    def create(storage_url=None):
+        services.append(hpo_service.HpoService(storage_url))
+        return services[-1]
+    yield create
+    # tunable importance is evaluated in the background once an experiment completes, and logs when it is done
+    importanceFutures = [experiment.importanceFuture for service in services
+                         for experiment in service.experiments.values() if experiment.importanceFuture is not None]
+    futures.wait(importanceFutures, timeout=60)
+
+
+@pytest.fixture
+def service(monkeypatch, new_service):
+    """A fresh HpoService used as hpo_service.instance, so that the REST and gRPC services use it too."""
+    service = new_service()
+    monkeypatch.setattr(hpo_service, "instance", service)
+    return service
+
+
+@pytest.fixture
+def start_experiment(service):
+    """Return a function creating and starting an experiment from the search space of its keyword arguments."""
+    def start(experiment_name="experiment", total_trials=5, parallel_trials=1, **options):
+        space = search_space(experiment_name, total_trials, parallel_trials, **options)
+        error = service.newExperiment(None, experiment_name, total_trials, parallel_trials, space["direction"],
+                                      space["hpo_algo_impl"], space["objective_function"], space["tunables"],
+                                      space["value_type"], space.get("warm_start"), space.get("early_stopping"),
+                                      space.get("pruner"), space.get("sampler_params"),
+                                      space.get("additional_objectives"), space.get("sampler_history"))
+        assert not error
+        error = service.startExperiment(experiment_name)
+        assert not error
+        return service.getExperiment(experiment_name)
+    return start
+
+
+@pytest.fixture
+def run_trial(service):
+    """Return a function posting the objective value of a pending trial, by default of the most recent one."""
+    def run(experiment_name, trial_number=None, additional_result_values=None):
+        if trial_number is None:
+            trial_number = service.get_trial_number(experiment_name)
+        config = json.loads(service.get_trial_json_object(experiment_name, trial_number))
+        value = objective(config)
+        service.set_result(experiment_name, trial_number, "success", "double", value, additional_result_values)
+        return value
+    return run
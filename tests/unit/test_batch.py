@@ -0,0 +1,43 @@
+"""
+Tests of trials handed out and completed in batches, on top of the trials an experiment runs in parallel.
+"""
+import pytest
+
+from conftest import objective
+
+
+def test_batch_starts_with_the_pending_trials_not_delivered(service, start_experiment):
+    start_experiment("experiment", total_trials=4, parallel_trials=1)
+
+    batch = service.get_trial_batch("experiment", 4)
+
+    assert [trial["trial_number"] for trial in batch] == [0, 1, 2, 3]
+    assert service.get_trial_batch("experiment", 4) == []
+
+
+def test_delivered_trials_are_not_batched_again(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=6, parallel_trials=2)
+    service.get_trial_json_object("experiment", 0)
+
+    assert [trial["trial_number"] for trial in service.get_trial_batch("experiment", 2)] == [1, 2]
+    # the result of trial 0 leaves fewer trials pending than run in parallel, trial 3 is asked for
+    run_trial("experiment", 0)
+    assert [trial["trial_number"] for trial in service.get_trial_batch("experiment", 3)] == [3, 4, 5]
+
+
+@pytest.mark.parametrize("count", [2, 3, 5])
+def test_experiment_completes_through_batches(service, start_experiment, count):
+    experiment = start_experiment("experiment", total_trials=7, parallel_trials=2)
+
+    finished = []
+    while experiment.status != "Completed":
+        batch = service.get_trial_batch("experiment", count)
+        assert batch
+        service.set_results("experiment", [{"trial_number": trial["trial_number"], "trial_result": "success",
+                                            "result_value_type": "double",
+                                            "result_value": objective(trial["trial_config"])} for trial in batch])
+        finished += [trial["trial_number"] for trial in batch]
+
+    assert sorted(finished) == list(range(7))
+    assert service.get_pending_trials("experiment") == []
+
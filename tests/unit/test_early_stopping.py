@@ -0,0 +1,41 @@
+"""
+Tests of experiments stopped before total_trials once they converge or run out of time.
+"""
+from conftest import search_space
+from json_validate import validate_trial_generate_json
+from utils import HPOErrorConstants
+
+
+def test_experiment_stops_early_without_improvement(service, start_experiment):
+    experiment = start_experiment("experiment", total_trials=10, early_stopping={"patience": 2})
+    for result_value in [1.0, 2.0, 3.0]:
+        service.set_result("experiment", service.get_trial_number("experiment"), "success", "double", result_value)
+
+    assert experiment.status == "Completed"
+    assert service.get_trial_records("experiment", 0, 10)[0] == 3
+    assert service.get_recommended_config("experiment")["stop_reason"] == "No improvement in the last 2 trials"
+
+
+def test_improvement_smaller_than_min_delta_does_not_count(service, start_experiment):
+    experiment = start_experiment("experiment", total_trials=10, early_stopping={"patience": 2, "min_delta": 0.1})
+    for result_value in [10.0, 9.5, 9.2]:
+        service.set_result("experiment", service.get_trial_number("experiment"), "success", "double", result_value)
+
+    assert experiment.status == "Completed"
+    assert service.get_recommended_config("experiment")["optimal_value"]["objective_function"]["value"] == 9.2
+
+
+def test_experiment_runs_every_trial_while_improving(service, start_experiment):
+    experiment = start_experiment("experiment", total_trials=4, early_stopping={"patience": 2})
+    for result_value in [4.0, 3.0, 2.0, 1.0]:
+        service.set_result("experiment", service.get_trial_number("experiment"), "success", "double", result_value)
+
+    assert experiment.status == "Completed"
+    assert "stop_reason" not in service.get_recommended_config("experiment")
+
+
+def test_early_stopping_criteria_are_validated():
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", early_stopping={"patience": 0})}) == HPOErrorConstants.INVALID_EARLY_STOPPING
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", early_stopping={"max_duration": 0})}) == HPOErrorConstants.INVALID_EARLY_STOPPING
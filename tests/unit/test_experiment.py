@@ -0,0 +1,44 @@
+"""
+Tests of the ask-and-tell trial loop of an experiment.
+"""
+
+
+def test_experiment_completes_after_total_trials(service, start_experiment, run_trial):
+    experiment = start_experiment("experiment", total_trials=5)
+    values = [run_trial("experiment") for _ in range(5)]
+
+    assert experiment.status == "Completed"
+    # no trial is started once the experiment has completed
+    assert service.get_trial_number("experiment") == -1
+    optimal_value = service.get_recommended_config("experiment")["optimal_value"]
+    assert optimal_value["objective_function"]["value"] == round(min(values), 2)
+    assert [tunable["name"] for tunable in optimal_value["tunables"]] == ["x", "y"]
+
+
+def test_next_trial_is_asked_once_the_result_is_told(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=3)
+    assert service.get_trial_number("experiment") == 0
+    assert service.is_trial_pending("experiment", 0)
+
+    run_trial("experiment", 0)
+
+    assert not service.is_trial_pending("experiment", 0)
+    assert service.get_trial_number("experiment") == 1
+
+
+def test_failed_trial_is_not_recommended(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=2)
+    service.set_result("experiment", 0, "failure", "double", -1000)
+    value = run_trial("experiment", 1)
+
+    optimal_value = service.get_recommended_config("experiment")["optimal_value"]
+    assert optimal_value["objective_function"]["value"] == round(value, 2)
+
+
+def test_delete_experiment(service, start_experiment):
+    experiment = start_experiment("experiment")
+
+    service.deleteExperiment("experiment")
+
+    assert experiment.status == "Deleted"
+    assert service.doesNotContainExperiment("experiment")
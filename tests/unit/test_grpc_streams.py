@@ -0,0 +1,246 @@
+"""
+Tests of the gRPC streams, served in-process by both the threaded and the asyncio server.
+"""
+import asyncio
+import queue
+import threading
+from concurrent import futures
+
+import grpc
+import pytest
+
+import grpc_service
+from gRPC import hpo_pb2, hpo_pb2_grpc
+
+# deadline of every call, so that a stream that is not answered fails the test rather than hanging it
+TIMEOUT = 30
+
+
+def serve_threaded():
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    hpo_pb2_grpc.add_HpoServiceServicer_to_server(grpc_service.HpoService(), server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    yield port
+    server.stop(None)
+
+
+def serve_aio(workers=8):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    executor = futures.ThreadPoolExecutor(max_workers=workers)
+
+    async def start():
+        server = grpc.aio.server()
+        hpo_pb2_grpc.add_HpoServiceServicer_to_server(grpc_service.AsyncHpoService(executor), server)
+        return server, server.add_insecure_port("localhost:0")
+
+    server, port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    yield port
+    asyncio.run_coroutine_threadsafe(server.stop(None), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+    executor.shutdown()
+
+
+@pytest.fixture(params=["threaded", "aio"])
+def stub(request, service):
+    server = serve_threaded() if request.param == "threaded" else serve_aio()
+    port = next(server)
+    with grpc.insecure_channel("localhost:%d" % port) as channel:
+        yield hpo_pb2_grpc.HpoServiceStub(channel)
+    next(server, None)
+
+
+class LoopClient:
+    """Client of a TrialLoop stream, sending requests as they are put and receiving the replies one at a time."""
+
+    def __init__(self, stub):
+        self.requests = queue.SimpleQueue()
+        self.replies = stub.TrialLoop(iter(self.requests.get, None), timeout=TIMEOUT)
+
+    def send(self, experiment_name, credits=0, trial=None, value=0.0, additional_values=()):
+        loopRequest = hpo_pb2.TrialLoopRequest(experiment_name=experiment_name, credits=credits)
+        if trial is not None:
+            loopRequest.result.trial = trial
+            loopRequest.result.value_type = "double"
+            loopRequest.result.value = value
+            loopRequest.result.additional_values.extend(additional_values)
+        self.requests.put(loopRequest)
+
+    def receive(self) -> hpo_pb2.TrialLoopReply:
+        return next(self.replies)
+
+    def close(self):
+        self.requests.put(None)
+        return list(self.replies)
+
+
+def test_stream_sends_every_trial(stub, service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=5, parallel_trials=2)
+    # trials finished before the stream is opened are sent too
+    run_trial("experiment", 1)
+    run_trial("experiment", 0)
+
+    trial_numbers = []
+    for trial in stub.StreamTrials(hpo_pb2.ExperimentNameParams(experiment_name="experiment"), timeout=TIMEOUT):
+        trial_numbers.append(trial.trial)
+        assert len(trial.config) == 2
+        if service.is_trial_pending("experiment", trial.trial):
+            run_trial("experiment", trial.trial)
+
+    assert trial_numbers == [0, 1, 2, 3, 4]
+
+
+def test_stream_of_an_unknown_experiment(stub, service):
+    with pytest.raises(grpc.RpcError) as error:
+        list(stub.StreamTrials(hpo_pb2.ExperimentNameParams(experiment_name="unknown"), timeout=TIMEOUT))
+
+    assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+
+def test_watch_ends_with_the_final_status(stub, service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=2)
+    events = stub.WatchExperiment(hpo_pb2.ExperimentNameParams(experiment_name="experiment"), timeout=TIMEOUT)
+    assert next(events).current_trial == 0
+
+    run_trial("experiment", 0)
+    run_trial("experiment", 1)
+    lastEvent = list(events)[-1]
+
+    assert lastEvent.status == "Completed"
+    assert lastEvent.HasField("recommended_config")
+
+
+def test_trial_loop_runs_an_experiment(stub, service, start_experiment):
+    start_experiment("experiment", total_trials=2)
+    client = LoopClient(stub)
+
+    client.send("experiment", credits=1)
+    assert client.receive().trial.trial == 0
+    client.send("experiment", trial=0, value=3.0)
+    assert client.receive().trial.trial == 1
+    client.send("experiment", trial=1, value=2.0)
+    loopReply = client.receive()
+
+    assert loopReply.finished and not loopReply.error
+    assert loopReply.recommended_config.optimal_value.value == 2.0
+    assert client.close() == []
+
+
+def test_trial_loop_reports_invalid_results(stub, service, start_experiment):
+    start_experiment("experiment", additional_objectives=[{"objective_function": "memory", "direction": "minimize"}])
+    client = LoopClient(stub)
+    client.send("experiment", credits=1)
+    client.receive()
+
+    client.send("experiment", trial=7, value=3.0, additional_values=[1.0])
+    assert client.receive().error == "Invalid trial number: 7"
+    client.send("experiment", trial=0, value=3.0)
+    assert client.receive().error.startswith("Trial 0: ")
+    assert service.is_trial_pending("experiment", 0)
+    client.close()
+
+
+def test_trial_loop_pushes_what_other_clients_cause(stub, service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=2)
+    client = LoopClient(stub)
+    client.send("experiment", credits=2)
+    assert client.receive().trial.trial == 0
+
+    # results posted over REST or another stream
+    run_trial("experiment", 0)
+    assert client.receive().trial.trial == 1
+    run_trial("experiment", 1)
+    loopReply = client.receive()
+
+    assert loopReply.finished and loopReply.HasField("recommended_config")
+    client.close()
+
+
+def test_trial_loop_of_a_deleted_experiment(stub, service, start_experiment):
+    start_experiment("experiment")
+    start_experiment("other")
+    client = LoopClient(stub)
+    client.send("experiment", credits=1)
+    client.receive()
+
+    service.deleteExperiment("experiment")
+    loopReply = client.receive()
+    assert loopReply.finished and loopReply.error == "Could not find experiment: experiment"
+
+    # the stream goes on for the other experiments
+    client.send("unknown", credits=1)
+    assert client.receive().error == "Could not find experiment: unknown"
+    client.send("other", credits=1)
+    assert client.receive().trial.trial == 0
+    client.close()
+
+
+def test_trial_result_value_is_a_double(stub, service, start_experiment):
+    start_experiment("experiment")
+
+    stub.UpdateTrialResult(hpo_pb2.ExperimentTrialResult(experiment_name="experiment", trial=0, value_type="double",
+                                                         value=16777217.25), timeout=TIMEOUT)
+
+    assert service.get_trial_records("experiment", 0, 1)[1][0]["result_value"] == 16777217.25
+
+
+def test_config_of_a_finished_trial(stub, service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=3)
+    run_trial("experiment", 0)
+
+    with pytest.raises(grpc.RpcError) as error:
+        stub.GetTrialConfig(hpo_pb2.ExperimentTrial(experiment_name="experiment", trial=0), timeout=TIMEOUT)
+
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert len(stub.GetTrialConfig(hpo_pb2.ExperimentTrial(experiment_name="experiment", trial=1),
+                                   timeout=TIMEOUT).config) == 2
+
+
+def test_aio_streams_do_not_hold_workers(service, start_experiment, run_trial):
+    workers = 2
+    start_experiment("experiment", total_trials=2)
+    server = serve_aio(workers)
+    port = next(server)
+    try:
+        with grpc.insecure_channel("localhost:%d" % port) as channel:
+            stub = hpo_pb2_grpc.HpoServiceStub(channel)
+            experimentName = hpo_pb2.ExperimentNameParams(experiment_name="experiment")
+            # several times more open streams of every kind than workers, each waiting for the next trial
+            trialStreams = [stub.StreamTrials(experimentName, timeout=TIMEOUT) for _ in range(workers * 3)]
+            watchStreams = [stub.WatchExperiment(experimentName, timeout=TIMEOUT) for _ in range(workers * 3)]
+            loopClients = [LoopClient(stub) for _ in range(workers * 3)]
+            for trialStream in trialStreams:
+                assert next(trialStream).trial == 0
+            for watchStream in watchStreams:
+                assert next(watchStream).current_trial == 0
+            for loopClient in loopClients:
+                loopClient.send("experiment", credits=2)
+                assert loopClient.receive().trial.trial == 0
+
+            calls = [stub.NumberExperiments.future(hpo_pb2.NumberExperimentsParams(), timeout=5)
+                     for _ in range(workers * 5)]
+            calls += [stub.GetTrialConfig.future(hpo_pb2.ExperimentTrial(experiment_name="experiment", trial=0),
+                                                 timeout=5) for _ in range(workers * 5)]
+            assert all(call.code() == grpc.StatusCode.OK for call in calls)
+
+            run_trial("experiment", 0)
+            run_trial("experiment", 1)
+            for trialStream in trialStreams:
+                assert [trial.trial for trial in trialStream] == [1]
+            for watchStream in watchStreams:
+                assert [event.status for event in watchStream][-1] == "Completed"
+            for loopClient in loopClients:
+                # trial 1 may have finished before the stream was told about it, the experiment finishing is sent
+                loopReply = loopClient.receive()
+                if not loopReply.finished:
+                    assert loopReply.trial.trial == 1
+                    loopReply = loopClient.receive()
+                assert loopReply.finished and loopReply.HasField("recommended_config")
+                assert loopClient.close() == []
+    finally:
+        next(server, None)
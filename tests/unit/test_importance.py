@@ -0,0 +1,78 @@
+"""
+Tests of tunable importance, evaluated in the background and cached per study version.
+"""
+import threading
+
+import optuna
+import pytest
+
+from bayes_optuna.optuna_hpo import HpoExperiment
+from exceptions import ImportanceUnavailableError
+
+
+class Evaluations(list):
+    """The threads importance was evaluated on, evaluations wait until done is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.done = threading.Event()
+
+
+@pytest.fixture
+def evaluations(monkeypatch):
+    evaluations = Evaluations()
+    generate_importance = HpoExperiment.generate_importance
+
+    def generate(experiment):
+        evaluations.append(threading.current_thread().name)
+        assert evaluations.done.wait(30)
+        return generate_importance(experiment)
+    monkeypatch.setattr(HpoExperiment, "generate_importance", generate)
+    yield evaluations
+    evaluations.done.set()
+
+
+def test_importance_is_evaluated_in_the_background(service, start_experiment, run_trial, evaluations):
+    experiment = start_experiment("experiment", total_trials=5)
+    for _ in range(5):
+        run_trial("experiment")
+
+    # the experiment completed while the evaluation is still running
+    assert experiment.status == "Completed"
+    version, importanceFuture = experiment.request_importance()
+    assert not importanceFuture.done()
+
+    evaluations.done.set()
+    assert service.get_importance("experiment") == (5, importanceFuture.result())
+    assert set(importanceFuture.result()) == {"x", "y"}
+    assert version == 5
+    assert evaluations[0].startswith("importance")
+
+
+def test_importance_is_only_evaluated_again_once_trials_finished(service, start_experiment, run_trial,
+                                                                 evaluations):
+    evaluations.done.set()
+    start_experiment("experiment", total_trials=6)
+    for _ in range(4):
+        run_trial("experiment")
+
+    assert service.get_importance("experiment")[0] == 4
+    assert service.get_importance("experiment", refresh=True)[0] == 4
+    assert len(evaluations) == 1
+
+    run_trial("experiment")
+    # without refresh, the importance of the previous trials is returned as is
+    assert service.get_importance("experiment")[0] == 4
+    assert service.get_importance("experiment", refresh=True)[0] == 5
+    assert len(evaluations) == 2
+
+
+def test_importance_error_is_raised_to_the_caller(monkeypatch, service, start_experiment, run_trial):
+    def get_param_importances(study, target=None):
+        raise ValueError()
+    monkeypatch.setattr(optuna.importance, "get_param_importances", get_param_importances)
+    start_experiment("experiment", total_trials=3)
+    run_trial("experiment")
+
+    with pytest.raises(ImportanceUnavailableError):
+        service.get_importance("experiment")
@@ -0,0 +1,122 @@
+"""
+Tests of the metrics served at /metrics, parsed as the Prometheus text exposition format.
+"""
+import math
+import re
+
+import pytest
+
+import metrics
+
+SAMPLE = re.compile(r'([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\\n]|\\[\\"n])*)"(?:,|$)')
+
+
+def unescape(label_value) -> str:
+    return re.sub(r'\\(.)', lambda match: "\n" if match.group(1) == "n" else match.group(1), label_value)
+
+
+def parse(text) -> dict:
+    """
+    Parse metrics in the text exposition format, checking the syntax of every line, into the help, the type and the
+    samples of every metric, each sample being its name, its labels and its value.
+    """
+    assert text.endswith("\n")
+    families = {}
+    name = None
+    for line in text[:-1].split("\n"):
+        if line.startswith("# HELP "):
+            name = line.split(" ")[2]
+            assert name not in families
+            families[name] = {"help": line[len("# HELP " + name + " "):], "type": None, "samples": []}
+        elif line.startswith("# TYPE "):
+            assert line.split(" ")[2] == name and not families[name]["samples"]
+            families[name]["type"] = line.split(" ")[3]
+            assert families[name]["type"] in ("counter", "gauge", "histogram", "summary", "untyped")
+        else:
+            match = SAMPLE.fullmatch(line)
+            assert match, line
+            sample_name, labels, value = match.groups()
+            suffixes = ("_bucket", "_sum", "_count") if families[name]["type"] == "histogram" else ("",)
+            assert sample_name in [name + suffix for suffix in suffixes], line
+            parsed = {}
+            if labels:
+                assert "".join(label.group(0) for label in LABEL.finditer(labels)) == labels, line
+                parsed = {label.group(1): unescape(label.group(2)) for label in LABEL.finditer(labels)}
+            families[name]["samples"].append((sample_name, parsed, float(value)))
+    return families
+
+
+def check_histogram(name, family):
+    """Check that the buckets of every series of a histogram are cumulative and end with +Inf, counting them all."""
+    assert family["type"] == "histogram"
+    series = {}
+    for sample_name, labels, value in family["samples"]:
+        key = tuple(sorted((label, label_value) for label, label_value in labels.items() if label != "le"))
+        series.setdefault(key, {"buckets": [], "sum": None, "count": None})
+        if sample_name == name + "_bucket":
+            series[key]["buckets"].append((float(labels["le"]), value))
+        else:
+            series[key][sample_name[len(name) + 1:]] = value
+    for values in series.values():
+        bounds = [bound for bound, _ in values["buckets"]]
+        counts = [count for _, count in values["buckets"]]
+        assert bounds == sorted(bounds) and bounds[-1] == math.inf
+        assert counts == sorted(counts)
+        assert counts[-1] == values["count"]
+        assert values["sum"] >= 0
+    return series
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(metrics, "registry", [])
+    return metrics.registry
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = metrics.Histogram("test_duration_seconds", "Time spent in tests.", "test", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe(value, "a")
+    histogram.observe(0.5, "b")
+
+    families = parse(metrics.render())
+
+    series = check_histogram("test_duration_seconds", families["test_duration_seconds"])
+    assert series[(("test", "a"),)] == {"buckets": [(0.1, 2), (1.0, 3), (math.inf, 4)], "sum": 2.65, "count": 4}
+    assert series[(("test", "b"),)] == {"buckets": [(0.1, 0), (1.0, 1), (math.inf, 1)], "sum": 0.5, "count": 1}
+
+
+def test_label_values_are_escaped(registry):
+    histogram = metrics.Histogram("test_duration_seconds", "Time spent in tests.", "test")
+    histogram.observe(1, 'a "quoted" \\ value\non two lines')
+
+    families = parse(metrics.render())
+
+    series = check_histogram("test_duration_seconds", families["test_duration_seconds"])
+    assert list(series) == [(("test", 'a "quoted" \\ value\non two lines'),)]
+
+
+def test_histogram_without_label(registry):
+    metrics.Histogram("test_duration_seconds", "Time spent in tests.").observe(0.003)
+    metrics.Gauge("test_value", "A test value.", lambda: 3)
+
+    families = parse(metrics.render())
+
+    assert check_histogram("test_duration_seconds", families["test_duration_seconds"]) != {}
+    assert families["test_value"] == {"help": "A test value.", "type": "gauge", "samples": [("test_value", {}, 3.0)]}
+
+
+def test_service_metrics_are_exposed(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=2)
+    run_trial("experiment")
+
+    families = parse(metrics.render())
+
+    for name, family in families.items():
+        assert family["help"] and family["type"]
+        if family["type"] == "histogram":
+            check_histogram(name, family)
+    assert check_histogram("hpo_trial_ask_duration_seconds", families["hpo_trial_ask_duration_seconds"])[()][
+        "count"] >= 2
+    assert families["hpo_experiments"]["samples"] == [("hpo_experiments", {}, 1.0)]
@@ -0,0 +1,82 @@
+"""
+Tests of experiments optimizing additional objectives along with objective_function.
+"""
+from bayes_optuna.optuna_hpo import dominates
+from conftest import search_space
+from json_validate import validate_trial_generate_json
+from utils import HPOErrorConstants
+
+ADDITIONAL_OBJECTIVES = [{"objective_function": "memory", "direction": "minimize"}]
+
+
+def test_pareto_front_has_the_trials_that_are_not_dominated(service, start_experiment):
+    start_experiment("experiment", total_trials=4, additional_objectives=ADDITIONAL_OBJECTIVES)
+    # trial 2 is beaten by trial 1 on both objectives
+    for trial_number, values in enumerate([(1.0, 9.0), (3.0, 3.0), (4.0, 5.0), (9.0, 1.0)]):
+        service.set_result("experiment", trial_number, "success", "double", values[0], [values[1]])
+
+    pareto_front = service.get_pareto_front("experiment")
+
+    assert [trial["trial_number"] for trial in pareto_front] == [0, 1, 3]
+    assert pareto_front[1]["objective_values"] == [{"name": "response_time", "value": 3.0},
+                                                   {"name": "memory", "value": 3.0}]
+    optimal_value = service.get_recommended_config("experiment")["optimal_value"]
+    assert optimal_value["objective_function"]["value"] == 1.0
+    assert optimal_value["additional_objectives"] == [{"name": "memory", "value": 9.0, "value_type": "double"}]
+
+
+def test_pareto_front_of_a_maximized_objective(service, start_experiment):
+    additional_objectives = [{"objective_function": "throughput", "direction": "maximize"}]
+    start_experiment("experiment", total_trials=3, additional_objectives=additional_objectives)
+    for trial_number, values in enumerate([(1.0, 5.0), (2.0, 4.0), (3.0, 6.0)]):
+        service.set_result("experiment", trial_number, "success", "double", values[0], [values[1]])
+
+    assert [trial["trial_number"] for trial in service.get_pareto_front("experiment")] == [0, 2]
+
+
+def test_dominates():
+    assert dominates([1, 2], [1, 3])
+    assert not dominates([1, 3], [1, 3])
+    assert not dominates([0, 4], [1, 3])
+
+
+def test_result_needs_a_value_for_every_additional_objective(service, start_experiment):
+    start_experiment("experiment", additional_objectives=ADDITIONAL_OBJECTIVES)
+
+    assert service.validate_additional_result_values("experiment", "success", []) == \
+           HPOErrorConstants.ADDITIONAL_VALUES_MISMATCH
+    assert service.validate_additional_result_values("experiment", "success", [1.0, 2.0]) == \
+           HPOErrorConstants.ADDITIONAL_VALUES_MISMATCH
+    assert service.validate_additional_result_values("experiment", "success", [-1.0]) == \
+           HPOErrorConstants.NEGATIVE_VALUE
+    assert service.validate_additional_result_values("experiment", "failure", None) == ""
+    assert service.validate_additional_result_values("experiment", "success", [1.0]) == ""
+
+
+def test_single_objective_sampler_is_rejected():
+    space = search_space("experiment", hpo_algo_impl="optuna_cmaes", additional_objectives=ADDITIONAL_OBJECTIVES)
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": space}) == \
+           HPOErrorConstants.MULTI_OBJECTIVE_SAMPLER + "optuna_cmaes"
+
+
+def test_unsupported_sampler_is_only_reported_as_unsupported():
+    space = search_space("experiment", hpo_algo_impl="optuna_unknown", additional_objectives=ADDITIONAL_OBJECTIVES)
+    space.pop("sampler_params")
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": space}) == \
+           HPOErrorConstants.HPO_ALGO_NOT_SUPPORTED
+
+
+def test_pruner_is_rejected():
+    space = search_space("experiment", pruner={"type": "median"}, additional_objectives=ADDITIONAL_OBJECTIVES)
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": space}) == \
+           HPOErrorConstants.MULTI_OBJECTIVE_PRUNING
+
+
+def test_direction_of_an_additional_objective_is_validated():
+    additional_objectives = [{"objective_function": "memory", "direction": "lower"}]
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", additional_objectives=additional_objectives)}) == HPOErrorConstants.DIRECTION_NOT_SUPPORTED
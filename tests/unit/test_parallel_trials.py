@@ -0,0 +1,47 @@
+"""
+Tests of experiments running several trials at the same time, each waiting for its own result.
+"""
+from conftest import TUNABLES
+
+
+def test_parallel_trials_are_started_at_once(service, start_experiment):
+    start_experiment("experiment", total_trials=6, parallel_trials=3)
+
+    pending = service.get_pending_trials("experiment")
+
+    assert [trial["trial_number"] for trial in pending] == [0, 1, 2]
+    assert all(len(trial["config"]) == len(TUNABLES) for trial in pending)
+
+
+def test_parallel_trials_complete_in_any_order(service, start_experiment, run_trial):
+    experiment = start_experiment("experiment", total_trials=4, parallel_trials=2)
+
+    run_trial("experiment", 1)
+    assert [trial["trial_number"] for trial in service.get_pending_trials("experiment")] == [0, 2]
+    run_trial("experiment", 2)
+    run_trial("experiment", 0)
+    assert [trial["trial_number"] for trial in service.get_pending_trials("experiment")] == [3]
+    run_trial("experiment", 3)
+
+    assert experiment.status == "Completed"
+    assert service.get_pending_trials("experiment") == []
+
+
+def test_result_of_a_trial_that_is_not_pending_is_ignored(service, start_experiment, run_trial):
+    experiment = start_experiment("experiment", total_trials=3, parallel_trials=2)
+    run_trial("experiment", 0)
+
+    service.set_result("experiment", 0, "success", "double", 100)
+    service.set_result("experiment", 7, "success", "double", 100)
+
+    assert [record.trial_number for record in experiment.trialRecords] == [0]
+    assert [trial["trial_number"] for trial in service.get_pending_trials("experiment")] == [1, 2]
+
+
+def test_config_of_a_finished_trial_is_not_returned(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=3, parallel_trials=2)
+    run_trial("experiment", 0)
+
+    assert service.get_trial_json_object("experiment", 0) is None
+    assert service.get_trial_config("experiment", 0) is None
+    assert service.get_trial_json_object("experiment", 1) is not None
@@ -0,0 +1,94 @@
+"""
+Tests of the plots of an experiment, rendered lazily and cached until more trials have finished.
+"""
+from bayes_optuna.optuna_hpo import HpoExperiment
+from plot_cache import PlotCache
+
+
+def test_cached_plot_is_returned():
+    cache = PlotCache(100)
+    cache.put("experiment", "slice", 1, b"plot")
+
+    assert cache.get("experiment", "slice", 1) == b"plot"
+    assert cache.get("experiment", "slice", 2) is None
+    assert cache.get("experiment", "optimization_history", 1) is None
+
+
+def test_least_recently_used_plots_are_evicted_beyond_the_byte_budget():
+    cache = PlotCache(10)
+    cache.put("a", "slice", 1, b"1234")
+    cache.put("b", "slice", 1, b"1234")
+    # a is used more recently than b
+    cache.get("a", "slice", 1)
+
+    cache.put("c", "slice", 1, b"1234")
+
+    assert cache.get("b", "slice", 1) is None
+    assert cache.get("a", "slice", 1) == b"1234"
+    assert cache.get("c", "slice", 1) == b"1234"
+    assert cache.size == 8
+
+
+def test_plot_larger_than_the_budget_is_not_cached():
+    cache = PlotCache(4)
+    cache.put("a", "slice", 1, b"1234")
+
+    cache.put("b", "slice", 1, b"12345")
+
+    assert cache.get("b", "slice", 1) is None
+    assert cache.get("a", "slice", 1) == b"1234"
+
+
+def test_new_version_of_a_plot_replaces_the_previous_one():
+    cache = PlotCache(100)
+    cache.put("experiment", "slice", 1, b"version 1")
+
+    cache.put("experiment", "slice", 2, b"version 2")
+
+    assert cache.get("experiment", "slice", 1) is None
+    assert cache.size == len(b"version 2")
+
+
+def test_plots_of_an_experiment_are_evicted():
+    cache = PlotCache(100)
+    cache.put("experiment", "slice", 1, b"1234")
+    cache.put("other", "slice", 1, b"1234")
+
+    cache.evict("experiment")
+
+    assert cache.get("experiment", "slice", 1) is None
+    assert cache.size == 4
+
+
+def test_plot_is_rendered_once_per_study_version(monkeypatch, service, start_experiment, run_trial):
+    rendered = []
+    generate_plot = HpoExperiment.generate_plot
+
+    def generate(experiment, plot_type):
+        rendered.append(plot_type)
+        return generate_plot(experiment, plot_type)
+    monkeypatch.setattr(HpoExperiment, "generate_plot", generate)
+    start_experiment("experiment", total_trials=4)
+    run_trial("experiment")
+    run_trial("experiment")
+
+    plot = service.get_plot("experiment", "optimization_history")
+    assert service.get_plot("experiment", "optimization_history") is plot
+    assert rendered == ["optimization_history"]
+    assert b"<html>" in plot
+
+    # a trial completing changes the study the plot is rendered from
+    run_trial("experiment")
+    assert service.get_plot("experiment", "optimization_history") is not plot
+    assert rendered == ["optimization_history"] * 2
+
+
+def test_plots_of_a_deleted_experiment_are_evicted(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=2)
+    run_trial("experiment")
+    service.get_plot("experiment", "slice")
+    assert service.plotCache.size > 0
+
+    service.deleteExperiment("experiment")
+
+    assert service.plotCache.size == 0
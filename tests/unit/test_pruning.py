@@ -0,0 +1,44 @@
+"""
+Tests of trials pruned on the intermediate values reported while they run.
+"""
+import json
+
+from conftest import objective
+
+PRUNER = {"type": "median", "n_startup_trials": 1, "n_warmup_steps": 0}
+
+
+def test_pruned_trial_is_not_recommended(service, start_experiment, run_trial):
+    experiment = start_experiment("experiment", total_trials=3, pruner=PRUNER)
+    assert not service.report_result("experiment", 0, 0, 10.0)
+    run_trial("experiment", 0)
+
+    # worse than the median of the previous trials at the same step
+    pruned_config = json.loads(service.get_trial_json_object("experiment", 1))
+    assert service.report_result("experiment", 1, 0, 1000.0)
+    assert not service.is_trial_pending("experiment", 1)
+    assert service.get_trial_number("experiment") == 2
+    run_trial("experiment", 2)
+
+    assert [(record.trial_number, record.trial_result) for record in experiment.trialRecords] == \
+           [(0, "success"), (1, "prune"), (2, "success")]
+    optimal_value = service.get_recommended_config("experiment")["optimal_value"]
+    recommended_config = [{"tunable_name": tunable["name"], "tunable_value": tunable["value"]}
+                          for tunable in optimal_value["tunables"]]
+    assert recommended_config != pruned_config
+    assert optimal_value["objective_function"]["value"] == \
+           min(record.result_value for record in experiment.trialRecords if record.trial_result == "success")
+    assert all(trial["trial_number"] != 1 for trial in service.get_pareto_front("experiment"))
+
+
+def test_result_of_a_pruned_trial_is_ignored(service, start_experiment, run_trial):
+    experiment = start_experiment("experiment", total_trials=3, pruner=PRUNER)
+    service.report_result("experiment", 0, 0, 10.0)
+    run_trial("experiment", 0)
+    config = json.loads(service.get_trial_json_object("experiment", 1))
+    assert service.report_result("experiment", 1, 0, 1000.0)
+
+    service.set_result("experiment", 1, "success", "double", objective(config))
+
+    assert [record.trial_number for record in experiment.trialRecords] == [0, 1]
+    assert experiment.trialRecords[1].trial_result == "prune"
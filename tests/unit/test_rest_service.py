@@ -0,0 +1,243 @@
+"""
+Tests of the REST service, served in-process by a PooledHTTPServer.
+"""
+import html
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import rest_service
+from conftest import objective, search_space
+from utils import HPOErrorConstants, HPOSupportedTypes
+
+WORKERS = 2
+
+
+@pytest.fixture
+def server(service):
+    server = rest_service.PooledHTTPServer(("localhost", 0), rest_service.HTTPRequestHandler, WORKERS)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def connect(server) -> http.client.HTTPConnection:
+    return http.client.HTTPConnection("localhost", server.server_address[1], timeout=10)
+
+
+def request(connection, method, path, body=None):
+    """Send a request on a kept alive connection and return the status and body of the response."""
+    headers = {"Content-Type": HPOSupportedTypes.CONTENT_TYPE} if body is not None else {}
+    connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+    response = connection.getresponse()
+    return response.status, response.read().decode("utf-8")
+
+
+def test_idle_connections_do_not_hold_workers(server):
+    # more idle kept alive connections than workers, each having served a request
+    idle = [connect(server) for _ in range(WORKERS * 3)]
+    for connection in idle:
+        assert request(connection, "GET", "/health") == (200, "OK")
+
+    start = time.monotonic()
+    connection = connect(server)
+    assert request(connection, "GET", "/health") == (200, "OK")
+
+    assert time.monotonic() - start < 1
+    for connection in idle:
+        assert request(connection, "GET", "/health") == (200, "OK")
+        connection.close()
+
+
+def test_pipelined_requests_are_served(server):
+    with socket.create_connection(server.server_address, timeout=10) as connection:
+        connection.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n" * 2)
+        response = b""
+        while response.count(b"\r\n\r\nOK") < 2:
+            response += connection.recv(4096)
+
+    assert response.count(b"HTTP/1.1 200") == 2
+
+
+def test_idle_connection_is_closed_after_the_timeout(monkeypatch, service):
+    monkeypatch.setattr(rest_service.HTTPRequestHandler, "timeout", 0.2)
+    server = rest_service.PooledHTTPServer(("localhost", 0), rest_service.HTTPRequestHandler, WORKERS)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.create_connection(server.server_address, timeout=10) as connection:
+            connection.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            response = b""
+            while not response.endswith(b"\r\n\r\nOK"):
+                response += connection.recv(4096)
+
+            # the server closes the connection, which the client reads as the end of the stream
+            assert connection.recv(4096) == b""
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_shutdown_closes_parked_connections(service):
+    server = rest_service.PooledHTTPServer(("localhost", 0), rest_service.HTTPRequestHandler, WORKERS)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    parked = [socket.create_connection(server.server_address, timeout=10) for _ in range(WORKERS * 2)]
+    for connection in parked:
+        connection.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = b""
+        while not response.endswith(b"\r\n\r\nOK"):
+            response += connection.recv(4096)
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+    stopping = threading.Thread(target=stop, daemon=True)
+    stopping.start()
+    stopping.join(10)
+    thread.join(10)
+
+    assert not stopping.is_alive() and not thread.is_alive()
+    for connection in parked:
+        # the selector thread closes the connections it was waiting on
+        assert connection.recv(4096) == b""
+        connection.close()
+
+
+def test_pending_trials(server, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=5, parallel_trials=3)
+    run_trial("experiment", 1)
+    connection = connect(server)
+
+    status, body = request(connection, "GET", "/pending_trials?experiment_name=experiment")
+
+    assert status == 200
+    data = json.loads(body)
+    assert data["experiment_name"] == "experiment"
+    assert [trial["trial_number"] for trial in data["pending_trials"]] == [0, 2, 3]
+    assert request(connection, "GET", "/pending_trials")[0] == 400
+    assert request(connection, "GET", "/pending_trials?experiment_name=unknown")[0] == 404
+    connection.close()
+
+
+def test_config_of_a_trial_finished_since_it_was_validated(monkeypatch, server, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=3)
+    run_trial("experiment", 0)
+    # the result arrives between the validation of the trial number and the read of its config
+    monkeypatch.setattr(rest_service.HTTPRequestHandler, "validate_trialNumber", lambda *args: "")
+    connection = connect(server)
+
+    status, body = request(connection, "GET",
+                           HPOSupportedTypes.API_ENDPOINT + "?experiment_name=experiment&trial_number=0")
+
+    assert (status, body) == (400, HPOErrorConstants.TRIAL_PRECEDES)
+    connection.close()
+
+
+def test_experiment_deleted_while_a_result_is_validated(monkeypatch, server, service, start_experiment):
+    start_experiment("experiment", total_trials=3)
+    validate_trialNumber = rest_service.HTTPRequestHandler.validate_trialNumber
+
+    def delete_and_validate(handler, experiment, trial_number):
+        service.deleteExperiment("experiment")
+        return validate_trialNumber(handler, experiment, trial_number)
+    monkeypatch.setattr(rest_service.HTTPRequestHandler, "validate_trialNumber", delete_and_validate)
+    connection = connect(server)
+
+    status, body = request(connection, "POST", HPOSupportedTypes.API_ENDPOINT,
+                           {"operation": "EXP_TRIAL_RESULT", "experiment_name": "experiment", "trial_number": 0,
+                            "trial_result": "success", "result_value_type": "double", "result_value": 10})
+
+    # the request goes on with the experiment it looked up, whose trial is no longer pending
+    assert (status, body) == (400, HPOErrorConstants.TRIAL_PRECEDES)
+    connection.close()
+
+
+def test_new_experiment_starts_its_first_trial(server, service):
+    connection = connect(server)
+
+    status, body = request(connection, "POST", HPOSupportedTypes.API_ENDPOINT,
+                           {"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space("experiment")})
+
+    assert status == 200
+    assert service.is_trial_pending("experiment", 0)
+    connection.close()
+
+
+def test_start_error_is_returned(server, service):
+    tunables = [{"value_type": "double", "name": "x", "lower_bound": 10, "upper_bound": 1, "step": 0.5}]
+    connection = connect(server)
+
+    status, body = request(connection, "POST", HPOSupportedTypes.API_ENDPOINT,
+                           {"operation": "EXP_TRIAL_GENERATE_NEW",
+                            "search_space": search_space("experiment", tunables=tunables)})
+
+    assert status == 400
+    assert body.startswith(HPOErrorConstants.EXPERIMENT_START_ERROR + " ")
+    assert service.doesNotContainExperiment("experiment")
+    connection.close()
+
+
+def test_experiment_completes_through_the_batch_endpoints(server, service, start_experiment):
+    experiment = start_experiment("experiment", total_trials=4, parallel_trials=1)
+    connection = connect(server)
+
+    finished = []
+    while experiment.status != "Completed":
+        status, body = request(connection, "POST", HPOSupportedTypes.API_ENDPOINT,
+                               {"operation": "EXP_TRIAL_GENERATE_BATCH", "experiment_name": "experiment", "count": 4})
+        assert status == 200
+        batch = json.loads(body)
+        status, body = request(connection, "POST", HPOSupportedTypes.API_ENDPOINT,
+                               {"operation": "EXP_TRIAL_RESULT_BATCH", "experiment_name": "experiment",
+                                "results": [{"trial_number": trial["trial_number"], "trial_result": "success",
+                                             "result_value_type": "double",
+                                             "result_value": objective(trial["trial_config"])} for trial in batch]})
+        assert status == 200
+        finished += [trial["trial_number"] for trial in batch]
+
+    assert finished == [0, 1, 2, 3]
+    connection.close()
+
+
+def test_intermediate_values_prune_a_trial(server, service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=3, pruner={"type": "median", "n_startup_trials": 1,
+                                                           "n_warmup_steps": 0})
+    connection = connect(server)
+
+    def post_intermediate_value(trial_number, value):
+        status, body = request(connection, "POST", HPOSupportedTypes.API_ENDPOINT,
+                               {"operation": "EXP_TRIAL_INTERMEDIATE_RESULT", "experiment_name": "experiment",
+                                "trial_number": trial_number, "step": 0, "result_value_type": "double",
+                                "result_value": value})
+        assert status == 200
+        return json.loads(body)
+
+    assert post_intermediate_value(0, 10.0) == {"trial_number": 0, "prune": False}
+    run_trial("experiment", 0)
+    assert post_intermediate_value(1, 1000.0) == {"trial_number": 1, "prune": True}
+
+    assert service.get_trial_records("experiment", 0, 2)[1][1]["trial_result"] == "prune"
+    assert request(connection, "GET", HPOSupportedTypes.API_ENDPOINT + "?experiment_name=experiment&trial_number=1") \
+        == (400, HPOErrorConstants.TRIAL_PRECEDES)
+    connection.close()
+
+@pytest.mark.parametrize("experiment_name", ["a\\d", "a\\1", "a\\g<0>", "<b>experiment</b>"])
+def test_experiment_names_are_listed_verbatim(server, start_experiment, experiment_name):
+    start_experiment(experiment_name)
+    start_experiment("other")
+    connection = connect(server)
+
+    status, body = request(connection, "GET", "/listexperiments")
+
+    assert status == 200
+    assert "<td> " + html.escape(experiment_name) + " </td>" in body
+    assert "<td> other </td>" in body
+    assert "No Experiments found!" not in body
+    connection.close()
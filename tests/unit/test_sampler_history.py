@@ -0,0 +1,86 @@
+"""
+Tests of the sampler history, which bounds the trials a sampler learns from.
+"""
+import optuna
+import pytest
+
+from bayes_optuna import samplers
+from conftest import search_space
+from json_validate import validate_trial_generate_json
+from utils import HPOErrorConstants
+
+MINIMIZE = [optuna.study.StudyDirection.MINIMIZE]
+
+
+def frozen_trials(values):
+    """Return a frozen trial for each value, numbered in order: COMPLETE for a value, in the state given otherwise."""
+    trials = []
+    for number, value in enumerate(values):
+        if isinstance(value, optuna.trial.TrialState):
+            trial = optuna.trial.create_trial(state=value)
+        else:
+            trial = optuna.trial.create_trial(value=value)
+        trial.number = number
+        trials.append(trial)
+    return trials
+
+
+def test_window_keeps_the_most_recent_finished_trials():
+    sampler = samplers.HistoryBoundedSampler(optuna.samplers.RandomSampler(), window=2)
+    trials = frozen_trials([5.0, 1.0, optuna.trial.TrialState.RUNNING, 3.0, optuna.trial.TrialState.FAIL])
+
+    kept = sampler.bounded_trials(trials, MINIMIZE, 5)
+
+    assert [trial.number for trial in kept] == [2, 3, 4]
+
+
+def test_top_k_keeps_the_best_completed_trials():
+    sampler = samplers.HistoryBoundedSampler(optuna.samplers.RandomSampler(), top_k=2)
+    trials = frozen_trials([5.0, 1.0, optuna.trial.TrialState.RUNNING, 3.0, 0.5])
+
+    assert [trial.number for trial in sampler.bounded_trials(trials, MINIMIZE, 5)] == [1, 2, 4]
+    assert [trial.number for trial in sampler.bounded_trials(trials, [optuna.study.StudyDirection.MAXIMIZE], 5)] == \
+           [0, 2, 3]
+
+
+def test_top_k_adds_random_trials_picked_the_same_for_a_trial():
+    sampler = samplers.HistoryBoundedSampler(optuna.samplers.RandomSampler(), top_k=1, random=2)
+    trials = frozen_trials([5.0, 1.0, 4.0, optuna.trial.TrialState.FAIL, 3.0, 2.0])
+
+    kept = sampler.bounded_trials(trials, MINIMIZE, 6)
+
+    assert len(kept) == 3
+    assert 1 in [trial.number for trial in kept]
+    assert [trial.number for trial in sampler.bounded_trials(trials, MINIMIZE, 6)] == [trial.number for trial in kept]
+
+
+def test_sampler_without_history_is_not_wrapped():
+    sampler = optuna.samplers.RandomSampler()
+
+    assert samplers.create_history_bounded_sampler(sampler, None) is sampler
+    assert isinstance(samplers.create_history_bounded_sampler(sampler, {"window": 3}), samplers.HistoryBoundedSampler)
+
+
+@pytest.mark.parametrize("sampler_history, error", [
+    ({"window": 10}, ""),
+    ({"top_k": 5, "random": 5}, ""),
+    ({}, HPOErrorConstants.INVALID_SAMPLER_HISTORY),
+    ({"window": 10, "top_k": 5}, HPOErrorConstants.INVALID_SAMPLER_HISTORY),
+    ({"window": 0}, HPOErrorConstants.INVALID_SAMPLER_HISTORY),
+    ({"window": 10, "random": 5}, HPOErrorConstants.INVALID_SAMPLER_HISTORY),
+    ({"top_k": 5, "random": -1}, HPOErrorConstants.INVALID_SAMPLER_HISTORY),
+    ({"size": 10}, "Additional properties are not allowed "),
+])
+def test_sampler_history_is_validated(sampler_history, error):
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", sampler_history=sampler_history)}) == error
+
+
+@pytest.mark.parametrize("sampler_history", [{"window": 3}, {"top_k": 2, "random": 1}])
+def test_experiment_with_a_sampler_history_completes(service, start_experiment, run_trial, sampler_history):
+    experiment = start_experiment("experiment", total_trials=8, sampler_history=sampler_history)
+    for _ in range(8):
+        run_trial("experiment")
+
+    assert isinstance(experiment.study.sampler, samplers.HistoryBoundedSampler)
+    assert experiment.status == "Completed"
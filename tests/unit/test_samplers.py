@@ -0,0 +1,30 @@
+"""
+Tests of the sampler registry and of the validation of sampler parameters.
+"""
+import pytest
+
+from bayes_optuna import samplers
+from conftest import search_space
+from json_validate import validate_trial_generate_json
+from utils import HPOErrorConstants
+
+
+def test_sampler_params_are_validated():
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", sampler_params={"unknown": 1})}).startswith(HPOErrorConstants.INVALID_SAMPLER_PARAMS)
+
+
+def test_registered_samplers():
+    assert "optuna_skopt" not in samplers.SAMPLERS
+    assert samplers.MULTI_OBJECTIVE_SAMPLERS == {"optuna_tpe", "optuna_tpe_multivariate", "optuna_tpe_constant_liar",
+                                                 "optuna_qmc", "optuna_nsga2"}
+    assert samplers.MULTI_OBJECTIVE_SAMPLERS < set(samplers.SAMPLERS)
+
+
+@pytest.mark.parametrize("hpo_algo_impl", sorted(samplers.SAMPLERS))
+def test_every_sampler_runs_an_experiment(service, start_experiment, run_trial, hpo_algo_impl):
+    experiment = start_experiment("experiment", total_trials=4, hpo_algo_impl=hpo_algo_impl, sampler_params=None)
+    for _ in range(4):
+        run_trial("experiment")
+
+    assert experiment.status == "Completed"
@@ -0,0 +1,119 @@
+"""
+Tests of experiments persisted to an RDB or journal storage and recovered by a restarted service.
+"""
+import json
+import threading
+from concurrent import futures
+
+import optuna
+import pytest
+
+from conftest import TUNABLES
+from utils import HPOErrorConstants
+
+
+@pytest.fixture(params=["sqlite", "journal"])
+def storage_url(request, tmp_path):
+    if request.param == "sqlite":
+        return "sqlite:///" + str(tmp_path / "hpo.db")
+    return "journal:" + str(tmp_path / "hpo.log")
+
+
+def new_experiment(service, name, total_trials=4, parallel_trials=2, **options):
+    service.newExperiment(None, name, total_trials, parallel_trials, "minimize", "optuna_tpe", "response_time",
+                          TUNABLES, "double", **options)
+    assert not service.startExperiment(name)
+    return service.getExperiment(name)
+
+
+def test_experiment_is_recovered_with_its_pending_trials(new_service, storage_url):
+    service = new_service(storage_url)
+    experiment = new_experiment(service, "experiment", early_stopping={"patience": 10})
+    service.set_result("experiment", 1, "success", "double", 5.0)
+    service.set_result("experiment", 2, "failure", "double", 0)
+    pending = service.get_pending_trials("experiment")
+
+    restarted = new_service(storage_url)
+    restarted.recoverExperiments()
+
+    recovered = restarted.getExperiment("experiment")
+    assert recovered.total_trials == experiment.total_trials
+    assert recovered.earlyStopping == {"patience": 10}
+    assert restarted.get_pending_trials("experiment") == pending
+    assert [record.to_json() for record in recovered.trialRecords] == \
+           [record.to_json() for record in experiment.trialRecords]
+    assert restarted.get_trial_number("experiment") == service.get_trial_number("experiment")
+
+
+def test_recovered_experiment_runs_to_completion(new_service, storage_url):
+    service = new_service(storage_url)
+    new_experiment(service, "experiment")
+    service.set_result("experiment", 0, "success", "double", 5.0)
+
+    restarted = new_service(storage_url)
+    restarted.recoverExperiments()
+    while restarted.get_pending_trials("experiment"):
+        trial = restarted.get_pending_trials("experiment")[0]
+        restarted.set_result("experiment", trial["trial_number"], "success", "double", 4.0)
+
+    recovered = restarted.getExperiment("experiment")
+    assert recovered.status == "Completed"
+    assert [record.trial_number for record in recovered.trialRecords] == [0, 1, 2, 3]
+    assert restarted.get_recommended_config("experiment")["optimal_value"]["objective_function"]["value"] == 4.0
+
+
+def test_pending_trial_config_survives_restart(new_service, storage_url):
+    service = new_service(storage_url)
+    new_experiment(service, "experiment", parallel_trials=1)
+    config = json.loads(service.get_trial_json_object("experiment", 0))
+
+    restarted = new_service(storage_url)
+    restarted.recoverExperiments()
+
+    assert json.loads(restarted.get_trial_json_object("experiment", 0)) == config
+
+
+def test_deleted_experiment_is_not_recovered(new_service, storage_url):
+    service = new_service(storage_url)
+    new_experiment(service, "deleted")
+    new_experiment(service, "kept")
+    service.deleteExperiment("deleted")
+
+    restarted = new_service(storage_url)
+    restarted.recoverExperiments()
+
+    assert restarted.getExperimentsList() == ["kept"]
+    study_names = [summary.study_name for summary in optuna.get_all_study_summaries(restarted.storage)]
+    assert study_names == ["kept"]
+
+
+def test_experiment_deleted_before_its_start_is_not_created(new_service, storage_url):
+    service = new_service(storage_url)
+    # a single start worker, held until the experiment has been deleted
+    service.startExecutor = futures.ThreadPoolExecutor(max_workers=1)
+    deleted = threading.Event()
+    service.startExecutor.submit(deleted.wait, 30)
+    service.newExperiment(None, "experiment", 4, 1, "minimize", "optuna_tpe", "response_time", TUNABLES, "double")
+    experiment = service.getExperiment("experiment")
+    service.startExperiment("experiment", wait=False)
+
+    service.deleteExperiment("experiment")
+    deleted.set()
+    futures.wait([experiment.startedFuture], timeout=30)
+
+    assert experiment.getStartError() == \
+           HPOErrorConstants.EXPERIMENT_START_ERROR + " " + HPOErrorConstants.EXPERIMENT_DELETED
+    assert experiment.status == "Deleted"
+    assert experiment.pendingTrials == {}
+    restarted = new_service(storage_url)
+    restarted.recoverExperiments()
+    assert restarted.experiments == {}
+    assert optuna.get_all_study_summaries(restarted.storage) == []
+
+
+def test_service_without_storage_recovers_nothing(new_service):
+    service = new_service()
+
+    service.recoverExperiments()
+
+    assert service.experiments == {}
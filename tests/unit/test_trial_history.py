@@ -0,0 +1,56 @@
+"""
+Tests of the history of the finished trials of an experiment.
+"""
+import json
+
+
+def test_trial_records_are_paged(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=5)
+    values = [run_trial("experiment") for _ in range(5)]
+
+    total, trials = service.get_trial_records("experiment", 1, 2)
+
+    assert total == 5
+    assert [trial["trial_number"] for trial in trials] == [1, 2]
+    assert [trial["result_value"] for trial in trials] == [round(value, 2) for value in values[1:3]]
+    assert service.get_trial_records("experiment", 4, 10)[1][0]["trial_number"] == 4
+    assert service.get_trial_records("experiment", 5, 10) == (5, [])
+
+
+def test_trial_record_has_the_config_of_the_trial(service, start_experiment, run_trial):
+    start_experiment("experiment")
+    config = json.loads(service.get_trial_json_object("experiment", 0))
+    run_trial("experiment", 0)
+
+    trial = service.get_trial_records("experiment", 0, 1)[1][0]
+
+    assert trial["trial_result"] == "success"
+    assert trial["config"] == config
+    assert "additional_result_values" not in trial
+
+
+def test_failed_and_pruned_trials_have_no_result_value(service, start_experiment):
+    start_experiment("experiment", total_trials=3)
+    service.set_result("experiment", 0, "failure", "double", 10)
+    service.set_result("experiment", 1, "prune", "double", 10)
+
+    trials = service.get_trial_records("experiment", 0, 10)[1]
+
+    assert [(trial["trial_result"], trial["result_value"]) for trial in trials] == [("failure", None), ("prune", None)]
+
+
+def test_additional_result_values_are_recorded(service, start_experiment):
+    start_experiment("experiment", additional_objectives=[{"objective_function": "memory", "direction": "minimize"}])
+    service.set_result("experiment", 0, "success", "double", 2.0, [512.0])
+
+    assert service.get_trial_records("experiment", 0, 1)[1][0]["additional_result_values"] == [512.0]
+
+
+def test_deleted_experiment_releases_its_records(service, start_experiment, run_trial):
+    experiment = start_experiment("experiment")
+    run_trial("experiment")
+
+    service.deleteExperiment("experiment")
+
+    assert experiment.trialRecords == []
+    assert experiment.trialTimings == []
@@ -0,0 +1,26 @@
+"""
+Tests of the breakdown of where the time of every finished trial went.
+"""
+from utils import HPOSupportedTypes
+
+
+def test_timing_report_has_a_timing_for_every_finished_trial(service, start_experiment, run_trial):
+    start_experiment("experiment", total_trials=3)
+    for _ in range(3):
+        run_trial("experiment")
+
+    report = service.get_timing_report("experiment")
+
+    assert [timing["trial_number"] for timing in report["trials"]] == [0, 1, 2]
+    assert set(report["summary"]) == {"sampling", "waiting", "lock_wait", "bookkeeping"}
+    assert all(report["summary"][phase]["total"] >= 0 for phase in report["summary"])
+    assert "profile" not in report
+
+
+def test_profiled_experiment_reports_its_profile(monkeypatch, service, start_experiment, run_trial):
+    monkeypatch.setenv(HPOSupportedTypes.PROFILE_TRIALS_ENV, "true")
+    start_experiment("experiment", total_trials=2)
+    for _ in range(2):
+        run_trial("experiment")
+
+    assert "function calls" in service.get_timing_report("experiment")["profile"]
@@ -0,0 +1,88 @@
+"""
+Tests of the validation of tunables, of conditional tunables, and of experiments whose search space cannot start.
+"""
+import json
+import struct
+
+import pytest
+
+import grpc_service
+from conftest import TUNABLES, search_space
+from gRPC import hpo_pb2
+from json_validate import validate_trial_generate_json, validate_tunables
+from utils import HPOErrorConstants
+
+
+def test_valid_search_space():
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW",
+                                         "search_space": search_space("experiment")}) == ""
+
+
+@pytest.mark.parametrize("condition, error", [
+    ({"tunable": "x"}, "'values' is a required property"),
+    ({"tunable": "x", "values": 3}, "3 is not of type 'array'"),
+    ({"tunable": "x", "values": []}, "[] should be non-empty"),
+])
+def test_condition_needs_values(condition, error):
+    tunables = TUNABLES + [{"value_type": "integer", "name": "z", "lower_bound": 1, "upper_bound": 3, "step": 1,
+                            "condition": condition}]
+    trial_generate_json = {"operation": "EXP_TRIAL_GENERATE_NEW",
+                           "search_space": search_space("experiment", tunables=tunables)}
+
+    assert validate_trial_generate_json(trial_generate_json) == error
+
+
+def test_condition_values_are_validated_without_schema():
+    tunables = TUNABLES + [{"value_type": "integer", "name": "z", "condition": {"tunable": "y"}},
+                           {"value_type": "integer", "name": "w", "condition": {"tunable": "v", "values": [1]}}]
+
+    assert validate_tunables(tunables) == ",".join([HPOErrorConstants.INVALID_CONDITION_VALUES + "z",
+                                                    HPOErrorConstants.INVALID_CONDITION + "w"])
+
+
+@pytest.mark.parametrize("lower_bound", [0, -1])
+def test_log_tunable_needs_a_positive_lower_bound(lower_bound):
+    tunables = TUNABLES + [{"value_type": "double", "name": "z", "lower_bound": lower_bound, "upper_bound": 3,
+                            "log": True}]
+    trial_generate_json = {"operation": "EXP_TRIAL_GENERATE_NEW",
+                           "search_space": search_space("experiment", tunables=tunables)}
+
+    assert validate_trial_generate_json(trial_generate_json) == HPOErrorConstants.INVALID_LOG_BOUND + "z"
+
+
+def test_conditional_tunable_is_only_suggested_for_its_values(service, start_experiment, run_trial):
+    tunables = TUNABLES + [{"value_type": "integer", "name": "z", "lower_bound": 1, "upper_bound": 3, "step": 1,
+                            "condition": {"tunable": "y", "values": [1, 2, 3, 4, 5]}}]
+    start_experiment("experiment", total_trials=10, tunables=tunables)
+
+    for _ in range(10):
+        config = json.loads(service.get_trial_json_object("experiment"))
+        names = [tunable["tunable_name"] for tunable in config]
+        y = config[1]["tunable_value"]
+        assert ("z" in names) == (y <= 5)
+        run_trial("experiment")
+
+
+def test_start_error_is_returned_and_the_experiment_removed(service):
+    tunables = [{"value_type": "double", "name": "x", "lower_bound": 10, "upper_bound": 1, "step": 0.5}]
+    service.newExperiment(None, "experiment", 3, 1, "minimize", "optuna_tpe", "response_time", tunables, "double")
+
+    error = service.startExperiment("experiment")
+
+    assert error.startswith(HPOErrorConstants.EXPERIMENT_START_ERROR + " ")
+    assert len(error) > len(HPOErrorConstants.EXPERIMENT_START_ERROR) + 1
+    assert service.doesNotContainExperiment("experiment")
+
+
+def float32(value) -> float:
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
+@pytest.mark.parametrize("step, expected", [(0.1, 0.1), (float32(0.1), 0.1), (0.123456789, 0.123456789)])
+def test_grpc_tunable_is_read_with_the_precision_it_was_sent_with(step, expected):
+    tunable = hpo_pb2.ExperimentDetails.Tunable(name="x", value_type="double", lower_bound=0.1, upper_bound=2.2,
+                                                step=step)
+
+    assert grpc_service.search_space_tunables([tunable]) == [
+        {"name": "x", "value_type": "double", "lower_bound": 0.1, "upper_bound": 2.2, "step": expected}]
+
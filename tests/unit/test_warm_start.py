@@ -0,0 +1,115 @@
+"""
+Tests of experiments warm started from the trials of a previous run, given inline or by experiment name.
+"""
+import json
+
+import pytest
+
+import grpc_service
+from conftest import TUNABLES, search_space
+from gRPC import hpo_pb2
+from json_validate import validate_trial_generate_json, validate_warm_start
+from utils import HPOErrorConstants
+
+
+def prior_trial(x, y, result_value, **fields):
+    trial = {"config": [{"tunable_name": "x", "tunable_value": x}, {"tunable_name": "y", "tunable_value": y}],
+             "result_value": result_value}
+    trial.update(fields)
+    return trial
+
+
+def test_best_warm_start_config_is_run_first(service, start_experiment):
+    warm_start = {"trials": [prior_trial(8.0, 2, 51.0), prior_trial(3.5, 6, 2.25), prior_trial(1.0, 1, 41.0)],
+                  "enqueue_best": 1}
+    experiment = start_experiment("experiment", warm_start=warm_start)
+
+    config = json.loads(service.get_trial_json_object("experiment", 0))
+
+    assert config == warm_start["trials"][1]["config"]
+    # the warm start trials are in the study, but are not trials of the experiment
+    assert len(experiment.study.trials) == 4
+    assert service.get_trial_number("experiment") == 0
+
+
+def test_warm_start_trials_are_not_recommended(service, start_experiment, run_trial):
+    warm_start = {"trials": [prior_trial(3.0, 7, -100.0)]}
+    start_experiment("experiment", total_trials=2, warm_start=warm_start)
+    values = [run_trial("experiment") for _ in range(2)]
+
+    optimal_value = service.get_recommended_config("experiment")["optimal_value"]
+    assert optimal_value["objective_function"]["value"] == round(min(values), 2)
+    assert all(trial["trial_number"] >= 0 for trial in service.get_pareto_front("experiment"))
+
+
+def test_warm_start_from_a_previous_experiment(service, start_experiment, run_trial):
+    start_experiment("previous", total_trials=3)
+    values = [run_trial("previous") for _ in range(3)]
+
+    experiment = start_experiment("experiment", warm_start={"experiment_name": "previous", "enqueue_best": 1})
+
+    config = json.loads(service.get_trial_json_object("experiment", 0))
+    best = service.get_recommended_config("previous")["optimal_value"]
+    assert config == [{"tunable_name": tunable["name"], "tunable_value": tunable["value"]}
+                      for tunable in best["tunables"]]
+    assert sorted(frozen_trial.value for frozen_trial in experiment.study.trials[:3]) == sorted(values)
+
+
+def test_warm_start_from_an_unknown_experiment(service):
+    error = service.newExperiment(None, "experiment", 3, 1, "minimize", "optuna_tpe", "response_time",
+                                  search_space("experiment")["tunables"], "double",
+                                  warm_start={"experiment_name": "unknown"})
+
+    assert error == HPOErrorConstants.WARM_START_NOT_FOUND
+    assert service.doesNotContainExperiment("experiment")
+
+
+def test_warm_start_needs_either_an_experiment_or_trials():
+    warm_start = {"experiment_name": "previous", "trials": [prior_trial(3.0, 7, 1.0)]}
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", warm_start=warm_start)}) == HPOErrorConstants.INVALID_WARM_START
+
+
+def test_warm_start_tunable_must_be_in_the_search_space():
+    trial = prior_trial(3.0, 7, 1.0)
+    trial["config"].append({"tunable_name": "z", "tunable_value": 1})
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", warm_start={"trials": [trial]})}) == HPOErrorConstants.INVALID_WARM_START_TUNABLE + "z"
+
+
+def test_warm_start_config_needs_a_tunable_value():
+    trial = {"config": [{"tunable_name": "x"}], "result_value": 1.0}
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", warm_start={"trials": [trial]})}) == "'tunable_value' is a required property"
+
+
+def test_warm_start_needs_a_value_for_every_objective():
+    additional_objectives = [{"objective_function": "memory", "direction": "minimize"}]
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", warm_start={"trials": [prior_trial(3.0, 7, 1.0)]}, additional_objectives=additional_objectives)}
+    ) == HPOErrorConstants.INVALID_WARM_START_VALUES
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", warm_start={"trials": [prior_trial(3.0, 7, 1.0, additional_result_values=[2.0])]})}
+    ) == HPOErrorConstants.INVALID_WARM_START_VALUES
+
+
+@pytest.mark.parametrize("enqueue_best", [0, -1, 2.0])
+def test_warm_start_enqueues_a_positive_number_of_trials(enqueue_best):
+    warm_start = {"trials": [prior_trial(3.0, 7, 1.0)], "enqueue_best": enqueue_best}
+
+    assert validate_trial_generate_json({"operation": "EXP_TRIAL_GENERATE_NEW", "search_space": search_space(
+        "experiment", warm_start=warm_start)}) == HPOErrorConstants.INVALID_WARM_START_ENQUEUE
+
+
+def test_grpc_warm_start_enqueues_a_positive_number_of_trials():
+    warmStart = hpo_pb2.WarmStart(experiment_name="previous")
+    assert validate_warm_start(grpc_service.warm_start_dict(warmStart), {"tunables": TUNABLES}) == ""
+
+    warmStart.enqueue_best = -2
+    assert validate_warm_start(grpc_service.warm_start_dict(warmStart), {"tunables": TUNABLES}) == \
+           HPOErrorConstants.INVALID_WARM_START_ENQUEUE
+